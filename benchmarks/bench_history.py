@@ -0,0 +1,81 @@
+"""Benchmark: appending to and querying the price history store.
+
+Usage:
+    python -m benchmarks.bench_history [--refreshes N] [--scale N]
+
+Fills a temporary database with one scored snapshot per simulated
+five-minute refresh (2000 refreshes of 450 cards is ~900k rows, about a
+week of continuous polling) and times appends and range queries as it grows.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.fixtures import make_snapshots
+from utils.history_store import HistoryStore
+from utils.price_index import PriceIndex
+from utils.utils import Utils
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--refreshes", type=int, default=2000)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    divination_data, currency_data, unique_items = Utils.load_data(
+        make_snapshots(args.scale)
+    )
+    price_index = PriceIndex.build(divination_data, currency_data, unique_items)
+    utils = Utils()
+    utils.score_cards(divination_data, price_index)
+    engine = utils._scoring_engine
+    rng = np.random.default_rng(0)
+    name = engine.names[len(engine.names) // 2]
+    started = 1_700_000_000.0
+    step = 300.0
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, HistoryStore.FILENAME)
+        with HistoryStore(path) as history:
+            checkpoint = max(1, args.refreshes // 4)
+            elapsed = 0.0
+            for i in range(args.refreshes):
+                scored = engine.score(
+                    price_index, engine.cost * rng.uniform(0.9, 1.1, len(engine.cost))
+                )
+                start = time.perf_counter()
+                history.append("Bench", scored, started + i * step)
+                elapsed += time.perf_counter() - start
+                if (i + 1) % checkpoint == 0:
+                    rows = (i + 1) * len(engine.names)
+                    print(
+                        f"{rows:>9} rows  append {elapsed / checkpoint * 1000:6.2f} "
+                        f"ms/refresh"
+                    )
+                    elapsed = 0.0
+
+            end = started + (args.refreshes - 1) * step
+            for label, fn in (
+                ("full card history", lambda: history.card_history("Bench", name)),
+                (
+                    "last 24 h of a card",
+                    lambda: history.card_history("Bench", name, end - 86400, end),
+                ),
+                ("profitable since", lambda: history.profitable_since("Bench", name)),
+            ):
+                start = time.perf_counter()
+                for _ in range(20):
+                    result = fn()
+                seconds = (time.perf_counter() - start) / 20
+                size = len(result) if isinstance(result, list) else 1
+                print(f"{label:<20} {seconds * 1000:8.2f} ms  ({size} rows)")
+        print(f"database size {os.path.getsize(path) / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark: full json.load vs. streaming parse of the unique item overviews.
+
+Usage:
+    python -m benchmarks.bench_load [--data-dir DIR] [--scale N]
+
+Each mode runs in a fresh interpreter so peak RSS is measured in isolation.
+``--data-dir`` points at a directory with a captured ``Uniquedata`` folder;
+without it synthetic full-size overviews are generated in a temp directory.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fixtures import make_snapshots, write_snapshots
+from utils.utils import Utils
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def load_uniques(data_dir: str, mode: str) -> int:
+    """Load every unique overview and keep only the fields the scorer needs.
+
+    Returns:
+        Number of unique lines loaded
+    """
+    directory = os.path.join(data_dir, "Uniquedata")
+    unique_lines = []
+    for file in os.listdir(directory):
+        if not file.endswith(".json"):
+            continue
+        with open(os.path.join(directory, file), "r", encoding="utf-8") as f:
+            if mode == "json":
+                data = json.load(f)
+                lines = [
+                    {k: line[k] for k in Utils.UNIQUE_FIELDS if k in line}
+                    for line in data["lines"]
+                ]
+            else:
+                lines = Utils.parse_snapshot(f, "Uniquedata")["lines"]
+        unique_lines.append(lines)
+    return sum(len(lines) for lines in unique_lines)
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes, or 0 if unknown."""
+    if resource is None:
+        return 0
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def run_mode(data_dir: str, mode: str) -> dict:
+    """Measure a single mode in this process.
+
+    The first pass measures wall time and peak RSS growth, the second pass
+    repeats the load under tracemalloc to measure peak Python allocations.
+    """
+    rss_before = peak_rss()
+    start = time.perf_counter()
+    count = load_uniques(data_dir, mode)
+    elapsed = time.perf_counter() - start
+    rss_growth = peak_rss() - rss_before
+
+    tracemalloc.start()
+    load_uniques(data_dir, mode)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "mode": mode,
+        "lines": count,
+        "seconds": elapsed,
+        "peak_rss_growth_bytes": rss_growth,
+        "traced_peak_bytes": traced_peak,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", help="directory with captured snapshots")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--mode", choices=["json", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--write-fixtures", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.data_dir, args.mode)))
+        return
+    if args.write_fixtures:
+        write_snapshots(make_snapshots(args.scale), args.write_fixtures)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir
+        if not data_dir:
+            # Generated in a child process: Linux children inherit the peak
+            # RSS of their parent, which would hide the measured growth.
+            data_dir = tmp
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_load"]
+                + ["--scale", str(args.scale), "--write-fixtures", data_dir],
+                check=True,
+            )
+        size = sum(
+            os.path.getsize(os.path.join(data_dir, "Uniquedata", f))
+            for f in os.listdir(os.path.join(data_dir, "Uniquedata"))
+        )
+        print(f"Uniquedata on disk: {size / 1e6:.1f} MB")
+        for mode in ("json", "stream"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_load", "--mode", mode]
+                + ["--data-dir", data_dir],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{mode:<7} {result['lines']} lines  {result['seconds'] * 1000:8.1f} ms"
+                f"  peak RSS +{result['peak_rss_growth_bytes'] / 1e6:6.1f} MB"
+                f"  traced peak {result['traced_peak_bytes'] / 1e6:6.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
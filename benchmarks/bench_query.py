@@ -0,0 +1,65 @@
+"""Benchmark: sort, filter and search through the card table proxy model.
+
+Usage:
+    python -m benchmarks.bench_query [--data-dir DIR] [--scale N] [--repeat N]
+
+Each interaction re-runs the query over the full card list and remaps the
+proxy rows, as a header click or a keystroke in the search box does. The
+``CardQuery`` rows time the query alone; the proxy rows add the row
+mapping and the layout change signals, but not the repaint.
+"""
+
+import argparse
+import os
+import timeit
+
+from PyQt6.QtCore import Qt
+
+from benchmarks.fixtures import make_snapshots
+from gui.proxy_model import CardProxyModel
+from gui.table_model import CardTableModel
+from utils.price_index import PriceIndex
+from utils.utils import Utils
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", help="directory with captured snapshots")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.data_dir:
+        os.chdir(args.data_dir)
+        snapshots = Utils.read_snapshots()
+    else:
+        snapshots = make_snapshots(args.scale)
+    divination_data, currency_data, unique_items = Utils.load_data(snapshots)
+    price_index = PriceIndex.build(divination_data, currency_data, unique_items)
+    scored = Utils().score_cards(
+        divination_data, price_index, Utils.load_market(snapshots, price_index.uniques)
+    )
+
+    model = CardTableModel()
+    model.set_results(scored, price_index.divine_value or 1.0)
+    proxy = CardProxyModel()
+    proxy.setSourceModel(model)
+    query = proxy._query
+    searches = iter(["c", "ca", "car", "card", "card 1", "card 12"] * args.repeat)
+
+    cases = (
+        ("query sort", lambda: query.rows(3, True)),
+        ("query filter", lambda: query.rows(3, True, kind="Unique", min_roi=10)),
+        ("query search", lambda: query.rows(3, True, search=next(searches))),
+        ("proxy sort", lambda: proxy.sort(1, Qt.SortOrder.DescendingOrder)),
+        ("proxy filter", lambda: proxy.set_filters("Currency", 0, 5)),
+        ("proxy search", lambda: proxy.set_search(next(searches))),
+    )
+    print(f"{len(scored)} cards, {args.repeat} interactions each")
+    for label, fn in cases:
+        seconds = min(timeit.repeat(fn, number=args.repeat, repeat=3)) / args.repeat
+        print(f"{label:<14} {seconds * 1e6:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Micro-benchmark: regex scoring vs. reward index vs. vectorized scoring.
+
+Usage:
+    python -m benchmarks.bench_scoring [--data-dir DIR] [--scale N] [--repeat N]
+
+``--data-dir`` points at a directory with captured ``Data`` and
+``Uniquedata`` folders; without it a synthetic full-size snapshot is used.
+
+Rows marked "fresh" score a newly parsed copy of the divination snapshot on
+every iteration, as a real refresh does, so the reward index is revalidated
+by its fingerprint rather than by the identity of a snapshot seen before.
+"""
+
+import argparse
+import json
+import os
+import time
+import timeit
+from typing import Callable, Dict
+
+from benchmarks.fixtures import make_snapshots
+from utils.price_index import PriceIndex
+from utils.reward_graph import RewardGraph
+from utils.utils import Utils
+
+
+def score_with_process_card(divination_data, currency_data, unique_items):
+    """Reference scoring that parses every card's reward text each time."""
+    highscores = {}
+    for item in divination_data["lines"]:
+        card_data = Utils.process_card(
+            name=item["name"],
+            chaos_value=item["chaosValue"],
+            stack_size=item.get("stackSize", 1),
+            explicit_modifiers=item.get("explicitModifiers", []),
+            currency=currency_data,
+            unique_items=unique_items,
+            divination_data=divination_data,
+        )
+        if card_data:
+            highscores[item["name"]] = card_data
+    return highscores
+
+
+def time_fresh(
+    fn: Callable[[Dict], object], fresh: Callable[[], Dict], repeat: int
+) -> float:
+    """Time ``fn`` on a new snapshot per call, leaving the copy untimed.
+
+    Returns:
+        Best mean seconds per call over three runs
+    """
+    best = float("inf")
+    for _ in range(3):
+        total = 0.0
+        for _ in range(repeat):
+            data = fresh()
+            start = time.perf_counter()
+            fn(data)
+            total += time.perf_counter() - start
+        best = min(best, total / repeat)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", help="directory with captured snapshots")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.data_dir:
+        os.chdir(args.data_dir)
+        snapshots = Utils.read_snapshots()
+    else:
+        snapshots = make_snapshots(args.scale)
+    divination_data, currency_data, unique_items = Utils.load_data(snapshots)
+
+    utils = Utils()
+    price_index = PriceIndex.build(divination_data, currency_data, unique_items)
+    utils.calculate_highscores(divination_data, price_index)
+    market_index = Utils.load_market(snapshots, price_index.uniques)
+
+    reward_index = utils.get_reward_index(divination_data)
+    graph = RewardGraph.build(divination_data, reward_index)
+    graph.evaluate(price_index)
+    # A card whose value feeds into another card's reward, repriced back and forth
+    repriced = next(iter(graph._dependents), graph.order[0])
+    prices = iter([{repriced: 1.0}, {repriced: price_index.cards[repriced]}] * 10**6)
+
+    divination_json = json.dumps(divination_data)
+
+    def fresh() -> Dict:
+        return json.loads(divination_json)
+
+    cards = len(divination_data["lines"])
+    # label -> (timed function, whether it takes a fresh divination snapshot)
+    benchmarks = {
+        "process_card": (
+            lambda: score_with_process_card(
+                divination_data, currency_data, unique_items
+            ),
+            False,
+        ),
+        "reward index": (
+            lambda data: utils.calculate_highscores(data, price_index),
+            True,
+        ),
+        "vectorized": (lambda data: utils.score_cards(data, price_index), True),
+        "vectorized+rank": (
+            lambda data: utils.score_cards(data, price_index).records(),
+            True,
+        ),
+        "reward graph": (
+            lambda: RewardGraph.build(divination_data, reward_index).evaluate(
+                price_index
+            ),
+            False,
+        ),
+        "graph update": (lambda: graph.update(next(prices)), False),
+        "market index": (lambda: Utils.load_market(snapshots), False),
+        "vectorized+risk": (
+            lambda data: utils.score_cards(data, price_index, market_index),
+            True,
+        ),
+    }
+    for label, (fn, takes_snapshot) in benchmarks.items():
+        if takes_snapshot:
+            seconds = time_fresh(fn, fresh, args.repeat)
+            label = f"{label} (fresh)"
+        else:
+            seconds = min(timeit.repeat(fn, number=args.repeat, repeat=3)) / args.repeat
+        print(f"{label:<24} {cards} cards  {seconds * 1000:8.3f} ms/refresh")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: JSON snapshot files vs. the compact binary snapshot file.
+
+Usage:
+    python -m benchmarks.bench_snapshot [--data-dir DIR] [--scale N] [--repeat N]
+
+``--data-dir`` points at a directory with captured ``Data`` and
+``Uniquedata`` folders; without it synthetic full-size snapshots are used.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import timeit
+
+from benchmarks.fixtures import make_snapshots, write_snapshots
+from utils.snapshot_file import SnapshotFile
+from utils.utils import Utils
+
+
+def directory_size(path: str) -> int:
+    """Total size of the JSON files in a directory."""
+    return sum(
+        os.path.getsize(os.path.join(path, f))
+        for f in os.listdir(path)
+        if f.endswith(".json")
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", help="directory with captured snapshots")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.data_dir:
+            for directory in ("Data", "Uniquedata"):
+                shutil.copytree(
+                    os.path.join(args.data_dir, directory),
+                    os.path.join(tmp, directory),
+                    ignore=shutil.ignore_patterns(SnapshotFile.FILENAME),
+                )
+        else:
+            write_snapshots(make_snapshots(args.scale), tmp)
+
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            json_size = directory_size("Data") + directory_size("Uniquedata")
+            json_seconds = min(
+                timeit.repeat(Utils.read_snapshots, number=1, repeat=args.repeat)
+            )
+
+            binary_path = os.path.join("Data", SnapshotFile.FILENAME)
+            SnapshotFile.write(binary_path, Utils.read_snapshots())
+            binary_size = os.path.getsize(binary_path)
+            binary_seconds = min(
+                timeit.repeat(Utils.read_snapshots, number=1, repeat=args.repeat)
+            )
+
+            def open_columns():
+                with SnapshotFile.open(binary_path) as snapshot_file:
+                    snapshot_file.column("DivinationCard", "chaosValue").sum()
+
+            mmap_seconds = min(
+                timeit.repeat(open_columns, number=1, repeat=args.repeat)
+            )
+        finally:
+            os.chdir(cwd)
+
+    print(
+        f"{'JSON files':<22} {json_size / 1e6:8.2f} MB  {json_seconds * 1000:8.2f} ms"
+    )
+    print(
+        f"{'binary snapshot':<22} {binary_size / 1e6:8.2f} MB  {binary_seconds * 1000:8.2f} ms"
+    )
+    print(f"{'binary mmap column':<22} {'':11}  {mmap_seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
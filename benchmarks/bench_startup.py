@@ -0,0 +1,124 @@
+"""Benchmark: GUI import time and time to first paint.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat N] [--no-league-cache]
+
+Every run starts a fresh interpreter in a temporary working directory.
+Time to first paint is measured from just before the process is spawned
+to the first paint event of the main window, so it includes interpreter
+startup. Set ``QT_QPA_PLATFORM=offscreen`` to run without a display.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+LEAGUES = [{"id": "Standard", "name": "Standard"}]
+
+
+def child() -> None:
+    """Start the GUI like main.py and report when it first paints."""
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    from gui.main_window import MainWindow
+
+    class PaintProbe(QObject):
+        def __init__(self):
+            super().__init__()
+            self.painted = None
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and self.painted is None:
+                self.painted = time.time()
+                self.leagues = window.league_selector.count()
+                QTimer.singleShot(0, app.quit)
+            return False
+
+    app = QApplication(sys.argv[:1])
+    probe = PaintProbe()
+    window = MainWindow()
+    window.installEventFilter(probe)
+    window.show()
+    app.exec()
+    print(json.dumps({"painted": probe.painted, "leagues": probe.leagues}))
+    sys.stdout.flush()
+    os._exit(0)
+
+
+def import_profile(cwd: str, module: str) -> list:
+    """Return (cumulative µs, name) of the top-level imports of a module."""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        env=child_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    imports = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and len(match.group(3)) <= 2:
+            imports.append((int(match.group(2)), match.group(4)))
+    return sorted(imports, reverse=True)
+
+
+def child_env() -> dict:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-league-cache", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    with tempfile.TemporaryDirectory() as cwd:
+        if not args.no_league_cache:
+            with open(os.path.join(cwd, "leagues.json"), "w") as f:
+                json.dump(LEAGUES, f)
+
+        imports = import_profile(cwd, "gui.main_window")
+        print("import gui.main_window, slowest top-level imports:")
+        for micros, name in imports[:8]:
+            print(f"  {micros / 1000:8.1f} ms  {name}")
+
+        paints = []
+        for _ in range(args.repeat):
+            started = time.time()
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+                cwd=cwd,
+                env=child_env(),
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            paints.append((result["painted"] - started, result["leagues"]))
+
+    best = min(paints)
+    print(
+        f"time to first paint: best {best[0] * 1000:.0f} ms, "
+        f"median {sorted(p[0] for p in paints)[len(paints) // 2] * 1000:.0f} ms, "
+        f"leagues shown at first paint: {best[1]}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Benchmark: QTableWidget items vs. CardTableModel populate and repaint.
+
+Usage:
+    python -m benchmarks.bench_table [--data-dir DIR] [--scale N] [--repeat N]
+
+Each refresh fills the table with a scored snapshot and paints the visible
+part of it into an off-screen pixmap. The merged run refreshes the same
+league with ``--changed`` of the card prices moved each time. Memory is the Python heap (tracemalloc)
+plus the resident set growth, which includes Qt's C++ allocations. Set
+``QT_QPA_PLATFORM=offscreen`` to run without a display.
+"""
+
+import argparse
+import itertools
+import os
+import time
+import tracemalloc
+
+import numpy as np
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QApplication, QHeaderView, QTableWidget, QTableWidgetItem
+
+from benchmarks.fixtures import make_snapshots
+from gui.main_window import MainWindow, NoFocusDelegate
+from gui.styles import TABLE_WIDGET
+from utils.price_index import PriceIndex
+from utils.utils import Utils
+
+HEADERS = [
+    "#",
+    "Name",
+    "Type",
+    "Total profit",
+    "Profit per card",
+    "1 card price",
+    "Total set price",
+    "Reward price",
+]
+
+
+def populate_items(table: QTableWidget, records, divine_value: float) -> None:
+    """Previous implementation: one QTableWidgetItem per cell."""
+    table.setRowCount(len(records))
+    table.setColumnCount(8)
+    table.setHorizontalHeaderLabels(HEADERS)
+    header = table.horizontalHeader()
+    for col in range(table.columnCount()):
+        header.setSectionResizeMode(col, QHeaderView.ResizeMode.Fixed)
+    table.setColumnWidth(0, 50)
+    for row in range(table.rowCount()):
+        table.setRowHeight(row, 20)
+
+    def add(row, col, text, align_left=False):
+        item = QTableWidgetItem(text)
+        item.setBackground(QColor(0, 0, 0, 0))
+        if col == 3:
+            value = float(text.split()[0])
+            color = "#4CAF50" if value > 0 else "#F44336" if value < 0 else None
+            if color:
+                item.setForeground(QColor(color))
+        if not align_left:
+            item.setTextAlignment(
+                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            )
+        table.setItem(row, col, item)
+
+    for row, item in enumerate(records):
+        add(row, 0, str(row + 1))
+        add(row, 1, item["Name"], align_left=True)
+        add(row, 2, item["Type"], align_left=True)
+        for col, key in enumerate(
+            ("Profit", "Profitpercard", "Cost", "Total", "Sellprice"), start=3
+        ):
+            value = item[key]
+            add(row, col, f"{int(value)} c ({round(value / divine_value, 2)} d)")
+
+    for col in range(1, table.columnCount()):
+        table.resizeColumnToContents(col)
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes, or 0 if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def measure(label: str, refresh, view, repeat: int) -> None:
+    """Time populate and repaint separately and report memory growth."""
+    rss_before = current_rss()
+    tracemalloc.start()
+    populate = paint = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        refresh()
+        QApplication.processEvents()
+        populate += time.perf_counter() - start
+
+        start = time.perf_counter()
+        view.viewport().grab()
+        paint += time.perf_counter() - start
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_growth = current_rss() - rss_before
+    print(
+        f"{label:<14} populate {populate / repeat * 1000:8.2f} ms  "
+        f"repaint {paint / repeat * 1000:7.2f} ms  "
+        f"heap peak {heap_peak / 1024:8.0f} KiB  "
+        f"RSS +{rss_growth / 1024:8.0f} KiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", help="directory with captured snapshots")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--changed", type=float, default=0.05, help="share of cards repriced"
+    )
+    args = parser.parse_args()
+
+    if args.data_dir:
+        os.chdir(args.data_dir)
+        snapshots = Utils.read_snapshots()
+    else:
+        snapshots = make_snapshots(args.scale)
+    divination_data, currency_data, unique_items = Utils.load_data(snapshots)
+    price_index = PriceIndex.build(divination_data, currency_data, unique_items)
+    utils = Utils()
+    scored = utils.score_cards(divination_data, price_index)
+    divine_value = price_index.divine_value or 1.0
+
+    app = QApplication.instance() or QApplication([])
+    Utils.get_current_leagues = staticmethod(lambda: [])
+    window = MainWindow()
+    window._price_index = price_index
+    window.show()
+    legacy = QTableWidget()
+    legacy.setItemDelegate(NoFocusDelegate())
+    legacy.setStyleSheet(TABLE_WIDGET)
+    legacy.setShowGrid(False)
+    legacy.verticalHeader().setVisible(False)
+    legacy.resize(window.table_widget.size())
+    legacy.show()
+    app.processEvents()
+
+    refreshes = itertools.count()
+    print(f"{len(scored)} cards, {args.repeat} refreshes")
+    measure(
+        "QTableWidget",
+        lambda: populate_items(legacy, scored.records(), divine_value),
+        legacy,
+        args.repeat,
+    )
+    measure(
+        "CardTableModel",
+        lambda: window._display_results(scored, f"reset {next(refreshes)}"),
+        window.table_widget,
+        args.repeat,
+    )
+
+    engine = utils._scoring_engine
+    rng = np.random.default_rng(0)
+    repriced = []
+    for _ in range(args.repeat):
+        card_prices = engine.cost.copy()
+        moved = rng.random(len(card_prices)) < args.changed
+        card_prices[moved] *= rng.uniform(0.5, 1.5, moved.sum())
+        repriced.append(engine.score(price_index, card_prices))
+    results = iter(repriced)
+    measure(
+        "merged",
+        lambda: window._display_results(next(results), "merged"),
+        window.table_widget,
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Synthetic poe.ninja payloads shaped like the real overview responses.
+
+The generated payloads carry the same fields as the live API (sparklines,
+modifiers, icons, trade info), so parse and memory costs are comparable to
+captured snapshots. A captured snapshot can be used instead wherever a
+benchmark accepts a ``--data-dir`` argument, and ``record_fixtures``
+captures one together with the league list.
+"""
+
+import json
+import os
+import random
+from typing import Dict, List, Tuple
+
+UNIQUE_TYPES = [
+    "UniqueMap",
+    "UniqueJewel",
+    "UniqueFlask",
+    "UniqueWeapon",
+    "UniqueArmour",
+    "UniqueAccessory",
+]
+
+CURRENCY_NAMES = [
+    "Divine Orb",
+    "Exalted Orb",
+    "Chaos Orb",
+    "Orb of Annulment",
+    "Awakened Sextant",
+    "Mirror of Kalandra",
+    "Orb of Alchemy",
+    "Vaal Orb",
+    "Gemcutter's Prism",
+    "Orb of Fusing",
+] + [f"Currency {i}" for i in range(90)]
+
+
+def _sparkline(rng: random.Random) -> Dict:
+    data = [round(rng.uniform(-30, 30), 2) for _ in range(7)]
+    return {"data": data, "totalChange": data[-1]}
+
+
+def make_currency(rng: random.Random) -> Dict:
+    """Build a currency overview payload."""
+    lines = []
+    details = []
+    for i, name in enumerate(CURRENCY_NAMES):
+        value = 200.0 if name == "Divine Orb" else round(rng.uniform(0.1, 50), 2)
+        lines.append(
+            {
+                "currencyTypeName": name,
+                "pay": {"id": i, "value": round(1 / value, 6), "count": 50},
+                "receive": {"id": i, "value": value, "count": 80},
+                "paySparkLine": _sparkline(rng),
+                "receiveSparkLine": _sparkline(rng),
+                "chaosEquivalent": value,
+                "lowConfidencePaySparkLine": _sparkline(rng),
+                "lowConfidenceReceiveSparkLine": _sparkline(rng),
+                "detailsId": name.lower().replace(" ", "-"),
+            }
+        )
+        details.append(
+            {
+                "id": i,
+                "icon": f"https://web.poecdn.com/image/{i}.png",
+                "name": name,
+                "tradeId": name.lower().replace(" ", "-"),
+            }
+        )
+    return {"lines": lines, "currencyDetails": details}
+
+
+def make_uniques(rng: random.Random, item_type: str, count: int) -> Dict:
+    """Build a unique item overview payload with link and variant duplicates."""
+    lines = []
+    for i in range(count):
+        name = f"{item_type} Item {i}"
+        variants = [{}]
+        if item_type in ("UniqueWeapon", "UniqueArmour") and i % 4 == 0:
+            variants += [{"links": 5}, {"links": 6}]
+        if i % 10 == 0:
+            variants.append({"variant": "Relic"})
+        for extra in variants:
+            line = {
+                "id": len(lines),
+                "name": name,
+                "icon": f"https://web.poecdn.com/image/{item_type}/{i}.png",
+                "baseType": f"Base {i % 37}",
+                "itemClass": 3,
+                "levelRequired": rng.randint(1, 80),
+                "sparkline": _sparkline(rng),
+                "lowConfidenceSparkline": _sparkline(rng),
+                "implicitModifiers": [{"text": "+10% to all Resistances"}],
+                "explicitModifiers": [
+                    {"text": f"+{rng.randint(10, 90)} to maximum Life"}
+                    for _ in range(5)
+                ],
+                "flavourText": "A long flavour text " * 4,
+                "chaosValue": round(rng.uniform(1, 5000), 2),
+                "exaltedValue": 0.0,
+                "divineValue": 0.0,
+                "count": rng.randint(1, 200),
+                "detailsId": name.lower().replace(" ", "-"),
+                "tradeInfo": [],
+                "listingCount": rng.randint(1, 400),
+            }
+            line.update(extra)
+            if item_type == "UniqueMap":
+                line["mapTier"] = rng.randint(1, 16)
+            lines.append(line)
+    return {"lines": lines}
+
+
+def make_divination(rng: random.Random, count: int, uniques: Dict[str, Dict]) -> Dict:
+    """Build a divination card overview whose rewards reference other payloads."""
+    unique_names = sorted(
+        {line["name"] for payload in uniques.values() for line in payload["lines"]}
+    )
+    lines = []
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            reward = (
+                f"<currencyitem>{{{rng.randint(1, 20)}x {rng.choice(CURRENCY_NAMES)}}}"
+            )
+        elif kind == 1:
+            reward = f"<uniqueitem>{{{rng.choice(unique_names)}}}"
+            if i % 8 == 1:
+                reward += "\n<corrupted>{Corrupted}"
+        elif kind == 2:
+            reward = f"<divination>{{Card {rng.randrange(count)}}}"
+        else:
+            reward = f"<gemitem>{{Level {rng.randint(1, 21)} Gem {i}}}"
+        lines.append(
+            {
+                "id": i,
+                "name": f"Card {i}",
+                "icon": f"https://web.poecdn.com/image/card/{i}.png",
+                "stackSize": rng.randint(1, 16),
+                "artFilename": f"Art{i}",
+                "itemClass": 6,
+                "sparkline": _sparkline(rng),
+                "lowConfidenceSparkline": _sparkline(rng),
+                "implicitModifiers": [],
+                "explicitModifiers": [{"text": reward, "optional": False}],
+                "flavourText": "A long flavour text " * 4,
+                "chaosValue": round(rng.uniform(0.5, 500), 2),
+                "exaltedValue": 0.0,
+                "divineValue": 0.0,
+                "count": rng.randint(1, 200),
+                "detailsId": f"card-{i}",
+                "tradeInfo": [],
+                "listingCount": rng.randint(1, 400),
+            }
+        )
+    return {"lines": lines}
+
+
+def make_snapshots(scale: float = 1.0, seed: int = 0) -> Dict[str, Dict[str, Dict]]:
+    """Build a full set of snapshots grouped like ``PoeNinja.get_data`` output.
+
+    Args:
+        scale: Multiplier for the number of lines (1.0 is roughly live size)
+        seed: Random seed, so runs are reproducible
+
+    Returns:
+        Snapshots grouped by data directory and item type
+    """
+    rng = random.Random(seed)
+    uniques = {
+        item_type: make_uniques(rng, item_type, int(300 * scale))
+        for item_type in UNIQUE_TYPES
+    }
+    return {
+        "Data": {
+            "Currency": make_currency(rng),
+            "DivinationCard": make_divination(rng, int(450 * scale), uniques),
+        },
+        "Uniquedata": uniques,
+    }
+
+
+def write_snapshots(snapshots: Dict[str, Dict[str, Dict]], root: str) -> None:
+    """Write snapshots to ``root/Data`` and ``root/Uniquedata`` as JSON files."""
+    for directory, payloads in snapshots.items():
+        os.makedirs(os.path.join(root, directory), exist_ok=True)
+        for item_type, payload in payloads.items():
+            path = os.path.join(root, directory, f"{item_type}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+
+
+def make_leagues(league: str = "Bench") -> List[Dict]:
+    """Build a league list shaped like the PoE API ``/leagues`` response."""
+    return [
+        {"id": "Standard", "realm": "pc", "name": "Standard", "startAt": None},
+        {
+            "id": league,
+            "realm": "pc",
+            "name": league,
+            "startAt": "2024-07-26T19:00:00Z",
+            "endAt": None,
+        },
+        {
+            "id": f"Hardcore {league}",
+            "realm": "pc",
+            "name": f"Hardcore {league}",
+            "startAt": "2024-07-26T19:00:00Z",
+            "endAt": None,
+        },
+    ]
+
+
+def read_fixtures(root: str) -> Tuple[Dict[str, Dict[str, Dict]], List[Dict]]:
+    """Read fixtures written by ``write_snapshots`` or ``record_fixtures``.
+
+    Returns:
+        Tuple of (snapshots grouped by data directory and item type, league
+        list, or ``make_leagues()`` if none was recorded)
+    """
+    snapshots: Dict[str, Dict[str, Dict]] = {}
+    for directory in ("Data", "Uniquedata"):
+        snapshots[directory] = {}
+        for file in sorted(os.listdir(os.path.join(root, directory))):
+            if file.endswith(".json"):
+                with open(os.path.join(root, directory, file), encoding="utf-8") as f:
+                    snapshots[directory][file[: -len(".json")]] = json.load(f)
+    try:
+        with open(os.path.join(root, "leagues.json"), encoding="utf-8") as f:
+            leagues = json.load(f)
+    except FileNotFoundError:
+        leagues = make_leagues()
+    return snapshots, leagues
+
+
+def scale_snapshots(
+    snapshots: Dict[str, Dict[str, Dict]], factor: int
+) -> Dict[str, Dict[str, Dict]]:
+    """Repeat every card and unique item line ``factor`` times.
+
+    Copies get a numbered name suffix, so they are distinct items; copied
+    cards keep the reward of their original. Currency is not repeated, as
+    cards reference currency by name.
+    """
+    if factor <= 1:
+        return snapshots
+
+    def repeat(payload: Dict) -> Dict:
+        lines = list(payload["lines"])
+        for copy in range(1, factor):
+            lines.extend(
+                dict(line, name=f"{line['name']} #{copy}") for line in payload["lines"]
+            )
+        return dict(payload, lines=lines)
+
+    return {
+        "Data": {
+            "Currency": snapshots["Data"]["Currency"],
+            "DivinationCard": repeat(snapshots["Data"]["DivinationCard"]),
+        },
+        "Uniquedata": {
+            item_type: repeat(payload)
+            for item_type, payload in snapshots["Uniquedata"].items()
+        },
+    }
@@ -0,0 +1,254 @@
+"""Local HTTP stand-in for poe.ninja, the PoE leagues API and GitHub.
+
+Serves fixed payloads with configurable latency and bandwidth, so the
+fetch path can be benchmarked offline and reproducibly. Like the real
+servers it sends ``ETag`` validators, answers ``If-None-Match`` with
+304 Not Modified and gzip-compresses bodies when asked to.
+
+Usage as a standalone server:
+    python -m benchmarks.mock_server [--fixtures DIR] [--scale N]
+                                     [--latency MS] [--bandwidth MBIT] [--port N]
+
+The CLI reads its overviews from it with ``--source`` set to the printed
+poe.ninja URL.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixtures import (
+    make_leagues,
+    make_snapshots,
+    read_fixtures,
+    scale_snapshots,
+)
+from utils.http_client import HttpClient
+from utils.price_source import HttpSource
+
+
+class Payload:
+    """Pre-encoded response body with its validator."""
+
+    def __init__(self, body: bytes, content_type: str = "application/json"):
+        self.body = body
+        self.content_type = content_type
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self._gzipped: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    @property
+    def gzipped(self) -> bytes:
+        """Gzip-compressed body, compressed on first use."""
+        with self._lock:
+            if self._gzipped is None:
+                self._gzipped = gzip.compress(self.body, compresslevel=6)
+            return self._gzipped
+
+
+class MockServer:
+    """Threaded local server replaying fixed payloads.
+
+    Set ``Utils.price_source`` to ``price_source()`` to send every
+    poe.ninja, leagues and GitHub request here.
+    """
+
+    CHUNK_SIZE = 16 * 1024
+
+    def __init__(
+        self,
+        snapshots: Dict[str, Dict[str, Dict]],
+        leagues: List[Dict],
+        latency: float = 0.0,
+        bandwidth: Optional[float] = None,
+        version: str = '__version__ = "0.0.0"\n',
+    ):
+        """Prepare the payloads.
+
+        Args:
+            snapshots: Overviews grouped like ``PoeNinja.get_data`` output;
+                every league is served the same ones
+            leagues: League list served as the PoE API response
+            latency: Seconds before each response starts
+            bandwidth: Bytes per second per response, or None for unlimited
+            version: Body of the served ``__version__.py``
+        """
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.payloads: Dict[str, Payload] = {
+            item_type: Payload(json.dumps(payload).encode("utf-8"))
+            for payloads in snapshots.values()
+            for item_type, payload in payloads.items()
+        }
+        self.leagues = Payload(json.dumps(leagues).encode("utf-8"))
+        self.version = Payload(version.encode("utf-8"), "text/plain")
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @classmethod
+    def from_fixtures(
+        cls, fixtures: Optional[str] = None, scale: int = 1, **kwargs
+    ) -> "MockServer":
+        """Create a server for recorded or synthetic fixtures.
+
+        Args:
+            fixtures: Directory of recorded fixtures; synthetic full-size
+                payloads are generated when omitted
+            scale: Repeat every card and unique line this many times
+            **kwargs: Passed on to ``MockServer``
+        """
+        if fixtures:
+            snapshots, leagues = read_fixtures(fixtures)
+        else:
+            snapshots, leagues = make_snapshots(), make_leagues()
+        return cls(scale_snapshots(snapshots, scale), leagues, **kwargs)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def ninja_url(self) -> str:
+        return f"{self.base_url}/api/data/"
+
+    @property
+    def leagues_url(self) -> str:
+        return f"{self.base_url}/leagues?type=main"
+
+    @property
+    def version_url(self) -> str:
+        return f"{self.base_url}/__version__.py"
+
+    def price_source(self, client: HttpClient) -> HttpSource:
+        """Return a price source reading everything from this server."""
+        return HttpSource(client, self.ninja_url, self.leagues_url, self.version_url)
+
+    @property
+    def payload_bytes(self) -> int:
+        """Uncompressed size of all overview payloads."""
+        return sum(len(payload.body) for payload in self.payloads.values())
+
+    def start(self, port: int = 0) -> "MockServer":
+        """Start serving on a background thread."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def reset_counters(self) -> Tuple[int, int]:
+        """Return and reset the (requests, bytes sent) counters."""
+        with self._lock:
+            counters = (self.requests, self.bytes_sent)
+            self.requests = self.bytes_sent = 0
+        return counters
+
+    def route(self, url: str) -> Optional[Payload]:
+        """Return the payload served for a request path."""
+        parts = urlsplit(url)
+        if parts.path == "/leagues":
+            return self.leagues
+        if parts.path == "/__version__.py":
+            return self.version
+        if parts.path.startswith("/api/data/"):
+            item_type = parse_qs(parts.query).get("type", [""])[0]
+            return self.payloads.get(item_type)
+        return None
+
+    def _count(self, sent: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += sent
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed
+            # ACKs add ~40 ms to every small keep-alive response.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                payload = server.route(self.path)
+                if payload is None:
+                    self._reply(404, b"")
+                    return
+                if self.headers.get("If-None-Match") == payload.etag:
+                    self._reply(304, b"", {"ETag": payload.etag})
+                    return
+                headers = {"ETag": payload.etag, "Content-Type": payload.content_type}
+                body = payload.body
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = payload.gzipped
+                    headers["Content-Encoding"] = "gzip"
+                self._reply(200, body, headers)
+
+            def _reply(self, status: int, body: bytes, headers=None) -> None:
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                for start in range(0, len(body), server.CHUNK_SIZE):
+                    chunk = body[start : start + server.CHUNK_SIZE]
+                    self.wfile.write(chunk)
+                    if server.bandwidth:
+                        time.sleep(len(chunk) / server.bandwidth)
+                server._count(len(body))
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", help="directory of recorded fixtures")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds")
+    parser.add_argument("--bandwidth", type=float, help="Mbit/s per response")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = MockServer.from_fixtures(
+        args.fixtures,
+        args.scale,
+        latency=args.latency / 1000,
+        bandwidth=args.bandwidth * 125_000 if args.bandwidth else None,
+    ).start(args.port)
+    print(f"poe.ninja:   {server.ninja_url}")
+    print(f"leagues:     {server.leagues_url}")
+    print(f"version:     {server.version_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
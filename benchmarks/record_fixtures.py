@@ -0,0 +1,71 @@
+"""Record live poe.ninja overviews and the league list as benchmark fixtures.
+
+Usage:
+    python -m benchmarks.record_fixtures --out DIR [--league NAME]
+
+All eight overview endpoints of the league are saved unparsed, so unique
+item fixtures keep every field, into ``DIR/Data`` and ``DIR/Uniquedata``
+next to ``DIR/leagues.json``. The directory can then be passed as
+``--fixtures`` to ``benchmarks.suite`` and ``benchmarks.mock_server``, or
+as ``--data-dir`` to the other benchmarks, or replayed with
+``python cli.py --source DIR``. Without ``--league`` the first active
+challenge league is recorded.
+"""
+
+import argparse
+import json
+import os
+
+from benchmarks.fixtures import write_snapshots
+from poeNinja.ninjaAPI import PoeNinja
+from utils.utils import Utils
+
+
+def record(league: str, out: str) -> int:
+    """Download the overviews of a league into ``out``.
+
+    Returns:
+        Total size of the recorded payloads in bytes
+    """
+    client = PoeNinja(persist=False)
+    jobs = client._process_endpoints(client._build_endpoints(league), league)
+    snapshots = {}
+    size = 0
+    for url, directory, _ in jobs:
+        body = client.source.get(url).body
+        size += len(body)
+        snapshots.setdefault(directory, {})[Utils.get_item_name(url)] = json.loads(body)
+        print(f"{url}  {len(body) / 1e6:6.2f} MB")
+    write_snapshots(snapshots, out)
+
+    source = Utils.price_source
+    leagues = json.loads(source.get(source.leagues_url).body)
+    with open(os.path.join(out, "leagues.json"), "w", encoding="utf-8") as f:
+        json.dump(leagues, f, ensure_ascii=False, indent=2)
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, help="fixture directory")
+    parser.add_argument("--league", help="league to record")
+    args = parser.parse_args()
+
+    league = args.league
+    if not league:
+        leagues = [
+            league["id"]
+            for league in Utils.get_current_leagues()
+            if league["id"] not in ("Standard", "Hardcore")
+            and not league["id"].startswith(("Hardcore", "SSF", "Solo"))
+        ]
+        if not leagues:
+            parser.error("no active challenge league found, pass --league")
+        league = leagues[0]
+
+    size = record(league, args.out)
+    print(f"Recorded {league}: {size / 1e6:.1f} MB to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""Offline benchmark suite: the refresh pipeline against a local mock server.
+
+Usage:
+    python -m benchmarks.suite [--fixtures DIR] [--scales 1,10] [--repeat N]
+                               [--latency MS] [--bandwidth MBIT]
+                               [--output FILE] [--baseline FILE] [--tolerance F]
+
+Every poe.ninja, leagues and GitHub request goes to ``MockServer`` on
+localhost, which replays the fixtures recorded by ``record_fixtures`` (or
+synthetic full-size payloads) at each of ``--scales``. Timed steps:
+
+    leagues             league list request
+    refresh_cold        first refresh: fetch all eight overviews, load,
+                        index, score; nothing cached on disk
+    refresh_revalidate  refresh of the same client, answered with 304s
+    refresh_restart     refresh of a new client over the saved files
+    refresh_replay      cold refresh from a ``DirectorySource`` holding the
+                        same overviews; no network involved
+    persist             flushing the background snapshot writes
+    load_data           ``Utils.load_data`` of parsed snapshots
+    calculate_highscores, score_cards
+                        reference and vectorized scoring of a new snapshot
+    table_populate      ``CardTableModel`` reset with a view attached
+    table_merge         ``CardTableModel`` merge of a repriced result
+
+A table goes to stderr and, with ``--output``, the results go to a JSON
+file (``-`` for stdout). With ``--baseline`` the medians are compared to an
+earlier output and the exit status is 1 when any step got slower than the
+tolerance allows. Set ``QT_QPA_PLATFORM=offscreen`` to run without a
+display; it is the default here.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.fixtures import (
+    make_leagues,
+    make_snapshots,
+    read_fixtures,
+    scale_snapshots,
+)
+from benchmarks.mock_server import MockServer
+from poeNinja.ninjaAPI import PoeNinja
+from utils.price_index import PriceIndex
+from utils.price_source import DirectorySource
+from utils.utils import Utils
+
+
+def timed(fn: Callable[[], object], repeat: int, setup=None) -> List[float]:
+    """Run ``fn`` ``repeat`` times and return the wall times in seconds.
+
+    ``setup`` runs untimed before every run.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def result(name: str, scale: int, times: List[float], **extra) -> Dict:
+    """Build one machine-readable result record."""
+    return {
+        "name": name,
+        "scale": scale,
+        "repeat": len(times),
+        "min_ms": round(min(times) * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "max_ms": round(max(times) * 1000, 3),
+        **extra,
+    }
+
+
+def score_snapshots(snapshots: Dict[str, Dict[str, Dict]], utils: Utils):
+    """Load and score parsed snapshots the way ``RefreshWorker`` does."""
+    divination_data, currency_data, unique_items = utils.load_data(snapshots)
+    price_index = PriceIndex.build(divination_data, currency_data, unique_items)
+    scored = utils.score_cards(
+        divination_data, price_index, utils.load_market(snapshots, price_index.uniques)
+    )
+    return scored, price_index
+
+
+class Suite:
+    """Runs every step at one payload scale against one mock server."""
+
+    def __init__(self, server: MockServer, scale: int, league: str, repeat: int):
+        self.server = server
+        self.scale = scale
+        self.league = league
+        self.repeat = repeat
+        self.results: List[Dict] = []
+
+    def record(self, name: str, times: List[float], **extra) -> None:
+        self.results.append(result(name, self.scale, times, **extra))
+        entry = self.results[-1]
+        print(
+            f"{name:<22} x{self.scale:<3} {entry['median_ms']:10.2f} ms median"
+            f"  {entry['min_ms']:10.2f} ms min",
+            file=sys.stderr,
+        )
+
+    def run(self) -> List[Dict]:
+        self.run_network()
+        self.run_replay()
+        snapshots = PoeNinja(persist=False).get_data(self.league)
+        self.run_scoring(snapshots)
+        self.run_table(snapshots)
+        return self.results
+
+    def run_network(self) -> None:
+        """Time the league list and the three kinds of refresh."""
+        self.record("leagues", timed(Utils.get_current_leagues, self.repeat))
+
+        cold, revalidate, restart, persist = [], [], [], []
+        cwd = os.getcwd()
+        for _ in range(self.repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                os.chdir(tmp)
+                try:
+                    Utils.http_client.close()
+                    self.server.reset_counters()
+                    client = PoeNinja(freshness_window=0)
+                    cold += timed(lambda: self.refresh(client), 1)
+                    requests, sent = self.server.reset_counters()
+                    persist += timed(client.flush, 1)
+                    revalidate += timed(lambda: self.refresh(client), 1)
+                    restarted = PoeNinja(freshness_window=0)
+                    restart += timed(lambda: self.refresh(restarted), 1)
+                    restarted.flush()
+                finally:
+                    os.chdir(cwd)
+        self.record("refresh_cold", cold, requests=requests, wire_bytes=sent)
+        self.record("refresh_revalidate", revalidate)
+        self.record("refresh_restart", restart)
+        self.record("persist", persist)
+
+    def run_replay(self) -> None:
+        """Time a cold refresh from the same overviews saved to a directory."""
+        with tempfile.TemporaryDirectory() as root:
+            for item_type, payload in self.server.payloads.items():
+                directory = "Uniquedata" if item_type.startswith("Unique") else "Data"
+                os.makedirs(os.path.join(root, directory), exist_ok=True)
+                with open(
+                    os.path.join(root, directory, f"{item_type}.json"), "wb"
+                ) as f:
+                    f.write(payload.body)
+            source = DirectorySource(root)
+            self.record(
+                "refresh_replay",
+                timed(
+                    lambda: self.refresh(PoeNinja(persist=False, source=source)),
+                    self.repeat,
+                ),
+            )
+
+    def refresh(self, client: PoeNinja) -> None:
+        snapshots = client.get_data(self.league)
+        if client.errors:
+            raise RuntimeError(f"Fetch failed: {client.errors}")
+        score_snapshots(snapshots, Utils())
+
+    def run_scoring(self, snapshots: Dict[str, Dict[str, Dict]]) -> None:
+        """Time loading and scoring of a new snapshot."""
+        divination_data, currency_data, unique_items = Utils.load_data(snapshots)
+        price_index = PriceIndex.build(divination_data, currency_data, unique_items)
+        cards = len(divination_data["lines"])
+        self.record(
+            "load_data",
+            timed(lambda: Utils.load_data(snapshots), self.repeat),
+            cards=cards,
+        )
+        self.record(
+            "calculate_highscores",
+            timed(
+                lambda: Utils().calculate_highscores(divination_data, price_index),
+                self.repeat,
+            ),
+            cards=cards,
+        )
+        self.record(
+            "score_cards",
+            timed(
+                lambda: Utils().score_cards(
+                    divination_data,
+                    price_index,
+                    Utils.load_market(snapshots, price_index.uniques),
+                ),
+                self.repeat,
+            ),
+            cards=cards,
+        )
+
+    def run_table(self, snapshots: Dict[str, Dict[str, Dict]]) -> None:
+        """Time the table model reset and merge, as the window shows them."""
+        # Imported here: the rest of the suite runs without Qt.
+        from PyQt6.QtWidgets import QApplication, QTableView
+
+        from gui.table_model import CardTableModel
+
+        app = QApplication.instance() or QApplication([])
+        utils = Utils()
+        scored, price_index = score_snapshots(snapshots, utils)
+        divine_value = price_index.divine_value or 1.0
+        model = CardTableModel()
+        view = QTableView()
+        view.setModel(model)
+        view.resize(1000, 600)
+        view.show()
+
+        def populate():
+            model.set_results(scored, divine_value, reset=True)
+            app.processEvents()
+
+        self.record("table_populate", timed(populate, self.repeat), cards=len(scored))
+
+        engine = utils._scoring_engine
+        rng = np.random.default_rng(0)
+        repriced = []
+        for _ in range(self.repeat):
+            card_prices = engine.cost.copy()
+            moved = rng.random(len(card_prices)) < 0.05
+            card_prices[moved] *= rng.uniform(0.5, 1.5, moved.sum())
+            repriced.append(engine.score(price_index, card_prices))
+        results = iter(repriced)
+
+        def merge():
+            model.set_results(next(results), divine_value)
+            app.processEvents()
+
+        self.record(
+            "table_merge",
+            timed(merge, self.repeat, setup=lambda: populate()),
+            cards=len(scored),
+        )
+        view.close()
+
+
+def compare(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """List the steps whose median got slower than the baseline allows."""
+    previous = {(entry["name"], entry["scale"]): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        old = previous.get((entry["name"], entry["scale"]))
+        if old is None:
+            continue
+        if entry["median_ms"] > old["median_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{entry['name']} x{entry['scale']}: {old['median_ms']:.2f} ms"
+                f" -> {entry['median_ms']:.2f} ms"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", help="directory of recorded fixtures")
+    parser.add_argument("--scales", default="1,10", help="comma separated")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds")
+    parser.add_argument("--bandwidth", type=float, help="Mbit/s per response")
+    parser.add_argument("--output", help="JSON results file, - for stdout")
+    parser.add_argument("--baseline", help="earlier JSON results to compare to")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%"
+    )
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if args.fixtures:
+        snapshots, leagues = read_fixtures(args.fixtures)
+    else:
+        snapshots, leagues = make_snapshots(), make_leagues()
+    league = next(
+        (league["id"] for league in leagues if league["id"] != "Standard"),
+        "Standard",
+    )
+
+    results: List[Dict] = []
+    for scale in (int(scale) for scale in args.scales.split(",")):
+        server = MockServer(
+            scale_snapshots(snapshots, scale),
+            leagues,
+            latency=args.latency / 1000,
+            bandwidth=args.bandwidth * 125_000 if args.bandwidth else None,
+        )
+        with server:
+            Utils.price_source = server.price_source(Utils.http_client)
+            print(
+                f"Scale x{scale}: {server.payload_bytes / 1e6:.1f} MB of overviews",
+                file=sys.stderr,
+            )
+            for entry in Suite(server, scale, league, args.repeat).run():
+                entry["payload_bytes"] = server.payload_bytes
+                results.append(entry)
+        Utils.http_client.close()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "fixtures": args.fixtures or "synthetic",
+            "league": league,
+            "latency_ms": args.latency,
+            "bandwidth_mbit": args.bandwidth,
+            "repeat": args.repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
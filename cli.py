@@ -0,0 +1,444 @@
+"""Score divination cards without the GUI.
+
+Usage:
+    python cli.py [--league NAME] [--top N] [--min-profit CHAOS]
+                  [--sort profit|risk] [--format table|csv|json] [--output FILE]
+                  [--watch] [--interval SECONDS] [--no-history]
+                  [--timings] [--timings-log FILE] [--profile DIR]
+                  [--source URL|DIR] [--server URL]
+    python cli.py --card NAME [--league NAME] [--hours H] [--format ...]
+    python cli.py --serve [PORT] [--league NAME] [--interval SECONDS]
+
+Nothing in this code path imports PyQt6, so it runs on headless machines
+and from cron. ``--source`` reads prices from a poe.ninja mirror instead of
+poe.ninja, or replays the snapshots recorded in a directory offline.
+
+``--serve`` runs a local score server instead: it fetches and scores every
+active league (or ``--league``) every ``--interval`` seconds and serves the
+results on localhost. Other instances pass its URL as ``--server`` and
+read the scored league with one small request instead of fetching and
+scoring the poe.ninja overviews themselves.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+from poeNinja.ninjaAPI import PoeNinja
+from utils.history_store import HistoryStore
+from utils.instrumentation import Instrumentation, instrumentation
+from utils.price_index import PriceIndex
+from utils.price_source import PriceSource
+from utils.score_client import ScoreClient
+from utils.score_server import ScoreServer
+from utils.scoring import ScoredCards
+from utils.utils import Utils
+
+FORMATS = ("table", "csv", "json")
+
+COLUMNS = [
+    ("#", "Rank"),
+    ("Name", "Name"),
+    ("Type", "Type"),
+    ("Total profit", "Profit"),
+    ("Profit per card", "Profitpercard"),
+    ("1 card price", "Cost"),
+    ("Total set price", "Total"),
+    ("Reward price", "Sellprice"),
+    ("Risk-adj. profit", "RiskAdjustedProfit"),
+    ("Card trend %", "CardTrend"),
+    ("Reward trend %", "RewardTrend"),
+    ("Reward volatility %", "RewardVolatility"),
+    ("Reward listings", "RewardListings"),
+]
+
+SORT_KEYS = ("profit", "risk")
+
+
+HISTORY_COLUMNS = [
+    ("Time", "Time"),
+    ("1 card price", "Cost"),
+    ("Reward price", "Sellprice"),
+    ("Total profit", "Profit"),
+]
+
+
+def score_league(
+    poe_ninja: Union[PoeNinja, ScoreClient],
+    utils: Utils,
+    league: str,
+    top: Optional[int] = None,
+    min_profit: Optional[float] = None,
+    history: Optional[HistoryStore] = None,
+    sort: str = "profit",
+) -> List[Dict]:
+    """Fetch a league and rank its divination cards by profit.
+
+    Args:
+        poe_ninja: Client used to fetch the snapshots, or a score server
+            client that fetches the scored league
+        utils: Utils instance holding the reward index and scoring caches
+        league: League name
+        top: Keep only this many cards
+        min_profit: Drop cards with a lower total profit in chaos
+        history: Store that newly downloaded results are appended to
+        sort: "profit" to rank by total profit, "risk" by risk-adjusted profit
+
+    Returns:
+        Highscore entries like ``Utils.calculate_highscores``, with a
+        ``Rank`` key added
+    """
+    scored = fetch_scores(poe_ninja, utils, league)
+    if history is not None and poe_ninja.received_new_data:
+        try:
+            history.append(league, scored)
+        except sqlite3.Error as e:
+            print(f"Error recording history: {e}", file=sys.stderr)
+
+    order = scored.sorted_by("risk_adjusted_profit" if sort == "risk" else "profit")
+    if min_profit is not None:
+        order = order[scored.profit[order] >= min_profit]
+    if top is not None:
+        order = order[:top]
+
+    records = scored.records(order)
+    for rank, record in enumerate(records, start=1):
+        record["Rank"] = rank
+    return records
+
+
+def fetch_scores(
+    poe_ninja: Union[PoeNinja, ScoreClient], utils: Utils, league: str
+) -> ScoredCards:
+    """Fetch and score a league, or fetch it already scored from a server.
+
+    Raises:
+        OSError: If a score server could not deliver the league
+    """
+    if isinstance(poe_ninja, ScoreClient):
+        results = poe_ninja.get_leagues([league])
+        if league not in results:
+            raise next(iter(poe_ninja.errors.values()))
+        return results[league][0]
+
+    snapshots = poe_ninja.get_data(league)
+    divination_data, currency_data, unique_items = utils.load_data(snapshots)
+    price_index = PriceIndex.build(divination_data, currency_data, unique_items)
+    return utils.score_cards(
+        divination_data, price_index, utils.load_market(snapshots, price_index.uniques)
+    )
+
+
+def serve(
+    port: int,
+    league: Optional[str],
+    interval: float,
+    history: Optional[HistoryStore],
+) -> int:
+    """Run a score server until interrupted.
+
+    Args:
+        port: Port to listen on
+        league: Only serve this league; every active league otherwise
+        interval: Seconds between two refreshes
+        history: Store that newly downloaded results are appended to
+    """
+    # Every scheduled refresh revalidates, rather than reusing the previous one
+    poe_ninja = PoeNinja(freshness_window=0)
+    server = ScoreServer(
+        poe_ninja, [league] if league else None, interval, history
+    ).start(port)
+    print(f"Serving scores on {server.url}", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        poe_ninja.flush()
+        if history is not None:
+            history.close()
+    return 0
+
+
+def card_history(
+    history: HistoryStore, league: str, name: str, hours: Optional[float] = None
+) -> List[Dict]:
+    """Read the recorded prices of a card.
+
+    Args:
+        history: History store
+        league: League name
+        name: Card name
+        hours: Only include the last this many hours
+
+    Returns:
+        One entry per recorded refresh, oldest first
+    """
+    start = time.time() - hours * 3600 if hours is not None else None
+    return [
+        {
+            "Time": datetime.fromtimestamp(taken_at).isoformat(" ", "seconds"),
+            "Cost": cost,
+            "Sellprice": reward_price,
+            "Profit": round(profit, 2),
+        }
+        for taken_at, cost, reward_price, profit in history.card_history(
+            league, name, start
+        )
+    ]
+
+
+def format_table(records: List[Dict], columns=COLUMNS) -> str:
+    """Render records as a plain-text table."""
+    rows = [[header for header, _ in columns]]
+    for record in records:
+        rows.append(
+            [
+                (
+                    f"{record[key]:.2f}"
+                    if isinstance(record[key], float)
+                    else "-" if record[key] is None else str(record[key])
+                )
+                for _, key in columns
+            ]
+        )
+    widths = [max(len(row[col]) for row in rows) for col in range(len(columns))]
+    text_columns = {
+        col for col, (_, key) in enumerate(columns) if key in ("Name", "Type", "Time")
+    }
+    lines = []
+    for i, row in enumerate(rows):
+        cells = [
+            cell.ljust(width) if col in text_columns else cell.rjust(width)
+            for col, (cell, width) in enumerate(zip(row, widths))
+        ]
+        lines.append("  ".join(cells).rstrip())
+        if i == 0:
+            lines.append("  ".join("-" * width for width in widths))
+    return "\n".join(lines) + "\n"
+
+
+def format_csv(records: List[Dict], columns=COLUMNS) -> str:
+    """Render records as CSV with the result keys as header."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(
+        buffer, fieldnames=[key for _, key in columns], lineterminator="\n"
+    )
+    writer.writeheader()
+    for record in records:
+        writer.writerow({key: record[key] for _, key in columns})
+    return buffer.getvalue()
+
+
+def format_json(records: List[Dict], columns=COLUMNS) -> str:
+    """Render records as a JSON array."""
+    return json.dumps(records, indent=2) + "\n"
+
+
+FORMATTERS = {"table": format_table, "csv": format_csv, "json": format_json}
+
+
+def format_timings(since: float) -> str:
+    """Render the pipeline stages recorded since a Unix time."""
+    lines = [f"{'stage':<8} {'runs':>5} {'total ms':>9} {'max ms':>8} {'KiB':>7} items"]
+    for stage, stats in instrumentation.summary(since).items():
+        lines.append(
+            f"{stage:<8} {int(stats['runs']):>5} {stats['total'] * 1000:>9.1f} "
+            f"{stats['max'] * 1000:>8.2f} {stats['bytes'] / 1024:>7.0f} "
+            f"{int(stats['items'])}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def write_output(text: str, path: Optional[str]) -> None:
+    """Print the output, or replace the output file atomically."""
+    if path is None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def default_league() -> Optional[str]:
+    """Return the first active league, like the GUI's league selector."""
+    leagues = Utils.get_current_leagues()
+    return leagues[0]["name"] if leagues else None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--league", help="league name (default: current league)")
+    parser.add_argument("--top", type=int, help="show only the N best cards")
+    parser.add_argument(
+        "--min-profit", type=float, help="hide cards below this profit in chaos"
+    )
+    parser.add_argument(
+        "--sort",
+        choices=SORT_KEYS,
+        default="profit",
+        help="rank by total or risk-adjusted profit",
+    )
+    parser.add_argument("--format", choices=FORMATS, default="table")
+    parser.add_argument("--output", help="write to this file instead of stdout")
+    parser.add_argument(
+        "--watch", action="store_true", help="re-score every --interval seconds"
+    )
+    parser.add_argument("--interval", type=float, default=300)
+    parser.add_argument(
+        "--list-leagues", action="store_true", help="print active leagues and exit"
+    )
+    parser.add_argument(
+        "--no-history", action="store_true", help="do not record price history"
+    )
+    parser.add_argument("--card", help="print the recorded history of a card")
+    parser.add_argument(
+        "--hours", type=float, help="with --card, only the last H hours"
+    )
+    parser.add_argument(
+        "--timings", action="store_true", help="print per-stage timings to stderr"
+    )
+    parser.add_argument(
+        "--timings-log", help="append per-stage timings to this JSON lines file"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="profile each run with cProfile and tracemalloc into DIR",
+    )
+    parser.add_argument(
+        "--source",
+        metavar="URL|DIR",
+        help="poe.ninja compatible base URL, or directory of recorded snapshots",
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        type=int,
+        const=ScoreServer.DEFAULT_PORT,
+        metavar="PORT",
+        help="run a local score server for other instances "
+        f"(default port {ScoreServer.DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--server", metavar="URL", help="read scored leagues from a score server"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.source:
+        Utils.price_source = PriceSource.from_spec(args.source, Utils.http_client)
+    score_client = None
+    if args.server:
+        score_client = ScoreClient(args.server, Utils.http_client)
+        Utils.price_source = score_client.price_source()
+
+    if args.list_leagues:
+        for league in Utils.get_current_leagues():
+            print(league["name"])
+        return 0
+
+    if args.serve is not None:
+        history = None
+        if not args.no_history:
+            Utils.create_directories("Data")
+            history = HistoryStore(os.path.join("Data", HistoryStore.FILENAME))
+        return serve(args.serve, args.league, args.interval, history)
+
+    league = args.league or default_league()
+    if not league:
+        print("Error: no active league found, pass --league", file=sys.stderr)
+        return 1
+
+    formatter = FORMATTERS[args.format]
+    instrumentation.log_path = args.timings_log
+    history = None
+    # With a score server the history is recorded by the server
+    if args.card or not (args.no_history or score_client):
+        Utils.create_directories("Data")
+        history = HistoryStore(os.path.join("Data", HistoryStore.FILENAME))
+
+    if args.card:
+        records = card_history(history, league, args.card, args.hours)
+        since = history.profitable_since(league, args.card)
+        write_output(formatter(records, HISTORY_COLUMNS), args.output)
+        if since is not None:
+            print(
+                f"Profitable since {datetime.fromtimestamp(since):%Y-%m-%d %H:%M}",
+                file=sys.stderr,
+            )
+        history.close()
+        return 0
+
+    # Every --watch round revalidates, rather than reusing the previous round
+    poe_ninja = score_client or (
+        PoeNinja(freshness_window=0) if args.watch else PoeNinja()
+    )
+    utils = Utils()
+    try:
+        while True:
+            started = time.monotonic()
+            started_at = time.time()
+            try:
+                with (
+                    Instrumentation.capture(args.profile)
+                    if args.profile
+                    else contextlib.nullcontext()
+                ):
+                    records = score_league(
+                        poe_ninja,
+                        utils,
+                        league,
+                        args.top,
+                        args.min_profit,
+                        history,
+                        args.sort,
+                    )
+            except Exception as e:
+                if not args.watch and not isinstance(e, (OSError, ValueError)):
+                    raise
+                print(f"Error scoring {league}: {e}", file=sys.stderr)
+                if not args.watch:
+                    return 1
+                records = None
+            else:
+                for url, error in poe_ninja.errors.items():
+                    print(f"Error fetching {url}: {error}", file=sys.stderr)
+                write_output(formatter(records), args.output)
+            if args.timings:
+                sys.stderr.write(format_timings(started_at))
+            if not args.watch:
+                break
+            if records is not None:
+                print(
+                    f"[{datetime.now():%H:%M:%S}] {league}: {len(records)} cards "
+                    f"in {time.monotonic() - started:.1f} s",
+                    file=sys.stderr,
+                )
+            time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if isinstance(poe_ninja, PoeNinja):
+            poe_ninja.flush()
+        if history is not None:
+            history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from gui.table_model import CardTableModel
+
+if TYPE_CHECKING:
+    from utils.scoring import ScoredCards
+
+# name, type, total profit per league (None where the card is not listed)
+ComparisonRow = Tuple[str, str, Tuple[Optional[float], ...]]
+
+
+class LeagueComparisonModel(QAbstractTableModel):
+    """Read-only table of the profit of each card side by side across leagues.
+
+    Rows are sorted by profit in the selected league; cards that are only
+    listed in other leagues follow, sorted by their best profit. The last
+    column names the league where a set is worth the most.
+    """
+
+    FIXED_HEADERS = ("#", "Name", "Type")
+    NAME_COLUMN = 1
+    FIRST_LEAGUE_COLUMN = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._leagues: List[str] = []
+        self._rows: List[ComparisonRow] = []
+
+    def set_results(self, results: Dict[str, "ScoredCards"], league: str) -> None:
+        """Show the scoring results of several leagues.
+
+        Args:
+            results: Scoring result per league, in column order
+            league: Selected league, which the rows are sorted by
+        """
+        self.beginResetModel()
+        self._leagues = list(results)
+        self._rows = self._rows_of(results, league)
+        self.endResetModel()
+
+    @property
+    def leagues(self) -> List[str]:
+        """Leagues shown as columns."""
+        return self._leagues
+
+    def card_name(self, row: int) -> Optional[str]:
+        """Return the card name shown in a row."""
+        if 0 <= row < len(self._rows):
+            return self._rows[row][0]
+        return None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.FIXED_HEADERS) + len(self._leagues) + 1
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if (
+            orientation != Qt.Orientation.Horizontal
+            or role != Qt.ItemDataRole.DisplayRole
+        ):
+            return None
+        if section < self.FIRST_LEAGUE_COLUMN:
+            return self.FIXED_HEADERS[section]
+        if section - self.FIRST_LEAGUE_COLUMN < len(self._leagues):
+            return self._leagues[section - self.FIRST_LEAGUE_COLUMN]
+        return "Best league"
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        name, kind, profits = self._rows[row]
+        league = col - self.FIRST_LEAGUE_COLUMN
+        is_profit = 0 <= league < len(self._leagues)
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return str(row + 1)
+            if col == self.NAME_COLUMN:
+                return name
+            if col == 2:
+                return kind
+            if is_profit:
+                profit = profits[league]
+                return "-" if profit is None else f"{int(profit)} c"
+            return self._best_league(profits)
+
+        if role == Qt.ItemDataRole.TextAlignmentRole and (col == 0 or is_profit):
+            return CardTableModel.RIGHT_ALIGNMENT
+
+        if role == Qt.ItemDataRole.ForegroundRole and is_profit:
+            profit = profits[league]
+            if profit is None:
+                return None
+            if int(profit) > 0:
+                return CardTableModel.PROFIT_COLOR
+            if int(profit) < 0:
+                return CardTableModel.LOSS_COLOR
+
+        return None
+
+    def _best_league(self, profits: Tuple[Optional[float], ...]) -> str:
+        """Return the league with the highest profit, if it is positive."""
+        known = [
+            (profit, league)
+            for league, profit in zip(self._leagues, profits)
+            if profit is not None
+        ]
+        if not known:
+            return ""
+        profit, league = max(known)
+        return league if profit > 0 else ""
+
+    @staticmethod
+    def _rows_of(results: Dict[str, "ScoredCards"], league: str) -> List[ComparisonRow]:
+        """Build one row per card listed in any league."""
+        profits: Dict[str, List[Optional[float]]] = {}
+        kinds: Dict[str, str] = {}
+        for column, scored in enumerate(results.values()):
+            for name, kind, profit in zip(
+                scored.names, scored.kinds, scored.profit.tolist()
+            ):
+                profits.setdefault(name, [None] * len(results))[column] = round(
+                    profit, 2
+                )
+                kinds.setdefault(name, kind)
+
+        primary = list(results).index(league) if league in results else 0
+        rows = [(name, kinds[name], tuple(values)) for name, values in profits.items()]
+
+        def sort_key(row: ComparisonRow) -> Tuple[bool, float]:
+            profit = row[2][primary]
+            if profit is None:
+                return True, -max(p for p in row[2] if p is not None)
+            return False, -profit
+
+        rows.sort(key=sort_key)
+        return rows
@@ -0,0 +1,122 @@
+from typing import Dict
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (
+    QCheckBox,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from gui.styles import AUTO_REFRESH, DEBUG_PANEL, TABLE_WIDGET
+from utils.instrumentation import instrumentation
+
+
+class DebugPanel(QDialog):
+    """Per-stage timings of the last refresh, plus the profiling switches.
+
+    The table shows, per pipeline stage, how often it ran during the last
+    refresh, its total, mean and worst wall time, and the bytes and items
+    it handled. Network and parse runs happen on several threads at once,
+    so their totals can exceed the refresh's wall time.
+    """
+
+    HEADERS = ("Stage", "Runs", "Total ms", "Mean ms", "Max ms", "KiB", "Items")
+    LOG_PATH = "timings.jsonl"
+    PROFILE_DIRECTORY = "Profiles"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Refresh timings")
+        self.setStyleSheet(DEBUG_PANEL)
+        self.resize(680, 360)
+
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setStyleSheet(TABLE_WIDGET)
+        self.table.setShowGrid(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(20)
+        self.table.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Stretch
+        )
+
+        self.summary_label = QLabel("No refresh yet")
+
+        self.log_box = QCheckBox(f"Append timings to {self.LOG_PATH}")
+        self.log_box.setStyleSheet(AUTO_REFRESH)
+        self.log_box.setChecked(instrumentation.log_path is not None)
+        self.log_box.toggled.connect(self._toggle_log)
+
+        self.profile_box = QCheckBox("Profile next refresh (cProfile + tracemalloc)")
+        self.profile_box.setStyleSheet(AUTO_REFRESH)
+        self.profile_box.setToolTip(
+            f"Writes a .prof file and a report to {self.PROFILE_DIRECTORY}/"
+        )
+
+        switches = QHBoxLayout()
+        switches.addWidget(self.log_box)
+        switches.addStretch(1)
+        switches.addWidget(self.profile_box)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.table, 1)
+        layout.addWidget(self.summary_label)
+        layout.addLayout(switches)
+
+    @property
+    def profile_next(self) -> bool:
+        """Whether the next refresh should be profiled."""
+        return self.profile_box.isChecked()
+
+    def profile_taken(self) -> None:
+        """Reset the profiling switch once a capture has been written."""
+        self.profile_box.setChecked(False)
+        self.summary_label.setText(
+            f"{self.summary_label.text()} · profile saved to "
+            f"{self.PROFILE_DIRECTORY}/"
+        )
+
+    def show_refresh(self, since: float, wall_time: float) -> None:
+        """Show the stages recorded since a refresh started.
+
+        Args:
+            since: Unix time the refresh started
+            wall_time: Duration of the refresh in seconds
+        """
+        stages = instrumentation.summary(since)
+        self.table.setRowCount(len(stages))
+        for row, (stage, stats) in enumerate(stages.items()):
+            self._set_row(row, stage, stats)
+        self.summary_label.setText(
+            f"Last refresh took {wall_time * 1000:.0f} ms over "
+            f"{sum(int(stats['runs']) for stats in stages.values())} stage runs"
+        )
+
+    def _set_row(self, row: int, stage: str, stats: Dict[str, float]) -> None:
+        values = (
+            stage,
+            str(int(stats["runs"])),
+            f"{stats['total'] * 1000:.1f}",
+            f"{stats['mean'] * 1000:.2f}",
+            f"{stats['max'] * 1000:.2f}",
+            f"{stats['bytes'] / 1024:.0f}",
+            str(int(stats["items"])),
+        )
+        for col, value in enumerate(values):
+            item = QTableWidgetItem(value)
+            if col:
+                item.setTextAlignment(
+                    Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+                )
+            self.table.setItem(row, col, item)
+
+    @classmethod
+    def _toggle_log(cls, enabled: bool) -> None:
+        """Start or stop appending every record to the JSON log."""
+        instrumentation.log_path = cls.LOG_PATH if enabled else None
@@ -1,21 +1,31 @@
 import json
-from typing import Dict, List, Optional
-
-from PyQt6.QtCore import QPropertyAnimation, Qt, QTimer, QUrl
-from PyQt6.QtGui import QColor, QDesktopServices
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple, Union
+
+from PyQt6.QtCore import (
+    QModelIndex,
+    QPropertyAnimation,
+    Qt,
+    QThreadPool,
+    QTimer,
+    QUrl,
+)
+from PyQt6.QtGui import QDesktopServices, QKeySequence, QShortcut
 from PyQt6.QtWidgets import (
     QApplication,
+    QCheckBox,
     QComboBox,
     QHBoxLayout,
     QHeaderView,
     QLabel,
+    QLineEdit,
     QMainWindow,
     QMessageBox,
     QPushButton,
+    QSpinBox,
     QStyle,
     QStyledItemDelegate,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
@@ -23,6 +33,7 @@ from PyQt6.QtWidgets import (
 from __version__ import __version__ as version
 from __version__ import __version_description__
 from gui.styles import (
+    AUTO_REFRESH,
     COMBO_BOX,
     COPY_LABEL,
     FOOTER,
@@ -30,15 +41,31 @@ from gui.styles import (
     HEADER,
     HEADER_LABEL,
     MAIN_WINDOW,
+    MATCH_LABEL,
     MESSAGE_BOX,
+    REFRESH_LABEL,
+    SEARCH_BOX,
     START_BUTTON,
     STATUS_LABEL,
     TABLE_WIDGET,
     UPDATE_BUTTON,
     get_update_message,
 )
-from poeNinja.ninjaAPI import PoeNinja
-from utils.utils import Utils
+from gui.comparison_model import LeagueComparisonModel
+from gui.proxy_model import CardProxyModel
+from gui.refresh_scheduler import RefreshScheduler
+from gui.table_model import CardTableModel
+from gui.workers import FunctionWorker, RefreshWorker, Worker
+from utils.instrumentation import instrumentation
+from utils.league_cache import LeagueCache
+
+if TYPE_CHECKING:
+    from gui.debug_panel import DebugPanel
+    from poeNinja.ninjaAPI import PoeNinja
+    from utils.price_index import PriceIndex
+    from utils.score_client import ScoreClient
+    from utils.scoring import ScoredCards
+    from utils.utils import Utils
 
 
 class NoFocusDelegate(QStyledItemDelegate):
@@ -53,12 +80,65 @@ class NoFocusDelegate(QStyledItemDelegate):
 class MainWindow(QMainWindow):
     """Main application window for Path of Exile Card Flipper."""
 
-    def __init__(self):
+    def __init__(self, score_client: Optional["ScoreClient"] = None):
+        """Build the window.
+
+        Args:
+            score_client: Client of a score server to read scored leagues
+                from, instead of fetching and scoring them locally
+        """
         super().__init__()
-        self.utils = Utils()
+        self._utils: Optional["Utils"] = None
+        self._poe_ninja: Optional[Union["PoeNinja", "ScoreClient"]] = score_client
+        self._price_index: Optional["PriceIndex"] = None
+        # Per-league scoring caches and latest results, for instant switching
+        self._league_utils: Dict[str, "Utils"] = {}
+        self._league_results: Dict[str, Tuple["ScoredCards", "PriceIndex"]] = {}
+        self._thread_pool = QThreadPool.globalInstance()
+        self._workers: Set[Worker] = set()
+        self._refresh_worker: Optional[RefreshWorker] = None
+        self._results_league: Optional[str] = None
+        self._leagues: Dict[str, Dict] = {}
+        self._refresh_started = 0.0
+        self._refresh_started_at = 0.0  # Unix time, for the debug panel
+        self._profiling = False
+        self._debug_panel: Optional["DebugPanel"] = None
+        self._refresh_changed = False
+        self._last_latency: Optional[float] = None
+        self.scheduler = RefreshScheduler(parent=self)
         self._setup_ui()
         self._setup_connections()
         self._setup_animation_timers()
+        self._load_leagues()
+
+    @property
+    def utils(self) -> "Utils":
+        """Utils instance, created on first use to keep startup light."""
+        if self._utils is None:
+            from utils.utils import Utils
+
+            self._utils = Utils()
+        return self._utils
+
+    @property
+    def poe_ninja(self) -> Union["PoeNinja", "ScoreClient"]:
+        """poe.ninja client, created on first use to keep startup light.
+
+        This is the score server client instead when one was given.
+        """
+        if self._poe_ninja is None:
+            from poeNinja.ninjaAPI import PoeNinja
+
+            self._poe_ninja = PoeNinja()
+        return self._poe_ninja
+
+    def _utils_for(self, league: str) -> "Utils":
+        """Utils instance of a league, keeping its reward index and engine."""
+        if league not in self._league_utils:
+            from utils.utils import Utils
+
+            self._league_utils[league] = Utils()
+        return self._league_utils[league]
 
     def _setup_ui(self) -> None:
         """Initialize all UI components."""
@@ -79,6 +159,7 @@ class MainWindow(QMainWindow):
     def _create_widgets(self) -> None:
         """Create all widgets used in the UI."""
         self._create_header()
+        self._create_filter_bar()
         self._create_table()
         self._create_controls()
         self._create_footer()
@@ -89,17 +170,28 @@ class MainWindow(QMainWindow):
         main_layout.setContentsMargins(15, 15, 15, 15)
         main_layout.setSpacing(15)
         main_layout.addWidget(self.header)
+        main_layout.addLayout(self.filter_layout)
         main_layout.addWidget(self.table_widget, 1)
         main_layout.addLayout(self.controls_layout)
         main_layout.addWidget(self.copy_label)
-        main_layout.addWidget(self.footer)
+        main_layout.addLayout(self.footer_layout)
 
     def _setup_connections(self) -> None:
         """Connect signals to slots."""
-        self.table_widget.cellClicked.connect(self.copy_card_name)
+        self.table_widget.clicked.connect(self.copy_card_name)
         self.start_button.clicked.connect(self.process_data)
         self.update_button.clicked.connect(self.check_for_updates)
-        self.table_widget.cellDoubleClicked.connect(self.generate_trade_link)
+        self.table_widget.doubleClicked.connect(self.generate_trade_link)
+        self.auto_refresh_box.toggled.connect(self._toggle_auto_refresh)
+        self.compare_box.toggled.connect(self._toggle_comparison)
+        self.interval_box.valueChanged.connect(self._set_refresh_interval)
+        self.league_selector.currentTextChanged.connect(self._on_league_changed)
+        self.search_box.textChanged.connect(self._on_search_changed)
+        self.type_filter.currentIndexChanged.connect(self._apply_filters)
+        self.min_profit_box.valueChanged.connect(self._apply_filters)
+        self.min_roi_box.valueChanged.connect(self._apply_filters)
+        self.scheduler.due.connect(self._on_refresh_due)
+        QShortcut(QKeySequence("F12"), self, self._toggle_debug_panel)
 
     def _setup_animation_timers(self) -> None:
         """Initialize animation timers."""
@@ -112,18 +204,76 @@ class MainWindow(QMainWindow):
         self.header = QLabel(HEADER)
         self.header.setStyleSheet(HEADER_LABEL)
 
+    def _create_filter_bar(self) -> None:
+        """Create the search box and the filters of the card table."""
+        self.filter_layout = QHBoxLayout()
+        self.filter_layout.setSpacing(10)
+
+        self.search_box = QLineEdit()
+        self.search_box.setStyleSheet(SEARCH_BOX)
+        self.search_box.setPlaceholderText("Search cards")
+        self.search_box.setClearButtonEnabled(True)
+        self.filter_layout.addWidget(self.search_box, 1)
+
+        self.type_filter = QComboBox()
+        self.type_filter.setStyleSheet(COMBO_BOX)
+        self.type_filter.addItem("All types")
+        self.filter_layout.addWidget(self.type_filter)
+
+        self.min_profit_box = QSpinBox()
+        self.min_profit_box.setStyleSheet(AUTO_REFRESH)
+        self.min_profit_box.setRange(-1, 1_000_000)
+        self.min_profit_box.setValue(-1)
+        self.min_profit_box.setSingleStep(10)
+        self.min_profit_box.setPrefix("Profit ≥ ")
+        self.min_profit_box.setSuffix(" c")
+        self.min_profit_box.setSpecialValueText("Any profit")
+        self.filter_layout.addWidget(self.min_profit_box)
+
+        self.min_roi_box = QSpinBox()
+        self.min_roi_box.setStyleSheet(AUTO_REFRESH)
+        self.min_roi_box.setRange(-1, 100_000)
+        self.min_roi_box.setValue(-1)
+        self.min_roi_box.setSingleStep(5)
+        self.min_roi_box.setPrefix("ROI ≥ ")
+        self.min_roi_box.setSuffix(" %")
+        self.min_roi_box.setSpecialValueText("Any ROI")
+        self.filter_layout.addWidget(self.min_roi_box)
+
+        self.match_label = QLabel("")
+        self.match_label.setStyleSheet(MATCH_LABEL)
+        self.filter_layout.addWidget(self.match_label)
+
     def _create_table(self) -> None:
-        """Create and configure the main table widget."""
-        self.table_widget = QTableWidget()
+        """Create and configure the main table view and its models."""
+        self.table_model = CardTableModel(self)
+        self.table_proxy = CardProxyModel(self)
+        self.table_proxy.setSourceModel(self.table_model)
+        self.comparison_model = LeagueComparisonModel(self)
+        self.table_widget = QTableView()
+        self.table_widget.setModel(self.table_proxy)
         self.table_widget.setItemDelegate(NoFocusDelegate())
         self.table_widget.setStyleSheet(TABLE_WIDGET)
         self.table_widget.setShowGrid(False)
-        self.table_widget.verticalHeader().setVisible(False)
-        self.table_widget.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.table_widget.setSelectionBehavior(
-            QTableWidget.SelectionBehavior.SelectRows
-        )
-        self.table_widget.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.table_widget.setWordWrap(False)
+        self.table_widget.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.table_widget.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table_widget.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+
+        # Uniform rows: the view never measures row contents.
+        vertical_header = self.table_widget.verticalHeader()
+        vertical_header.setVisible(False)
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(20)
+
+        header = self.table_widget.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        # Size columns from the rows in view (the most profitable cards)
+        # instead of formatting every cell of the table.
+        header.setResizeContentsPrecision(0)
+        # Sorted by rank, i.e. by profit, until a header is clicked.
+        header.setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+        self.table_widget.setSortingEnabled(True)
 
     def _create_controls(self) -> None:
         """Create control widgets (buttons, combo boxes, labels)."""
@@ -132,16 +282,15 @@ class MainWindow(QMainWindow):
 
         self._create_league_selector()
         self._create_start_button()
+        self._create_auto_refresh_controls()
+        self._create_compare_box()
         self._create_status_label()
         self._create_update_button()
         self._create_copy_label()
 
     def _create_league_selector(self) -> None:
-        """Create and populate the league selector combo box."""
+        """Create the league selector combo box; leagues load in background."""
         self.league_selector = QComboBox()
-        self.league_selector.addItems(
-            [league["name"] for league in self.utils.get_current_leagues()]
-        )
         self.league_selector.setStyleSheet(COMBO_BOX)
         self.controls_layout.addWidget(self.league_selector)
 
@@ -154,6 +303,32 @@ class MainWindow(QMainWindow):
         self.start_button.setStyleSheet(START_BUTTON)
         self.controls_layout.addWidget(self.start_button)
 
+    def _create_auto_refresh_controls(self) -> None:
+        """Create the auto refresh toggle and interval selector."""
+        self.auto_refresh_box = QCheckBox("Auto")
+        self.auto_refresh_box.setStyleSheet(AUTO_REFRESH)
+        self.auto_refresh_box.setToolTip("Refresh prices automatically")
+        self.controls_layout.addWidget(self.auto_refresh_box)
+
+        self.interval_box = QSpinBox()
+        self.interval_box.setStyleSheet(AUTO_REFRESH)
+        self.interval_box.setRange(
+            RefreshScheduler.MIN_INTERVAL // 60, RefreshScheduler.MAX_INTERVAL // 60
+        )
+        self.interval_box.setValue(RefreshScheduler.DEFAULT_INTERVAL // 60)
+        self.interval_box.setSuffix(" min")
+        self.interval_box.setToolTip(
+            "Refresh interval while prices are moving; it grows while they are not"
+        )
+        self.controls_layout.addWidget(self.interval_box)
+
+    def _create_compare_box(self) -> None:
+        """Create the toggle for comparing card profits across leagues."""
+        self.compare_box = QCheckBox("Compare")
+        self.compare_box.setStyleSheet(AUTO_REFRESH)
+        self.compare_box.setToolTip("Fetch all leagues and compare card profits")
+        self.controls_layout.addWidget(self.compare_box)
+
     def _create_status_label(self) -> None:
         """Create the status label."""
         self.status_label = QLabel("Select league")
@@ -178,7 +353,14 @@ class MainWindow(QMainWindow):
         self.copy_label.setVisible(False)
 
     def _create_footer(self) -> None:
-        """Create the footer widget."""
+        """Create the footer with the refresh schedule and the project link."""
+        self.footer_layout = QHBoxLayout()
+        self.footer_layout.setSpacing(0)
+
+        self.refresh_label = QLabel("")
+        self.refresh_label.setStyleSheet(REFRESH_LABEL)
+        self.footer_layout.addWidget(self.refresh_label, 1)
+
         self.footer = QLabel(FOOTER)
         self.footer.setStyleSheet(FOOTER_LABEL)
         self.footer.setAlignment(Qt.AlignmentFlag.AlignRight)
@@ -186,152 +368,353 @@ class MainWindow(QMainWindow):
         self.footer.setTextInteractionFlags(
             Qt.TextInteractionFlag.TextBrowserInteraction
         )
+        self.footer_layout.addWidget(self.footer)
+
+    def _start_worker(self, worker: Worker) -> None:
+        """Run a worker on the thread pool, keeping it alive until finished."""
+        self._workers.add(worker)
+        worker.signals.finished.connect(lambda: self._workers.discard(worker))
+        self._thread_pool.start(worker)
+
+    def _load_leagues(self) -> None:
+        """Show the cached league list, then fetch the live one in the background."""
+        cached = LeagueCache.load()
+        if cached:
+            self._show_leagues(cached)
+        else:
+            self.start_button.setEnabled(False)
+            self.status_label.setText("Loading leagues...")
+        worker = FunctionWorker(self._fetch_leagues)
+        worker.signals.result.connect(self._on_leagues_loaded)
+        self._start_worker(worker)
 
-    def process_data(self) -> None:
-        """Process and display PoE card flipping data."""
-        self.status_label.setText("Processing data...")
-        QApplication.processEvents()
-
-        try:
-            data = self._fetch_and_process_data()
-            if data:
-                self._display_results(data)
-                self.status_label.setText("Data loaded successfully")
-        except Exception as e:
-            self.status_label.setText(f"Error: {str(e)}")
-
-    def _fetch_and_process_data(self) -> Optional[List[Dict]]:
-        """Fetch and process PoE Ninja data."""
-        selected_league = self.league_selector.currentText()
-        poe_ninja = PoeNinja()
-        poe_ninja.get_data(selected_league)
-        divination_data, currency_data, unique_items = self.utils.load_data()
-
-        highscores = self.utils.calculate_highscores(
-            divination_data, currency_data, unique_items
-        )
-        return sorted(highscores.values(), key=lambda x: x["Profit"], reverse=True)
+    @staticmethod
+    def _fetch_leagues() -> List[Dict]:
+        """Fetch the live league list and cache it; runs on a worker thread.
+
+        This is also where the networking and scoring modules are first
+        imported, so that cost is paid off the UI thread.
+        """
+        import poeNinja.ninjaAPI  # noqa: F401
+        import utils.history_store  # noqa: F401
+        from utils.utils import Utils
+
+        leagues = Utils.get_current_leagues()
+        if leagues:
+            LeagueCache.save(leagues)
+        return leagues
+
+    def _on_leagues_loaded(self, leagues: List[Dict]) -> None:
+        """Show the live league list once it has arrived."""
+        if not self.start_button.isEnabled():
+            self.start_button.setEnabled(True)
+            self.status_label.setText("Select league")
+        if leagues:
+            self._show_leagues(leagues)
+
+    def _show_leagues(self, leagues: List[Dict]) -> None:
+        """Fill the league selector, keeping the selected league if possible."""
+        current = self.league_selector.currentText()
+        self._leagues = {league["name"]: league for league in leagues}
+        names = list(self._leagues)
+        if names != [
+            self.league_selector.itemText(i)
+            for i in range(self.league_selector.count())
+        ]:
+            self.league_selector.blockSignals(True)
+            self.league_selector.clear()
+            self.league_selector.addItems(names)
+            if current in self._leagues:
+                self.league_selector.setCurrentText(current)
+            self.league_selector.blockSignals(False)
+        if self.league_selector.currentText() != current:
+            self._on_league_changed(self.league_selector.currentText())
 
-    def _display_results(self, highscores_sorted: List[Dict]) -> None:
-        """Display processed results in the table."""
-        divine_orb_value = self._get_divine_orb_value()
-        if divine_orb_value is None:
-            self.status_label.setText("Error: Divine Orb price not found!")
+    def process_data(self) -> None:
+        """Start a background refresh, or cancel the one in progress."""
+        if self._refresh_worker is not None:
+            self._refresh_worker.cancel()
+            self.status_label.setText("Cancelling...")
             return
+        self._start_refresh()
+
+    def _start_refresh(self) -> None:
+        """Fetch and score the selected league in the background.
+
+        While comparing, all leagues are fetched and scored together.
+        """
+        leagues = [self.league_selector.currentText()]
+        if self.compare_box.isChecked() and self._leagues:
+            leagues = list(self._leagues)
+        self._profiling = (
+            self._debug_panel is not None and self._debug_panel.profile_next
+        )
+        self._apply_freshness_window()
+        worker = RefreshWorker(
+            self.poe_ninja,
+            {league: self._utils_for(league) for league in leagues},
+            "Data",
+            self._debug_panel.PROFILE_DIRECTORY if self._profiling else None,
+        )
+        worker.signals.progress.connect(self.status_label.setText)
+        worker.signals.result.connect(self._on_refresh_finished)
+        worker.signals.error.connect(
+            lambda message: self.status_label.setText(f"Error: {message}")
+        )
+        worker.signals.cancelled.connect(
+            lambda: self.status_label.setText("Refresh cancelled")
+        )
+        worker.signals.finished.connect(self._on_refresh_done)
 
-        self._setup_table_structure(highscores_sorted)
-        self._populate_table_data(highscores_sorted, divine_orb_value)
-
-    def _get_divine_orb_value(self) -> Optional[float]:
-        """Get the current Divine Orb value from currency data."""
-        try:
-            with open("Data\\Currency.json", "r") as file:
-                data = json.load(file)
-                return next(
-                    (
-                        line["receive"]["value"]
-                        for line in data["lines"]
-                        if line["currencyTypeName"] == "Divine Orb"
-                    ),
-                    None,
-                )
-        except (FileNotFoundError, json.JSONDecodeError):
-            return None
+        self._refresh_worker = worker
+        self._refresh_started = time.monotonic()
+        self._refresh_started_at = time.time()
+        self._refresh_changed = False
+        self.start_button.setText(" Stop ")
+        self.status_label.setText("Processing data...")
+        self._start_worker(worker)
 
-    def _setup_table_structure(self, data: List[Dict]) -> None:
-        """Configure table structure and headers."""
-        self.table_widget.setRowCount(len(data))
-        self.table_widget.setColumnCount(8)
-        self.table_widget.setHorizontalHeaderLabels(
-            [
-                "#",
-                "Name",
-                "Type",
-                "Total profit",
-                "Profit per card",
-                "1 card price",
-                "Total set price",
-                "Reward price",
-            ]
-        )
+    def _apply_freshness_window(self) -> None:
+        """Keep saved snapshots from answering scheduled refreshes.
 
-        header = self.table_widget.horizontalHeader()
-        for col in range(self.table_widget.columnCount()):
-            header.setSectionResizeMode(col, QHeaderView.ResizeMode.Fixed)
+        While refreshes are scheduled, the window follows the scheduler
+        interval, so each scheduled refresh revalidates with poe.ninja.
+        """
+        from poeNinja.cache import SnapshotCache
+        from poeNinja.ninjaAPI import PoeNinja
 
-        self.table_widget.setColumnWidth(0, 50)
-        for row in range(self.table_widget.rowCount()):
-            self.table_widget.setRowHeight(row, 20)
+        if not isinstance(self.poe_ninja, PoeNinja):
+            return
+        window = SnapshotCache.DEFAULT_FRESHNESS_WINDOW
+        if self.scheduler.active:
+            window = min(window, self.scheduler.freshness_window())
+        self.poe_ninja.cache.freshness_window = window
 
-    def _populate_table_data(self, data: List[Dict], divine_value: float) -> None:
-        """Populate table with processed data."""
-        for row, item in enumerate(data):
-            self._add_table_row(row, item, divine_value)
+    def _on_refresh_finished(self, results) -> None:
+        """Display the scored cards handed back by the refresh worker."""
+        self._league_results.update(results)
+        if self.compare_box.isChecked():
+            self._show_comparison()
 
-        for col in range(1, self.table_widget.columnCount()):
-            self.table_widget.resizeColumnToContents(col)
+        league = self.league_selector.currentText()
+        if league not in results:
+            error = self.poe_ninja.errors.get(league)
+            if error is not None:
+                self.status_label.setText(f"Error: {error}")
+            return
+        scored, self._price_index = results[league]
+        if not len(scored):
+            return
 
-    def _add_table_row(self, row: int, item: Dict, divine_value: float) -> None:
-        """Add a single row of data to the table."""
-
-        # Create conversion functions for currency
-        def to_divine(value: float) -> float:
-            return round(value / divine_value, 2)
-
-        # Convert values
-        profit_divine = to_divine(item["Profit"])
-        profit_per_card_divine = to_divine(item["Profitpercard"])
-        total_divine = to_divine(item["Total"])
-        sellprice_divine = to_divine(item["Sellprice"])
-        cost_divine = to_divine(item["Cost"])
-
-        # Add items to the row
-        self._create_table_item(row, 0, str(row + 1))
-        self._create_table_item(row, 1, item["Name"], align_left=True)
-        self._create_table_item(row, 2, item["Type"], align_left=True)
-        self._create_table_item(row, 3, f"{int(item['Profit'])} c ({profit_divine} d)")
-        self._create_table_item(
-            row, 4, f"{int(item['Profitpercard'])} c ({profit_per_card_divine} d)"
-        )
-        self._create_table_item(row, 5, f"{int(item['Cost'])} c ({cost_divine} d)")
-        self._create_table_item(row, 6, f"{int(item['Total'])} c ({total_divine} d)")
-        self._create_table_item(
-            row, 7, f"{int(item['Sellprice'])} c ({sellprice_divine} d)"
+        league_changed = league != self._results_league
+        if not self._display_results(scored, league):
+            return
+        self._refresh_changed = league_changed or (
+            self.poe_ninja.received_new_data and self.table_model.moved_cards > 0
         )
+        if self.poe_ninja.errors:
+            self.status_label.setText(
+                f"Data loaded, {len(self.poe_ninja.errors)} endpoint(s) failed"
+            )
+        else:
+            self.status_label.setText("Data loaded successfully")
+
+    def _on_refresh_done(self) -> None:
+        """Reset the start button after a refresh ends in any way."""
+        self._refresh_worker = None
+        self._last_latency = time.monotonic() - self._refresh_started
+        self.start_button.setText(" Start ")
+        if self.scheduler.active:
+            self.scheduler.record(self._refresh_changed)
+            self.scheduler.schedule()
+        self._update_refresh_label()
+        if self._debug_panel is not None:
+            self._debug_panel.show_refresh(self._refresh_started_at, self._last_latency)
+            if self._profiling:
+                self._debug_panel.profile_taken()
+
+    def _toggle_debug_panel(self) -> None:
+        """Show or hide the per-stage refresh timings (F12)."""
+        if self._debug_panel is None:
+            from gui.debug_panel import DebugPanel
+
+            self._debug_panel = DebugPanel(self)
+            if self._last_latency is not None:
+                self._debug_panel.show_refresh(
+                    self._refresh_started_at, self._last_latency
+                )
+        self._debug_panel.setVisible(not self._debug_panel.isVisible())
 
-    def _create_table_item(
-        self, row: int, col: int, text: str, align_left: bool = False
-    ) -> QTableWidgetItem:
-        """Create and configure a table widget item."""
-        item = QTableWidgetItem(text)
-        item.setBackground(QColor(0, 0, 0, 0))
+    def _toggle_auto_refresh(self, enabled: bool) -> None:
+        """Start or stop scheduled refreshes."""
+        if enabled:
+            self.scheduler.set_league(
+                self._leagues.get(self.league_selector.currentText())
+            )
+            self.scheduler.start()
+        else:
+            self.scheduler.stop()
+        self._update_refresh_label()
+
+    def _set_refresh_interval(self, minutes: int) -> None:
+        """Apply a new base interval, rescheduling a pending refresh."""
+        self.scheduler.interval = minutes * 60
+        if self.scheduler.active and self._refresh_worker is None:
+            self.scheduler.start()
+            self._update_refresh_label()
+
+    def _on_league_changed(self, name: str) -> None:
+        """Show the last results of a newly selected league right away.
+
+        Also restarts the refresh backoff for that league.
+        """
+        self.scheduler.set_league(self._leagues.get(name))
+        if name in self._league_results:
+            scored, self._price_index = self._league_results[name]
+            self._display_results(scored, name)
+        if self.compare_box.isChecked():
+            self._show_comparison()
+
+    def _toggle_comparison(self, enabled: bool) -> None:
+        """Switch the table between the selected league and all leagues."""
+        self.table_widget.setSortingEnabled(not enabled)
+        for widget in (
+            self.search_box,
+            self.type_filter,
+            self.min_profit_box,
+            self.min_roi_box,
+            self.match_label,
+        ):
+            widget.setEnabled(not enabled)
+        if enabled:
+            self.table_widget.setModel(self.comparison_model)
+            self._show_comparison()
+            missing = set(self._leagues) - self._league_results.keys()
+            if missing and self._refresh_worker is None:
+                self._start_refresh()
+        else:
+            self.table_widget.setModel(self.table_proxy)
+            self._resize_columns()
+
+    def _show_comparison(self) -> None:
+        """Show the profits of every league that has results."""
+        self.comparison_model.set_results(
+            {
+                league: self._league_results[league][0]
+                for league in self._leagues
+                if league in self._league_results
+            },
+            self.league_selector.currentText(),
+        )
+        self._resize_columns()
 
-        if col == 3:
-            self._set_item_foreground_color(item, text)
+    def _on_refresh_due(self) -> None:
+        """Run a scheduled refresh unless one is already in progress."""
+        if self._refresh_worker is not None:
+            return
+        if not self.league_selector.currentText():
+            self.scheduler.schedule()
+            self._update_refresh_label()
+            return
+        self._start_refresh()
+
+    def _update_refresh_label(self) -> None:
+        """Show the next scheduled refresh and the last refresh latency."""
+        parts = []
+        if self.scheduler.active:
+            next_refresh = self.scheduler.next_refresh.astimezone()
+            parts.append(f"Next refresh {next_refresh:%H:%M:%S}")
+        if self._last_latency is not None:
+            parts.append(f"last refresh took {self._last_latency:.1f} s")
+        text = " · ".join(parts)
+        self.refresh_label.setText(text[:1].upper() + text[1:])
+
+    def _display_results(self, scored: "ScoredCards", league: str) -> bool:
+        """Display processed results in the table.
+
+        Results of the league already shown are merged into the table, so
+        the selection and scroll position survive a refresh.
+
+        Returns:
+            False if the results could not be displayed
+        """
+        divine_orb_value = self._get_divine_orb_value()
+        if divine_orb_value is None:
+            self.status_label.setText("Error: Divine Orb price not found!")
+            return False
 
-        if not align_left:
-            item.setTextAlignment(
-                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        with instrumentation.stage("table", league) as record:
+            reset = self.table_model.set_results(
+                scored, divine_orb_value, reset=league != self._results_league
             )
+            if reset:
+                self._resize_columns()
+            record.items = self.table_model.rowCount()
+        self._results_league = league
+        self._update_type_filter()
+        self._update_match_label()
+        return True
+
+    def _on_search_changed(self, text: str) -> None:
+        """Narrow the card table down to names containing the search text."""
+        self.table_proxy.set_search(text)
+        self._update_match_label()
+
+    def _apply_filters(self) -> None:
+        """Apply the type, minimum profit and minimum ROI filters.
+
+        The spin boxes' lowest value, -1, shows as "Any" and disables them.
+        """
+        min_profit = self.min_profit_box.value()
+        min_roi = self.min_roi_box.value()
+        self.table_proxy.set_filters(
+            kind=self.type_filter.currentData(),
+            min_profit=min_profit if min_profit >= 0 else None,
+            min_roi=min_roi if min_roi >= 0 else None,
+        )
+        self._update_match_label()
+
+    def _update_type_filter(self) -> None:
+        """List the reward types of the shown results, keeping the selection."""
+        kinds = self.table_proxy.kinds
+        if kinds == [
+            self.type_filter.itemData(i) for i in range(1, self.type_filter.count())
+        ]:
+            return
+        current = self.type_filter.currentData()
+        self.type_filter.blockSignals(True)
+        self.type_filter.clear()
+        self.type_filter.addItem("All types")
+        for kind in kinds:
+            self.type_filter.addItem(kind, kind)
+        self.type_filter.setCurrentIndex(max(0, self.type_filter.findData(current)))
+        self.type_filter.blockSignals(False)
+        if self.type_filter.currentData() != current:
+            self._apply_filters()
+
+    def _update_match_label(self) -> None:
+        """Show how many cards pass the search and filters."""
+        shown = self.table_proxy.rowCount()
+        total = self.table_proxy.total_rows
+        self.match_label.setText(f"{shown} of {total} cards" if shown < total else "")
 
-        self.table_widget.setItem(row, col, item)
-        return item
+    def _get_divine_orb_value(self) -> Optional[float]:
+        """Get the current Divine Orb value from the loaded price index."""
+        if self._price_index is None:
+            return None
+        return self._price_index.divine_value
 
-    @staticmethod
-    def _set_item_foreground_color(item: QTableWidgetItem, text: str) -> None:
-        """Set item text color based on value (positive/negative)."""
-        try:
-            value = float(text.split()[0])
-            color = "#4CAF50" if value > 0 else "#F44336" if value < 0 else None
-            if color:
-                item.setForeground(QColor(color))
-        except (ValueError, IndexError):
-            pass
-
-    def copy_card_name(self, row: int) -> None:
+    def _resize_columns(self) -> None:
+        """Fit the column widths to the current results."""
+        self.table_widget.setColumnWidth(0, 50)
+        for col in range(1, self.table_widget.model().columnCount()):
+            self.table_widget.resizeColumnToContents(col)
+
+    def copy_card_name(self, index: QModelIndex) -> None:
         """Copy card name to clipboard from selected row."""
-        item = self.table_widget.item(row, 1)
-        QApplication.clipboard().setText(item.text())
+        QApplication.clipboard().setText(
+            self.table_widget.model().card_name(index.row())
+        )
         self.show_notification("Copied!")
 
     def show_notification(self, text: str, duration: int = 2) -> None:
@@ -377,9 +760,15 @@ class MainWindow(QMainWindow):
         self.fade_animation.start()
 
     def check_for_updates(self) -> None:
-        """Check for application updates."""
-        result = self.utils.check_for_updates()
-
+        """Check for application updates in the background."""
+        self.update_button.setEnabled(False)
+        worker = FunctionWorker(self.utils.check_for_updates)
+        worker.signals.result.connect(self._on_update_checked)
+        worker.signals.finished.connect(lambda: self.update_button.setEnabled(True))
+        self._start_worker(worker)
+
+    def _on_update_checked(self, result: Optional[tuple]) -> None:
+        """Report the outcome of an update check."""
         if not result:
             self.status_label.setText("Failed to check for updates")
             return
@@ -394,6 +783,13 @@ class MainWindow(QMainWindow):
             self.show_notification("You have the latest version")
             self.status_label.setText("You have the latest version")
 
+    def closeEvent(self, event) -> None:
+        """Cancel a running refresh when the window closes."""
+        self.scheduler.stop()
+        if self._refresh_worker is not None:
+            self._refresh_worker.cancel()
+        super().closeEvent(event)
+
     def _show_update_message(
         self, remote_version: str, remote_description: str
     ) -> None:
@@ -407,9 +803,9 @@ class MainWindow(QMainWindow):
         msg_box.setTextInteractionFlags(Qt.TextInteractionFlag.TextBrowserInteraction)
         msg_box.exec()
 
-    def generate_trade_link(self, row: int, column: int) -> None:
+    def generate_trade_link(self, index: QModelIndex) -> None:
         """Generate trade link for the selected item and copy to clipboard."""
-        item_name = self.table_widget.item(row, 1).text()
+        item_name = self.table_widget.model().card_name(index.row())
         league = self.league_selector.currentText()
 
         trade_query = {
@@ -0,0 +1,299 @@
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+
+from PyQt6.QtCore import (
+    QAbstractProxyModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    Qt,
+)
+
+from gui.table_model import CardTableModel
+from utils.instrumentation import instrumentation
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from utils.card_query import CardQuery
+
+# first row, last row, first column, last column of a source dataChanged
+CellRange = Tuple[int, int, int, int]
+
+
+class CardProxyModel(QAbstractProxyModel):
+    """Sorted and filtered view of a ``CardTableModel``.
+
+    Sorting and filtering run on a ``CardQuery`` over the source rows, so
+    an interaction costs a few array operations instead of one Python
+    comparison per pair of rows. The query is rebuilt whenever the source
+    rows change; a merged refresh keeps the current sort and filters, and
+    the view keeps its selection. The rank column still shows each card's
+    profit rank.
+
+    The row and data signals of a merged refresh are collected and applied
+    once at its end: one query rebuild, and one layout change, or only
+    ``dataChanged`` if the sort and filters keep every row in place.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._query: Optional["CardQuery"] = None
+        self._source_rows: List[int] = []  # proxy row -> source row
+        self._proxy_rows: List[int] = []  # source row -> proxy row or -1
+        self._sort_column = 0
+        self._descending = False
+        self._filters = {"kind": None, "min_profit": None, "min_roi": None}
+        self._search = ""
+        self._saved: List[QPersistentModelIndex] = []
+        self._layout_changing = False
+        self._merging = False
+        self._changed_ranges: List[CellRange] = []
+
+    def setSourceModel(self, model: CardTableModel) -> None:
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_source_reset)
+        for about_to_change, changed in (
+            (model.rowsAboutToBeInserted, model.rowsInserted),
+            (model.rowsAboutToBeRemoved, model.rowsRemoved),
+            (model.rowsAboutToBeMoved, model.rowsMoved),
+            (model.layoutAboutToBeChanged, model.layoutChanged),
+        ):
+            about_to_change.connect(self._begin_layout_change)
+            changed.connect(self._on_source_rows_changed)
+        model.dataChanged.connect(self._on_source_data_changed)
+        model.mergeStarted.connect(self._on_merge_started)
+        model.mergeFinished.connect(self._on_merge_finished)
+        self._rebuild()
+
+    @property
+    def kinds(self) -> List[str]:
+        """Reward types present in the source rows, sorted."""
+        return sorted(set(self._query.kinds)) if self._query is not None else []
+
+    @property
+    def total_rows(self) -> int:
+        """Number of source rows, before filtering."""
+        return len(self._proxy_rows)
+
+    def set_filters(
+        self,
+        kind: Optional[str] = None,
+        min_profit: Optional[float] = None,
+        min_roi: Optional[float] = None,
+    ) -> None:
+        """Only show cards of a reward type and above profit thresholds.
+
+        Args:
+            kind: Reward type, or None for all
+            min_profit: Minimum set profit in chaos, or None
+            min_roi: Minimum return in percent of the set cost, or None
+        """
+        self._filters = {"kind": kind, "min_profit": min_profit, "min_roi": min_roi}
+        self._apply()
+
+    def set_search(self, text: str) -> None:
+        """Only show cards whose name contains ``text``, ignoring case."""
+        self._search = text.strip()
+        self._apply()
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder) -> None:
+        self._sort_column = column
+        self._descending = order == Qt.SortOrder.DescendingOrder
+        self._apply()
+
+    def card_name(self, row: int) -> Optional[str]:
+        """Return the card name shown in a row."""
+        if 0 <= row < len(self._source_rows):
+            return self.sourceModel().card_name(self._source_rows[row])
+        return None
+
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(
+            self._source_rows[proxy_index.row()], proxy_index.column()
+        )
+
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        if not source_index.isValid() or source_index.row() >= len(self._proxy_rows):
+            return QModelIndex()
+        row = self._proxy_rows[source_index.row()]
+        if row < 0:
+            return QModelIndex()
+        return self.index(row, source_index.column())
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> Any:
+        if parent.isValid() or not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: Optional[QModelIndex] = None) -> Any:
+        if index is None:
+            return super().parent()
+        return QModelIndex()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._source_rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().columnCount()
+
+    def _apply(self) -> None:
+        """Re-run the query after the sort or filters changed."""
+        self._begin_layout_change()
+        self._map_rows()
+        self._end_layout_change(rebuild=False)
+
+    def _on_source_reset(self) -> None:
+        self._rebuild()
+        self.endResetModel()
+
+    def _begin_layout_change(self, *args) -> None:
+        """Remember the source rows behind the persistent indexes."""
+        if self._layout_changing:
+            return
+        self._layout_changing = True
+        self.layoutAboutToBeChanged.emit()
+        self._saved = [
+            QPersistentModelIndex(self.mapToSource(index))
+            for index in self.persistentIndexList()
+        ]
+
+    def _end_layout_change(self, rebuild: bool = True) -> None:
+        """Rebuild the mapping and move the persistent indexes along."""
+        if rebuild:
+            self._rebuild()
+        self.changePersistentIndexList(
+            self.persistentIndexList(),
+            [self.mapFromSource(QModelIndex(index)) for index in self._saved],
+        )
+        self._saved = []
+        self._layout_changing = False
+        self.layoutChanged.emit()
+
+    def _on_source_rows_changed(self, *args) -> None:
+        if not self._merging:
+            self._end_layout_change()
+
+    def _on_source_data_changed(
+        self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()
+    ) -> None:
+        cells = (
+            top_left.row(),
+            bottom_right.row(),
+            top_left.column(),
+            bottom_right.column(),
+        )
+        if self._merging:
+            self._changed_ranges.append(cells)
+        else:
+            self._update_values([cells])
+
+    def _on_merge_started(self) -> None:
+        self._merging = True
+        self._changed_ranges = []
+
+    def _on_merge_finished(self) -> None:
+        """Apply the row and data changes of a merge at once."""
+        self._merging = False
+        changed_ranges, self._changed_ranges = self._changed_ranges, []
+        if self._layout_changing:
+            # Rows were inserted, removed or moved; the layout change
+            # repaints every row, changed values included.
+            self._end_layout_change()
+        elif changed_ranges:
+            self._update_values(changed_ranges)
+
+    def _update_values(self, changed_ranges: List[CellRange]) -> None:
+        """Re-sort and re-filter after source values changed in place.
+
+        If the rows keep their order, only ``dataChanged`` is forwarded;
+        otherwise the view gets a layout change.
+        """
+        query = self._new_query()
+        source_rows = self._run_query(query)
+        if source_rows.tolist() != self._source_rows:
+            self._begin_layout_change()
+            self._query = query
+            self._set_rows(source_rows)
+            self._end_layout_change(rebuild=False)
+            return
+
+        self._query = query
+        for first, last, first_column, last_column in changed_ranges:
+            rows = [
+                self._proxy_rows[row]
+                for row in range(first, last + 1)
+                if self._proxy_rows[row] >= 0
+            ]
+            if rows:
+                self.dataChanged.emit(
+                    self.index(min(rows), first_column),
+                    self.index(max(rows), last_column),
+                )
+
+    def _rebuild(self) -> None:
+        """Build a new query over the source rows and map them."""
+        self._query = self._new_query()
+        self._map_rows()
+
+    def _new_query(self) -> Optional["CardQuery"]:
+        """Build a query over the current source rows, or None if empty."""
+        rows = self.sourceModel().rows
+        if not rows:
+            return None
+
+        # Imported here to keep NumPy out of the GUI's startup path.
+        import numpy as np
+
+        from utils.card_query import CardQuery
+
+        names = [row[0] for row in rows]
+        kinds = [row[1] for row in rows]
+        values = np.array([row[2:8] for row in rows], dtype=np.float64).T
+        keys = np.vstack(
+            (
+                np.arange(len(rows), dtype=np.float64),
+                CardQuery.text_key(names),
+                CardQuery.text_key(kinds),
+                values,
+            )
+        )
+        profit, total = values[0], values[3]
+        roi = np.divide(profit * 100, total, out=np.zeros_like(profit), where=total > 0)
+        name_index = None
+        if self._query is not None and self._search:
+            # Reused by the new query if the card names are the same
+            name_index = self._query.name_index
+        return CardQuery(names, kinds, keys, profit, roi, name_index)
+
+    def _map_rows(self) -> None:
+        """Run the query and store the row mapping in both directions."""
+        self._set_rows(self._run_query(self._query))
+
+    def _run_query(self, query: Optional["CardQuery"]) -> "np.ndarray":
+        """Return the source rows a query shows, in display order."""
+        import numpy as np
+
+        if query is None:
+            return np.zeros(0, dtype=np.intp)
+        with instrumentation.stage("query") as record:
+            source_rows = query.rows(
+                self._sort_column,
+                self._descending,
+                search=self._search,
+                **self._filters,
+            )
+            record.items = len(source_rows)
+        return source_rows
+
+    def _set_rows(self, source_rows: "np.ndarray") -> None:
+        """Store the row mapping in both directions."""
+        import numpy as np
+
+        proxy_rows = np.full(len(self.sourceModel().rows), -1, dtype=np.intp)
+        proxy_rows[source_rows] = np.arange(len(source_rows))
+        self._source_rows = source_rows.tolist()
+        self._proxy_rows = proxy_rows.tolist()
@@ -0,0 +1,119 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+class RefreshScheduler(QObject):
+    """Decides when the next automatic refresh runs.
+
+    The interval starts at the configured value and grows by ``BACKOFF`` for
+    every consecutive refresh that brought no price change (including
+    refreshes answered entirely with 304 Not Modified). A refresh with
+    changes drops it back to the configured value. During the first days of
+    a league prices move quickly, so the interval is shortened then. Every
+    delay gets random jitter so several running instances drift apart
+    instead of polling poe.ninja at the same moment.
+    """
+
+    due = pyqtSignal()
+
+    DEFAULT_INTERVAL = 5 * 60
+    MIN_INTERVAL = 60
+    MAX_INTERVAL = 30 * 60
+    BACKOFF = 1.5
+    JITTER = 0.1
+    LAUNCH_WINDOW = timedelta(days=3)
+    LAUNCH_SPEEDUP = 0.5
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, parent=None):
+        """Initialize the scheduler; it stays idle until ``start``.
+
+        Args:
+            interval: Seconds between refreshes while prices keep changing
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.interval = interval
+        self.next_refresh: Optional[datetime] = None
+        self._idle_refreshes = 0
+        self._league_start: Optional[datetime] = None
+        self._random = random.Random()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    @property
+    def active(self) -> bool:
+        """Whether automatic refreshes are enabled."""
+        return self.next_refresh is not None
+
+    def start(self) -> None:
+        """Enable automatic refreshes and schedule the first one."""
+        self._idle_refreshes = 0
+        self.schedule()
+
+    def stop(self) -> None:
+        """Disable automatic refreshes."""
+        self._timer.stop()
+        self.next_refresh = None
+
+    def set_league(self, league: Optional[Dict]) -> None:
+        """Use the start date of a league and restart the backoff.
+
+        Args:
+            league: League entry from ``Utils.get_current_leagues``
+        """
+        self._idle_refreshes = 0
+        self._league_start = None
+        if league and league.get("startAt"):
+            self._league_start = datetime.fromisoformat(
+                league["startAt"].replace("Z", "+00:00")
+            )
+
+    def record(self, changed: bool) -> None:
+        """Record the outcome of a refresh.
+
+        Args:
+            changed: Whether any price changed since the previous refresh
+        """
+        self._idle_refreshes = 0 if changed else self._idle_refreshes + 1
+
+    def current_interval(self, now: Optional[datetime] = None) -> float:
+        """Return the interval before jitter, in seconds."""
+        now = now or datetime.now(timezone.utc)
+        interval = self.interval * self.BACKOFF**self._idle_refreshes
+        if (
+            self._league_start is not None
+            and self._league_start <= now < self._league_start + self.LAUNCH_WINDOW
+        ):
+            interval *= self.LAUNCH_SPEEDUP
+        return min(max(interval, self.MIN_INTERVAL), self.MAX_INTERVAL)
+
+    def freshness_window(self, now: Optional[datetime] = None) -> float:
+        """Return how long a saved snapshot may answer a refresh, in seconds.
+
+        This is the shortest delay ``schedule`` can pick, so a scheduled
+        refresh always finds the snapshots of the previous refresh stale and
+        revalidates them instead of counting as a refresh without changes.
+        """
+        return self.current_interval(now) * (1 - self.JITTER)
+
+    def schedule(self) -> float:
+        """(Re)start the timer for the next refresh.
+
+        Returns:
+            Seconds until the next refresh
+        """
+        now = datetime.now(timezone.utc)
+        delay = self.current_interval(now) * (
+            1 + self._random.uniform(-self.JITTER, self.JITTER)
+        )
+        self.next_refresh = now + timedelta(seconds=delay)
+        self._timer.start(int(delay * 1000))
+        return delay
+
+    def _on_timeout(self) -> None:
+        if self.active:
+            self.due.emit()
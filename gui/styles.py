@@ -24,7 +24,7 @@ HEADER_LABEL = """
 """
 
 TABLE_WIDGET = """
-    QTableWidget {
+    QTableView {
         background-color: #252525;
         border: 1px solid #333;
         border-radius: 6px;
@@ -33,11 +33,11 @@ TABLE_WIDGET = """
         font-size: 13px;
         alternate-background-color: #252525;
     }
-    QTableWidget::item {
+    QTableView::item {
         padding: 8px;
         border-bottom: 1px solid #333;
     }
-    QTableWidget::item:selected {
+    QTableView::item:selected {
         background-color: #3a3a3a;
         color: white;
         border: none;
@@ -89,6 +89,36 @@ COMBO_BOX = """
     }
 """
 
+AUTO_REFRESH = """
+    QCheckBox, QSpinBox {
+        color: #f0f0f0;
+        font-size: 13px;
+    }
+    QCheckBox::indicator {
+        width: 14px;
+        height: 14px;
+        border: 1px solid #444;
+        border-radius: 3px;
+        background-color: #2d2d2d;
+    }
+    QCheckBox::indicator:checked {
+        background-color: #4CAF50;
+        border: 1px solid #4CAF50;
+    }
+    QSpinBox {
+        background-color: #2d2d2d;
+        border: 1px solid #444;
+        border-radius: 5px;
+        padding: 6px 8px;
+    }
+    QSpinBox:hover {
+        border: 1px solid #4CAF50;
+    }
+    QSpinBox:disabled {
+        color: #666;
+    }
+"""
+
 START_BUTTON = """
     QPushButton {
         background-color: #4CAF50;
@@ -171,6 +201,50 @@ FOOTER_LABEL = """
     }
 """
 
+SEARCH_BOX = """
+    QLineEdit {
+        background-color: #2d2d2d;
+        color: #f0f0f0;
+        border: 1px solid #444;
+        border-radius: 5px;
+        padding: 6px 10px;
+        font-size: 13px;
+    }
+    QLineEdit:hover, QLineEdit:focus {
+        border: 1px solid #4CAF50;
+    }
+    QLineEdit:disabled {
+        color: #666;
+    }
+"""
+
+MATCH_LABEL = """
+    QLabel {
+        color: #888;
+        font-size: 12px;
+        min-width: 90px;
+    }
+"""
+
+REFRESH_LABEL = """
+    QLabel {
+        color: #888;
+        font-size: 11px;
+        padding-top: 10px;
+        border-top: 1px solid #444;
+    }
+"""
+
+DEBUG_PANEL = """
+    QDialog {
+        background-color: #1a1a1a;
+    }
+    QLabel {
+        color: #aaa;
+        font-size: 12px;
+    }
+"""
+
 MESSAGE_BOX = """
     QMessageBox {
     }
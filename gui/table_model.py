@@ -0,0 +1,348 @@
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt6.QtGui import QColor
+
+if TYPE_CHECKING:
+    from utils.market_metrics import MarketColumns
+    from utils.scoring import ScoredCards
+
+# name, type, profit, profit per card, cost, total set price, reward price,
+# risk-adjusted profit, market summary
+Row = Tuple[str, str, float, float, float, float, float, float, str]
+
+
+class CardTableModel(QAbstractTableModel):
+    """Read-only table model over a columnar scoring result.
+
+    Only plain tuples of the values shown are kept; cell text, colors and
+    alignment are produced on demand in ``data`` for the cells the view
+    actually paints.
+
+    A new result for the same league is merged row by row, keyed by card
+    name: removed, inserted and re-ranked cards go out as row signals and
+    only rows whose values changed get ``dataChanged``, so the view keeps
+    its selection and scroll position. Cards whose profit moved since the
+    previous result are highlighted. The risk-adjusted profit column shows
+    the trend, volatility and listings behind it as a tooltip.
+
+    ``mergeStarted`` and ``mergeFinished`` enclose the signals of a merge, so
+    a proxy can handle them as one change.
+    """
+
+    mergeStarted = pyqtSignal()
+    mergeFinished = pyqtSignal()
+
+    HEADERS = (
+        "#",
+        "Name",
+        "Type",
+        "Total profit",
+        "Profit per card",
+        "1 card price",
+        "Total set price",
+        "Reward price",
+        "Risk-adj. profit",
+    )
+    NAME_COLUMN = 1
+    PROFIT_COLUMN = 3
+    RISK_COLUMN = 8
+
+    PROFIT_COLOR = QColor("#4CAF50")
+    LOSS_COLOR = QColor("#F44336")
+    RISE_BACKGROUND = QColor(76, 175, 80, 45)
+    FALL_BACKGROUND = QColor(244, 67, 54, 45)
+    RIGHT_ALIGNMENT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Row] = []
+        self._moves: Dict[str, float] = {}  # card name -> profit change
+        self._divine_value = 1.0
+
+    def set_results(
+        self, scored: "ScoredCards", divine_value: float, reset: bool = False
+    ) -> bool:
+        """Show a new scoring result.
+
+        Args:
+            scored: Scoring result of the current snapshot
+            divine_value: Chaos price of a Divine Orb, used for conversion
+            reset: Replace the rows instead of merging them, e.g. after the
+                league changed
+
+        Returns:
+            True if the model was reset, False if the result was merged
+        """
+        rows = self._rows_of(scored)
+        if reset or not self._rows:
+            self.beginResetModel()
+            self._rows = rows
+            self._moves = {}
+            self._divine_value = divine_value
+            self.endResetModel()
+            return True
+
+        self.mergeStarted.emit()
+        try:
+            self._merge(rows, divine_value)
+        finally:
+            self.mergeFinished.emit()
+        return False
+
+    @property
+    def rows(self) -> List[Row]:
+        """Rows in display order, see ``Row``."""
+        return self._rows
+
+    def card_name(self, row: int) -> Optional[str]:
+        """Return the card name shown in a row."""
+        if 0 <= row < len(self._rows):
+            return self._rows[row][0]
+        return None
+
+    @property
+    def moved_cards(self) -> int:
+        """Number of cards whose profit moved in the last merge."""
+        return len(self._moves)
+
+    def profit_change(self, name: str) -> Optional[float]:
+        """Return how much a card's profit moved in the last merge."""
+        return self._moves.get(name)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+        ):
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return str(row + 1)
+            value = self._rows[row][col - 1]
+            if col < self.PROFIT_COLUMN:
+                return value
+            return f"{int(value)} c ({round(value / self._divine_value, 2)} d)"
+
+        if role == Qt.ItemDataRole.TextAlignmentRole and col not in (1, 2):
+            return self.RIGHT_ALIGNMENT
+
+        if role == Qt.ItemDataRole.ForegroundRole and col in (
+            self.PROFIT_COLUMN,
+            self.RISK_COLUMN,
+        ):
+            profit = int(self._rows[row][col - 1])
+            if profit > 0:
+                return self.PROFIT_COLOR
+            if profit < 0:
+                return self.LOSS_COLOR
+
+        if role == Qt.ItemDataRole.ToolTipRole and col == self.RISK_COLUMN:
+            return self._rows[row][8]
+
+        if col >= self.PROFIT_COLUMN and role in (
+            Qt.ItemDataRole.BackgroundRole,
+            Qt.ItemDataRole.ToolTipRole,
+        ):
+            change = self._moves.get(self._rows[row][0])
+            if change is None:
+                return None
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return f"Profit {change:+.2f} c since last refresh"
+            return self.RISE_BACKGROUND if change > 0 else self.FALL_BACKGROUND
+
+        return None
+
+    @staticmethod
+    def _rows_of(scored: "ScoredCards") -> List[Row]:
+        """Build display rows sorted by profit, rounded like ``records``."""
+        profit = scored.profit.tolist()
+        stack = scored.stack.tolist()
+        cost = scored.cost.tolist()
+        total = scored.total.tolist()
+        sell_price = scored.sell_price.tolist()
+        risk_adjusted_profit = scored.risk_adjusted_profit.tolist()
+        card_market = CardTableModel._market_summaries(scored.card_market)
+        reward_market = CardTableModel._market_summaries(scored.reward_market)
+        rows = []
+        for i in scored.order.tolist():
+            rounded_profit = round(profit[i], 2)
+            rows.append(
+                (
+                    scored.names[i],
+                    scored.kinds[i],
+                    rounded_profit,
+                    round(rounded_profit / stack[i], 2),
+                    cost[i],
+                    total[i],
+                    sell_price[i],
+                    round(risk_adjusted_profit[i], 2),
+                    f"Card: {card_market[i]}\nReward: {reward_market[i]}",
+                )
+            )
+        return rows
+
+    @staticmethod
+    def _market_summaries(market: "MarketColumns") -> List[str]:
+        """Describe the trend, volatility and listings of each item."""
+        summaries = []
+        for trend, volatility, listings, low_confidence in zip(
+            *(column.tolist() for column in market)
+        ):
+            if trend != trend:
+                summary = "no price history"
+            else:
+                summary = f"7 day trend {trend:+.1f} %"
+                if volatility == volatility:
+                    summary += f", volatility {volatility:.1f} %"
+            if listings == listings:
+                summary += f", {int(listings)} listed"
+            if low_confidence:
+                summary += " (low confidence)"
+            summaries.append(summary)
+        return summaries
+
+    def _merge(self, rows: List[Row], divine_value: float) -> None:
+        """Turn the current rows into ``rows`` with minimal change signals."""
+        previous = {row[0]: row for row in self._rows}
+        moves = {}
+        for row in rows:
+            old = previous.get(row[0])
+            if old is not None and old[2] != row[2]:
+                moves[row[0]] = row[2] - old[2]
+
+        first_shifted = min(
+            self._remove_missing({row[0] for row in rows}),
+            self._arrange(rows),
+        )
+
+        everything_changed = divine_value != self._divine_value
+        changed = [
+            i
+            for i, (old, new) in enumerate(zip(self._rows, rows))
+            if everything_changed
+            or old != new
+            or moves.get(new[0]) != self._moves.get(new[0])
+        ]
+        self._rows = rows
+        self._moves = moves
+        self._divine_value = divine_value
+        for first, last in self._ranges(changed):
+            self.dataChanged.emit(
+                self.index(first, 0), self.index(last, len(self.HEADERS) - 1)
+            )
+        # The rank column follows the row number.
+        if first_shifted < len(rows):
+            self.dataChanged.emit(
+                self.index(first_shifted, 0), self.index(len(rows) - 1, 0)
+            )
+
+    def _remove_missing(self, names: Set[str]) -> int:
+        """Remove the rows of cards that are not in ``names``, bottom up.
+
+        Returns:
+            First row whose number changed, or the row count if none did
+        """
+        missing = [i for i, row in enumerate(self._rows) if row[0] not in names]
+        for first, last in reversed(self._ranges(missing)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first : last + 1]
+            self.endRemoveRows()
+        return missing[0] if missing else len(self._rows)
+
+    def _arrange(self, rows: List[Row]) -> int:
+        """Insert new cards and move re-ranked ones into the order of ``rows``.
+
+        Cards on a longest increasing run of their current positions keep
+        their place; each other card is moved or inserted once, right after
+        the card that precedes it in the new order.
+
+        Returns:
+            First row whose number changed, or the row count if none did
+        """
+        position = {row[0]: i for i, row in enumerate(self._rows)}
+        staying = self._longest_increasing(
+            [(position[row[0]], row[0]) for row in rows if row[0] in position]
+        )
+
+        names = [row[0] for row in self._rows]
+        first_shifted = len(rows)
+        for target, row in enumerate(rows):
+            name = row[0]
+            if name in staying:
+                continue
+            destination = names.index(rows[target - 1][0]) + 1 if target else 0
+            if name not in position:
+                first_shifted = min(first_shifted, destination)
+                self.beginInsertRows(QModelIndex(), destination, destination)
+                self._rows.insert(destination, row)
+                names.insert(destination, name)
+                self.endInsertRows()
+                continue
+
+            source = names.index(name)
+            if source == destination:
+                continue
+            first_shifted = min(first_shifted, source, destination)
+            self.beginMoveRows(
+                QModelIndex(), source, source, QModelIndex(), destination
+            )
+            if destination > source:
+                destination -= 1
+            self._rows.insert(destination, self._rows.pop(source))
+            names.insert(destination, names.pop(source))
+            self.endMoveRows()
+        return first_shifted
+
+    @staticmethod
+    def _longest_increasing(items: List[Tuple[int, str]]) -> Set[str]:
+        """Return the names along a longest run of increasing positions."""
+        tails: List[int] = []  # position value ending each run length
+        tail_items: List[int] = []  # index into items ending each run length
+        parents = [-1] * len(items)
+        for i, (value, _) in enumerate(items):
+            length = bisect_left(tails, value)
+            if length == len(tails):
+                tails.append(value)
+                tail_items.append(i)
+            else:
+                tails[length] = value
+                tail_items[length] = i
+            parents[i] = tail_items[length - 1] if length else -1
+
+        names = set()
+        i = tail_items[-1] if tail_items else -1
+        while i != -1:
+            names.add(items[i][1])
+            i = parents[i]
+        return names
+
+    @staticmethod
+    def _ranges(rows: List[int]) -> List[Tuple[int, int]]:
+        """Group sorted row numbers into (first, last) runs."""
+        ranges: List[Tuple[int, int]] = []
+        for row in rows:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1] = (ranges[-1][0], row)
+            else:
+                ranges.append((row, row))
+        return ranges
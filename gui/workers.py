@@ -0,0 +1,202 @@
+import os
+import sqlite3
+import threading
+from concurrent.futures import CancelledError
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, Union
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from utils.instrumentation import Instrumentation
+
+if TYPE_CHECKING:
+    from poeNinja.ninjaAPI import PoeNinja
+    from utils.price_index import PriceIndex
+    from utils.score_client import ScoreClient
+    from utils.scoring import ScoredCards
+    from utils.utils import Utils
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by a worker; delivered on the UI thread."""
+
+    progress = pyqtSignal(str)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """Base class for jobs run on a QThreadPool.
+
+    Subclasses implement ``work``. Its return value is emitted through
+    ``signals.result``; raising ``CancelledError`` emits ``signals.cancelled``
+    and any other exception emits ``signals.error``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.signals = WorkerSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """Request the job to stop at its next checkpoint."""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        """Check whether cancellation was requested."""
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self) -> None:
+        """Raise CancelledError if cancellation was requested."""
+        if self.is_cancelled():
+            raise CancelledError()
+
+    def run(self) -> None:
+        """Run the job and report the outcome through signals."""
+        try:
+            result = self.work()
+        except CancelledError:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+    def work(self) -> Any:
+        """Do the actual job on the worker thread."""
+        raise NotImplementedError
+
+
+class FunctionWorker(Worker):
+    """Worker that calls a plain function, e.g. a blocking network request."""
+
+    def __init__(self, fn: Callable, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def work(self) -> Any:
+        return self.fn(*self.args, **self.kwargs)
+
+
+class RefreshWorker(Worker):
+    """Fetches poe.ninja data for one or more leagues and scores their cards.
+
+    The endpoints of all leagues are fetched together. A league that cannot
+    be scored is left out of the results and its error is added to the
+    client's ``errors`` under the league name. With a
+    ``ScoreClient`` instead of ``PoeNinja`` the leagues are fetched already
+    scored from a score server. Results of newly downloaded snapshots are
+    appended to the history store, if one is given.
+    With a profile directory the whole refresh is captured with cProfile and
+    tracemalloc.
+    """
+
+    def __init__(
+        self,
+        poe_ninja: Union["PoeNinja", "ScoreClient"],
+        utils: Dict[str, "Utils"],
+        history_directory: Optional[str] = None,
+        profile_directory: Optional[str] = None,
+    ):
+        """Create the worker.
+
+        Args:
+            poe_ninja: Client used to fetch the snapshots, or the scored
+                leagues
+            utils: Utils instance per league to refresh; each keeps the
+                reward index and scoring engine of its league
+            history_directory: Directory of the history database that
+                newly downloaded results are appended to
+            profile_directory: Directory a profile of the refresh is written
+                to, see ``Instrumentation.capture``
+        """
+        super().__init__()
+        self.poe_ninja = poe_ninja
+        self.utils = utils
+        self.history_directory = history_directory
+        self.profile_directory = profile_directory
+
+    def work(self) -> Dict[str, Tuple["ScoredCards", "PriceIndex"]]:
+        """Fetch, load and score the data.
+
+        Returns:
+            (scored cards, price index of the snapshot) per league
+        """
+        if self.profile_directory is None:
+            return self._refresh()
+        with Instrumentation.capture(self.profile_directory):
+            return self._refresh()
+
+    def _refresh(self) -> Dict[str, Tuple["ScoredCards", "PriceIndex"]]:
+        # Imported here to keep NumPy out of the GUI's startup path.
+        from utils.price_index import PriceIndex
+        from utils.score_client import ScoreClient
+
+        self.signals.progress.emit("Fetching data...")
+        fetched = self.poe_ninja.get_leagues(
+            list(self.utils),
+            progress=self._report_fetch_progress,
+            cancel_event=self._cancel_event,
+        )
+        self.check_cancelled()
+        if isinstance(self.poe_ninja, ScoreClient):
+            # Already scored by the server; history is recorded there as well.
+            return fetched
+
+        snapshots = fetched
+        self.signals.progress.emit("Calculating profits...")
+        results = {}
+        for league_name, utils in self.utils.items():
+            try:
+                divination_data, currency_data, unique_items = utils.load_data(
+                    snapshots[league_name]
+                )
+                price_index = PriceIndex.build(
+                    divination_data, currency_data, unique_items
+                )
+                results[league_name] = (
+                    utils.score_cards(
+                        divination_data,
+                        price_index,
+                        utils.load_market(snapshots[league_name], price_index.uniques),
+                    ),
+                    price_index,
+                )
+            except (KeyError, ValueError) as e:
+                # Skip the league; the others keep their results.
+                self.poe_ninja.errors[league_name] = e
+            self.check_cancelled()
+
+        updated = self.poe_ninja.updated_leagues & results.keys()
+        if self.history_directory is not None and updated:
+            self._record_history({league: results[league][0] for league in updated})
+
+        return results
+
+    def _record_history(self, scored: Dict[str, "ScoredCards"]) -> None:
+        """Append the scored cards of each league to the history database."""
+        from utils.history_store import HistoryStore
+
+        try:
+            os.makedirs(self.history_directory, exist_ok=True)
+            history = HistoryStore(
+                os.path.join(self.history_directory, HistoryStore.FILENAME)
+            )
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error opening history: {e}")
+            return
+        with history:
+            for league_name, cards in scored.items():
+                try:
+                    history.append(league_name, cards)
+                except sqlite3.Error as e:
+                    print(f"Error recording history: {e}")
+
+    def _report_fetch_progress(self, done: int, total: int) -> None:
+        """Forward endpoint progress from PoeNinja as a status message."""
+        self.signals.progress.emit(f"Fetching data... ({done}/{total})")
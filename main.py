@@ -1,3 +1,4 @@
+import argparse
 import sys
 
 from PyQt6.QtWidgets import QApplication
@@ -7,9 +8,35 @@ from gui.main_window import MainWindow
 
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--source",
+        metavar="URL|DIR",
+        help="poe.ninja compatible base URL, or directory of recorded snapshots",
+    )
+    parser.add_argument(
+        "--server",
+        metavar="URL",
+        help="read scored leagues from a score server started with cli.py --serve",
+    )
+    args, qt_args = parser.parse_known_args()
+    score_client = None
+    if args.source:
+        # Imported here to keep NumPy out of the GUI's startup path.
+        from utils.price_source import PriceSource
+        from utils.utils import Utils
+
+        Utils.price_source = PriceSource.from_spec(args.source, Utils.http_client)
+    if args.server:
+        from utils.score_client import ScoreClient
+        from utils.utils import Utils
+
+        score_client = ScoreClient(args.server, Utils.http_client)
+        Utils.price_source = score_client.price_source()
+
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationVersion(version)
-    window = MainWindow()
+    window = MainWindow(score_client)
     window.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,128 @@
+import json
+import os
+import re
+import time
+from typing import Dict, Optional
+
+from utils.http_client import HttpResponse
+
+
+class SnapshotCache:
+    """HTTP validator cache for the saved poe.ninja snapshot files.
+
+    For every saved file a small ``<file>.meta`` sidecar records the URL it
+    was fetched from, when, its ``ETag``/``Last-Modified`` validators and the
+    TTL requested by the server. Fresh files are reused without any request; stale
+    ones are revalidated with a conditional request.
+    """
+
+    META_SUFFIX = ".meta"
+    DEFAULT_FRESHNESS_WINDOW = 300.0
+
+    def __init__(self, freshness_window: float = DEFAULT_FRESHNESS_WINDOW):
+        """Initialize the cache.
+
+        Args:
+            freshness_window: Seconds a snapshot of a league is reused without
+                contacting the server. 0 always revalidates.
+        """
+        self.freshness_window = freshness_window
+        self._entries: Dict[str, Dict] = {}
+
+    def meta_path(self, file_path: str) -> str:
+        """Return the path of the sidecar file for a snapshot file."""
+        return f"{file_path}{self.META_SUFFIX}"
+
+    def load(self, url: str, file_path: str) -> Optional[Dict]:
+        """Load the cache entry for a snapshot file.
+
+        Entries stored during this session are kept in memory; otherwise the
+        sidecar is read from disk.
+
+        Args:
+            url: URL the snapshot should have been fetched from
+            file_path: Path of the saved snapshot
+
+        Returns:
+            Cache entry, or None if the file or its sidecar is missing or the
+            sidecar belongs to another URL (for example another league)
+        """
+        entry = self._entries.get(file_path)
+        if entry is None:
+            if not os.path.exists(file_path):
+                return None
+            try:
+                with open(self.meta_path(file_path), "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return None
+            self._entries[file_path] = entry
+        return entry if entry.get("url") == url else None
+
+    def is_fresh(self, entry: Optional[Dict]) -> bool:
+        """Check whether an entry can be used without contacting the server.
+
+        The entry's TTL comes from the server's ``Cache-Control`` header; the
+        freshness window is an upper bound applied on top of it.
+        """
+        if not entry:
+            return False
+        ttl = entry.get("ttl")
+        ttl = self.freshness_window if ttl is None else min(ttl, self.freshness_window)
+        return entry.get("fetched_at", 0) + ttl > time.time()
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for an entry."""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url: str, file_path: str, response: HttpResponse) -> Dict:
+        """Record the validators of a snapshot that was fetched or revalidated.
+
+        Args:
+            url: URL the snapshot was fetched from
+            file_path: Path of the snapshot file
+            response: 200 or 304 response received for the URL
+
+        Returns:
+            The new cache entry, to be written with ``save``
+        """
+        previous = self.load(url, file_path) or {}
+        entry = {
+            "url": url,
+            "etag": response.headers.get("etag", previous.get("etag")),
+            "last_modified": response.headers.get(
+                "last-modified", previous.get("last_modified")
+            ),
+            "fetched_at": time.time(),
+            "ttl": self._server_ttl(response),
+        }
+        self._entries[file_path] = entry
+        return entry
+
+    def save(self, file_path: str, entry: Dict) -> None:
+        """Write the sidecar of a snapshot file to disk."""
+        with open(self.meta_path(file_path), "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+
+    def invalidate(self, file_path: str) -> None:
+        """Remove the sidecar of a snapshot that is about to be rewritten."""
+        try:
+            os.remove(self.meta_path(file_path))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _server_ttl(response: HttpResponse) -> Optional[float]:
+        """Return the TTL requested by the server, or None if it sets none."""
+        cache_control = response.headers.get("cache-control", "")
+        if "no-cache" in cache_control or "no-store" in cache_control:
+            return 0.0
+        match = re.search(r"max-age=(\d+)", cache_control)
+        return float(match.group(1)) if match else None
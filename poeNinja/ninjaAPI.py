@@ -1,32 +1,178 @@
-from typing import Dict, List, Union
+import os
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 
+from poeNinja.cache import SnapshotCache
+from utils.instrumentation import instrumentation
+from utils.price_source import PriceSource
+from utils.snapshot_file import SnapshotFile
 from utils.utils import Utils
 
 
 class PoeNinja:
-    """Handles data retrieval from poe.ninja API for various item types."""
+    """Handles data retrieval from poe.ninja API for various item types.
 
-    BASE_URL = "https://poe.ninja/api/data/"
+    Snapshots of every league are kept apart, in memory and on disk (see
+    ``Utils.league_directory``), so several leagues can be fetched together
+    and switching between them never refetches or overwrites another
+    league's files.
 
-    def __init__(self):
+    Overviews are read from a ``PriceSource``: live poe.ninja by default, or
+    a mirror, a local stand-in or a directory of recorded snapshots. Every
+    source goes through the same cache and parse path.
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+    # Seconds between two checks of the cancel event while requests are in flight
+    CANCEL_POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        freshness_window: float = SnapshotCache.DEFAULT_FRESHNESS_WINDOW,
+        persist: bool = True,
+        source: Optional[PriceSource] = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            max_workers: Maximum number of endpoints of a league fetched at
+                the same time. A value of 1 fetches the endpoints of a league
+                one after another.
+            freshness_window: Seconds a saved snapshot of the same league is
+                reused without any request. Older snapshots are revalidated
+                with a conditional request.
+            persist: Whether fetched snapshots are also written to disk. Writes
+                happen on a background thread and never delay ``get_data``.
+            source: Where the overviews are read from; ``Utils.price_source``
+                when omitted
+        """
         self.utils = Utils()
+        self.source = source or Utils.price_source
+        self.cache = SnapshotCache(freshness_window)
         self._data_directories = ["Data", "Uniquedata"]
+        self.max_workers = max(1, max_workers)
+        self.persist = persist
+        self.errors: Dict[str, Exception] = {}
+        self.updated_leagues: Set[str] = set()
+        self._snapshots: Dict[str, Dict] = {}
+        self._writer = ThreadPoolExecutor(max_workers=1) if persist else None
+
+    def get_data(
+        self,
+        league_name: str,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Dict[str, Dict[str, Dict]]:
+        """Fetch data for the specified league.
 
-    def get_data(self, league_name: str) -> None:
-        """Fetch and save data for the specified league.
+        Endpoints that fail are recorded in ``errors``. Their last good
+        snapshot from memory or disk is returned instead, or, if there is
+        none, they are left out of the result.
 
         Args:
             league_name: Name of the Path of Exile league to fetch data for
+            progress: Called with (finished endpoints, total endpoints) after
+                each endpoint completes
+            cancel_event: When set, endpoints that have not started yet are
+                dropped and CancelledError is raised
+
+        Returns:
+            Parsed snapshots grouped like the files on disk, e.g.
+            ``{"Data": {"Currency": {...}}, "Uniquedata": {"UniqueMap": {...}}}``
+
+        Raises:
+            CancelledError: If ``cancel_event`` was set during the fetch
         """
-        self._prepare_directories()
+        return self.get_leagues([league_name], progress, cancel_event)[league_name]
 
-        endpoints = self._build_endpoints(league_name)
-        self._process_endpoints(endpoints)
+    def get_leagues(
+        self,
+        league_names: List[str],
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Dict]]]:
+        """Fetch data for several leagues at once.
+
+        The endpoints of all leagues go through one pool of ``max_workers``
+        threads per league, so the leagues are fetched side by side.
+
+        Args:
+            league_names: Leagues to fetch
+            progress: Called with (finished endpoints, total endpoints) after
+                each endpoint completes
+            cancel_event: When set, endpoints that have not started yet are
+                dropped and CancelledError is raised
 
-    def _prepare_directories(self) -> None:
-        """Create required directories for data storage."""
+        Returns:
+            Parsed snapshots of every league, like ``get_data`` returns them
+
+        Raises:
+            CancelledError: If ``cancel_event`` was set during the fetch
+        """
+        jobs = []
+        for league_name in league_names:
+            if self.persist:
+                self._prepare_directories(league_name)
+            jobs.extend(
+                self._process_endpoints(self._build_endpoints(league_name), league_name)
+            )
+
+        errors: Dict[str, Exception] = {}
+        updated: Set[str] = set()
+        results = self._process_multiple_urls(
+            jobs,
+            errors,
+            updated,
+            self.max_workers * len(league_names),
+            progress,
+            cancel_event,
+        )
+        self.errors = errors
+        self.updated_leagues = updated
+
+        failed = {league_name for url, _, league_name in jobs if url in errors}
+        for league_name in league_names:
+            snapshots = results.setdefault(league_name, {})
+            if self._writer is None or league_name in failed:
+                continue
+            path = os.path.join(
+                self.utils.league_directory("Data", league_name), SnapshotFile.FILENAME
+            )
+            if league_name in updated or not os.path.exists(path):
+                self._writer.submit(
+                    self._write_snapshot_file, path, snapshots, league_name
+                )
+        return results
+
+    @property
+    def received_new_data(self) -> bool:
+        """Whether the last fetch downloaded any changed snapshot.
+
+        False when every endpoint was answered from a fresh cache entry or
+        with 304 Not Modified. ``updated_leagues`` tells which leagues of a
+        multi-league fetch changed.
+        """
+        return bool(self.updated_leagues)
+
+    def flush(self) -> None:
+        """Block until all pending snapshot writes have reached the disk."""
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+
+    def _prepare_directories(self, league_name: str) -> None:
+        """Create the data directories of a league."""
         for directory in self._data_directories:
-            self.utils.create_directories(directory)
+            self.utils.create_directories(
+                self.utils.league_directory(directory, league_name)
+            )
 
     def _build_endpoints(self, league_name: str) -> Dict[str, Union[str, List[str]]]:
         """Construct API endpoints for different item types.
@@ -61,52 +207,228 @@ class PoeNinja:
             item_type: Type of items to query
 
         Returns:
-            Complete API URL string
+            Complete API URL string of the price source
         """
-        return f"{self.BASE_URL}{endpoint}?league={league_name}&type={item_type}"
+        return self.source.overview_url(endpoint, league_name, item_type)
 
-    def _process_endpoints(self, endpoints: Dict[str, Union[str, List[str]]]) -> None:
-        """Process all endpoints and save their data.
+    @staticmethod
+    def _process_endpoints(
+        endpoints: Dict[str, Union[str, List[str]]], league_name: str
+    ) -> List[Tuple[str, str, str]]:
+        """List the fetch jobs of a league's endpoints.
 
         Args:
             endpoints: Dictionary of endpoints to process
+            league_name: League the endpoints belong to
+
+        Returns:
+            List of (API URL, data directory, league) jobs
         """
+        jobs = []
         for category, url_or_urls in endpoints.items():
             if isinstance(url_or_urls, list):
-                self._process_multiple_urls(url_or_urls, "Uniquedata")
+                jobs.extend((url, "Uniquedata", league_name) for url in url_or_urls)
             else:
-                self._process_single_url(url_or_urls, "Data")
+                jobs.append((url_or_urls, "Data", league_name))
+        return jobs
+
+    def _process_single_url(
+        self, url: str, directory: str, league_name: str
+    ) -> Tuple[Dict, bool]:
+        """Fetch data from a single endpoint and schedule it for saving.
 
-    def _process_single_url(self, url: str, directory: str) -> None:
-        """Fetch and save data from a single endpoint.
+        A snapshot that is still fresh is reused without a request.
+        Otherwise the request carries the saved validators, and a
+        304 Not Modified answer reuses the snapshot already held.
 
         Args:
             url: API URL to fetch
-            directory: Directory to save the data in
+            directory: Data directory the snapshot belongs to
+            league_name: League the snapshot belongs to
+
+        Returns:
+            Tuple of (parsed endpoint data, whether it was newly downloaded)
         """
-        data = self.utils.fetch_url_data(url)
-        filename = self._generate_filename(url, directory)
-        self.utils.save_data_to_file(data, filename)
+        filename = self._generate_filename(url, directory, league_name)
+        entry = self.cache.load(url, filename)
+        data = self._load_snapshot(url, filename, directory) if entry else None
+        if data is None:
+            entry = None
+        elif self.cache.is_fresh(entry):
+            return data, False
+
+        with instrumentation.stage("network", url) as record:
+            response = self.source.get(
+                url, headers=self.cache.conditional_headers(entry)
+            )
+            record.bytes = response.stats.wire_bytes
+        if response.status == 304:
+            self._schedule_write(
+                filename, None, self.cache.update(url, filename, response)
+            )
+            return data, False
+
+        with instrumentation.stage("parse", url) as record:
+            data = self.utils.parse_snapshot(response.body, directory)
+            record.bytes = len(response.body)
+            record.items = len(data.get("lines", []))
+        self._snapshots[url] = data
+        self._schedule_write(filename, data, self.cache.update(url, filename, response))
+        return data, True
 
-    def _process_multiple_urls(self, urls: List[str], directory: str) -> None:
-        """Fetch and save data from multiple endpoints.
+    def _load_snapshot(self, url: str, filename: str, directory: str) -> Optional[Dict]:
+        """Return a previously fetched snapshot from memory or disk."""
+        data = self._snapshots.get(url)
+        if data is None:
+            try:
+                with open(filename, "r", encoding="utf-8") as f:
+                    data = self.utils.parse_snapshot(f, directory)
+            except (OSError, ValueError):
+                return None
+            self._snapshots[url] = data
+        return data
+
+    def _schedule_write(self, filename: str, data: Optional[Dict], entry: Dict) -> None:
+        """Queue a snapshot and its cache sidecar for a background write.
 
         Args:
-            urls: List of API URLs to fetch
-            directory: Directory to save the data in
+            filename: Target file path
+            data: Snapshot to write, or None if the file on disk is current
+            entry: Cache entry to write next to the file
         """
-        for url in urls:
-            self._process_single_url(url, directory)
+        if self._writer is None:
+            return
+        self._writer.submit(self._write_snapshot, filename, data, entry)
+
+    def _write_snapshot(self, filename: str, data: Optional[Dict], entry: Dict) -> None:
+        """Write a snapshot file followed by its cache sidecar."""
+        try:
+            if data is not None:
+                self.cache.invalidate(filename)
+                self.utils.save_data_to_file(data, filename)
+            self.cache.save(filename, entry)
+        except OSError as e:
+            print(f"Error saving {filename}: {e}")
+
+    @staticmethod
+    def _write_snapshot_file(
+        path: str, snapshots: Dict[str, Dict[str, Dict]], league_name: str
+    ) -> None:
+        """Write the compact snapshot file read by ``Utils.read_snapshots``."""
+        try:
+            with instrumentation.stage("write", path) as record:
+                SnapshotFile.write(path, snapshots, league_name)
+                record.bytes = os.path.getsize(path)
+        except OSError as e:
+            print(f"Error saving {path}: {e}")
+
+    def _process_multiple_urls(
+        self,
+        jobs: List[Tuple[str, str, str]],
+        errors: Dict[str, Exception],
+        updated: Set[str],
+        max_workers: int,
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Dict[str, Dict[str, Dict[str, Dict]]]:
+        """Fetch data from multiple endpoints concurrently.
+
+        Every snapshot is queued for saving as soon as its response arrives.
+        A failing endpoint does not stop the others; its error is recorded in
+        ``errors`` instead, and its last good snapshot from memory or disk is
+        used if there is one.
+
+        Args:
+            jobs: List of (API URL, data directory, league) jobs
+            errors: Receives the error of every failed URL
+            updated: Receives the leagues for which new data was downloaded
+            max_workers: Maximum number of endpoints fetched at the same time
+            progress: Optional per-endpoint progress callback
+            cancel_event: Optional event that aborts the fetch when set; it
+                is checked every ``CANCEL_POLL_INTERVAL`` seconds, so a slow
+                request does not delay the cancellation
+
+        Returns:
+            Parsed snapshots per league, grouped by data directory and item
+            type
+
+        Raises:
+            CancelledError: If ``cancel_event`` was set during the fetch
+        """
+        snapshots: Dict[str, Dict[str, Dict[str, Dict]]] = {}
+        if not jobs:
+            return snapshots
+
+        workers = min(max_workers, len(jobs))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                executor.submit(self._process_single_url, *job): job for job in jobs
+            }
+            pending = set(futures)
+            done = 0
+            while pending:
+                finished, pending = wait(
+                    pending,
+                    timeout=None if cancel_event is None else self.CANCEL_POLL_INTERVAL,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in finished:
+                    self._collect(future, futures[future], snapshots, errors, updated)
+                    done += 1
+                    if progress is not None:
+                        progress(done, len(jobs))
+                if cancel_event is not None and cancel_event.is_set():
+                    for future in pending:
+                        future.cancel()
+                    raise CancelledError()
+        finally:
+            # Requests already in flight finish in the background.
+            executor.shutdown(wait=False)
+
+        return snapshots
+
+    def _collect(
+        self,
+        future: Future,
+        job: Tuple[str, str, str],
+        snapshots: Dict[str, Dict[str, Dict[str, Dict]]],
+        errors: Dict[str, Exception],
+        updated: Set[str],
+    ) -> None:
+        """Add the result of a finished fetch job to ``snapshots``.
+
+        A failed job is recorded in ``errors`` and replaced by the last good
+        snapshot of its endpoint, if there is one.
+        """
+        url, directory, league_name = job
+        try:
+            data, is_new = future.result()
+        except Exception as e:
+            errors[url] = e
+            filename = self._generate_filename(url, directory, league_name)
+            data, is_new = self._load_snapshot(url, filename, directory), False
+        if data is None:
+            return
+        if is_new:
+            updated.add(league_name)
+        item_name = self.utils.get_item_name(url)
+        snapshots.setdefault(league_name, {}).setdefault(directory, {})[
+            item_name
+        ] = data
 
-    def _generate_filename(self, url: str, directory: str) -> str:
+    def _generate_filename(self, url: str, directory: str, league_name: str) -> str:
         """Generate filename for saving API data.
 
         Args:
             url: API URL used to generate the filename
-            directory: Target directory for the file
+            directory: Data directory the file belongs to
+            league_name: League the file belongs to
 
         Returns:
             Full file path string
         """
         item_name = self.utils.get_item_name(url)
-        return f"{directory}//{item_name}.json"
+        return os.path.join(
+            self.utils.league_directory(directory, league_name), f"{item_name}.json"
+        )
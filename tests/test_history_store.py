@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from utils.history_store import HistoryStore
+from utils.price_index import PriceIndex
+from utils.utils import Utils
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+LEAGUE = "Settlers"
+
+
+@pytest.fixture(scope="module")
+def scored():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(FIXTURES)
+        divination_data, currency_data, unique_items = Utils.load_data()
+    price_index = PriceIndex.build(divination_data, currency_data, unique_items)
+    return Utils().score_cards(divination_data, price_index)
+
+
+def test_card_history_in_time_order(tmp_path, scored):
+    with HistoryStore(str(tmp_path / HistoryStore.FILENAME)) as history:
+        history.append(LEAGUE, scored, taken_at=100.0)
+        history.append(LEAGUE, scored, taken_at=200.0)
+        history.append("Standard", scored, taken_at=300.0)
+
+        rows = history.card_history(LEAGUE, "The Doctor")
+        assert [row[0] for row in rows] == [100.0, 200.0]
+        assert history.card_history(LEAGUE, "The Doctor", start=150.0)[0][0] == 200.0
+        assert history.card_history(LEAGUE, "Unknown Card") == []
+
+
+def test_stores_sharing_a_database(tmp_path, scored):
+    path = str(tmp_path / HistoryStore.FILENAME)
+    with HistoryStore(path) as first, HistoryStore(path) as second:
+        # ``second`` has no card ids cached when ``first`` adds them
+        first.append(LEAGUE, scored, taken_at=100.0)
+        second.append(LEAGUE, scored, taken_at=200.0)
+
+        for history in (first, second):
+            rows = history.card_history(LEAGUE, "The Doctor")
+            assert [row[0] for row in rows] == [100.0, 200.0]
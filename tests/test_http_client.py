@@ -0,0 +1,56 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import URLError
+
+import pytest
+
+from utils.http_client import HttpClient
+
+BODY = b'{"lines": []}'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = gzip.compress(BODY)
+        if self.path == "/corrupt":
+            body = body[:10] + b"\xff" * 16 + body[10:]
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_gzip_body_is_decoded_and_connection_reused(base_url):
+    client = HttpClient()
+    first = client.get(f"{base_url}/ok")
+    second = client.get(f"{base_url}/ok")
+
+    assert first.body == second.body == BODY
+    assert first.stats.encoding == "gzip"
+    assert second.stats.reused_connection
+
+
+def test_corrupt_body_raises_url_error_and_drops_connection(base_url):
+    client = HttpClient()
+    with pytest.raises(URLError, match="Corrupt gzip"):
+        client.get(f"{base_url}/corrupt")
+
+    assert not any(client._idle.values())
+    assert client.get(f"{base_url}/ok").body == BODY
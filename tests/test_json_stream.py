@@ -0,0 +1,46 @@
+import json
+import os
+from io import StringIO
+
+import pytest
+
+from utils.json_stream import iter_array_items
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+DOCUMENTS = [
+    '{"lines":[1, 2.5e3 ,-3]}',
+    '{"lines": [0.125, -1E-2, 10, 2.0e+10]}',
+    '{"count": 12.75, "flag": true, "lines": [true, false, null, -0.5]}',
+    '{"skipped": {"a": [1.5, "x"]}, "lines": ["a\\"b", {"c": [3.25e-1]}, []]}',
+    '{ "lines" : [ ] }',
+    '{"other": 1}',
+]
+
+
+def expected_items(document, key="lines"):
+    return json.loads(document).get(key, [])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64 * 1024])
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_items_match_json_loads(document, chunk_size):
+    items = iter_array_items(StringIO(document), "lines", chunk_size)
+
+    assert list(items) == expected_items(document)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 13, 4096])
+def test_fixture_items_match_json_loads(chunk_size):
+    with open(os.path.join(FIXTURES, "Data", "Currency.json"), encoding="utf-8") as fp:
+        document = fp.read()
+
+    items = iter_array_items(StringIO(document), "lines", chunk_size)
+
+    assert list(items) == expected_items(document)
+
+
+@pytest.mark.parametrize("document", ['{"lines": [1, 2', '{"lines": [1 2]}'])
+def test_invalid_document_raises(document):
+    with pytest.raises(ValueError):
+        list(iter_array_items(StringIO(document), "lines", 3))
@@ -0,0 +1,108 @@
+import copy
+import threading
+import time
+from concurrent.futures import CancelledError
+from urllib.error import HTTPError
+
+import pytest
+
+from benchmarks.fixtures import make_leagues, make_snapshots
+from benchmarks.mock_server import MockServer
+from poeNinja.ninjaAPI import PoeNinja
+from utils.http_client import HttpClient
+from utils.utils import Utils
+
+LATENCY = 0.2
+LEAGUE = "Bench"
+
+
+@pytest.fixture
+def snapshots():
+    return make_snapshots(scale=0.05)
+
+
+@pytest.fixture(autouse=True)
+def working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def make_client(server: MockServer, **kwargs) -> PoeNinja:
+    return PoeNinja(
+        persist=False,
+        freshness_window=0,
+        source=server.price_source(HttpClient()),
+        **kwargs,
+    )
+
+
+def test_endpoints_are_fetched_concurrently(snapshots):
+    with MockServer(snapshots, make_leagues(LEAGUE), latency=LATENCY) as server:
+        start = time.perf_counter()
+        results = make_client(server).get_data(LEAGUE)
+        elapsed = time.perf_counter() - start
+
+    assert server.requests == 8
+    assert set(results["Data"]) == {"Currency", "DivinationCard"}
+    assert len(results["Uniquedata"]) == 6
+    # Eight endpoints in a row would take 8 * LATENCY
+    assert elapsed < 2 * LATENCY
+
+
+def test_worker_limit_bounds_concurrency(snapshots):
+    with MockServer(snapshots, make_leagues(LEAGUE), latency=LATENCY) as server:
+        start = time.perf_counter()
+        make_client(server, max_workers=4).get_data(LEAGUE)
+        elapsed = time.perf_counter() - start
+
+    assert 2 * LATENCY <= elapsed < 3 * LATENCY
+
+
+def test_failed_endpoints_are_collected(snapshots):
+    snapshots = copy.deepcopy(snapshots)
+    del snapshots["Uniquedata"]["UniqueJewel"]
+    with MockServer(snapshots, make_leagues(LEAGUE), latency=LATENCY) as server:
+        poe_ninja = make_client(server)
+        results = poe_ninja.get_data(LEAGUE)
+
+    [(url, error)] = poe_ninja.errors.items()
+    assert "type=UniqueJewel" in url
+    assert isinstance(error, HTTPError) and error.code == 404
+    assert "UniqueJewel" not in results["Uniquedata"]
+    assert len(results["Uniquedata"]) == 5
+    assert set(results["Data"]) == {"Currency", "DivinationCard"}
+    assert poe_ninja.updated_leagues == {LEAGUE}
+
+
+def test_failed_endpoint_falls_back_to_last_snapshot(snapshots):
+    with MockServer(snapshots, make_leagues(LEAGUE)) as server:
+        poe_ninja = make_client(server)
+        first = poe_ninja.get_data(LEAGUE)
+        del server.payloads["Currency"]
+        second = poe_ninja.get_data(LEAGUE)
+
+    [url] = poe_ninja.errors
+    assert "type=Currency" in url
+    assert second["Data"]["Currency"] is first["Data"]["Currency"]
+    Utils.load_data(second)
+
+
+def test_missing_data_without_fallback_is_reported(snapshots):
+    snapshots = copy.deepcopy(snapshots)
+    del snapshots["Data"]["Currency"]
+    with MockServer(snapshots, make_leagues(LEAGUE)) as server:
+        results = make_client(server).get_data(LEAGUE)
+
+    with pytest.raises(ValueError, match="No Currency data"):
+        Utils.load_data(results)
+
+
+def test_cancel_does_not_wait_for_slow_requests(snapshots):
+    cancel_event = threading.Event()
+    with MockServer(snapshots, make_leagues(LEAGUE), latency=2.0) as server:
+        threading.Timer(0.1, cancel_event.set).start()
+        start = time.perf_counter()
+        with pytest.raises(CancelledError):
+            make_client(server).get_data(LEAGUE, cancel_event=cancel_event)
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from utils.price_index import PriceIndex
+from utils.reward_index import RewardIndex
+from utils.utils import Utils
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@pytest.fixture(scope="module")
+def snapshots():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.chdir(FIXTURES)
+        return Utils.read_snapshots()
+
+
+@pytest.fixture(scope="module")
+def price_index(snapshots):
+    return PriceIndex.build(*Utils.load_data(snapshots))
+
+
+@pytest.fixture(scope="module")
+def rewards(snapshots):
+    return RewardIndex.build(snapshots["Data"]["DivinationCard"])
+
+
+def test_currency_resolves_to_chaos_equivalent(price_index, rewards):
+    assert price_index.currency["Exalted Orb"] == 12.5
+    assert price_index.currency[PriceIndex.CHAOS_ORB] == 1.0
+    assert price_index.reward_price(rewards.get("Abandoned Wealth")) == 3 * 12.5
+
+
+def test_unlisted_currency_is_worth_nothing(price_index, rewards):
+    assert price_index.reward_price(rewards.get("House of Mirrors")) == 0
+
+
+def test_card_resolves_to_chaos_value(price_index, rewards):
+    assert price_index.cards["The Doctor"] == 1100.0
+    assert price_index.reward_price(rewards.get("The Gambler")) == 1100.0
+
+
+def test_card_values_replace_market_prices(price_index, rewards):
+    valued = price_index.with_card_values({"The Doctor": 1125.0})
+    assert valued.reward_price(rewards.get("The Gambler")) == 1125.0
+
+
+@pytest.mark.parametrize(
+    "card, price",
+    [
+        # No guarantee: the plain line, not the corrupted variant
+        ("The Doctor", 9000.0),
+        # Corrupted: the corrupted variant, not the plain line
+        ("The Fiend", 9500.0),
+        # No links guaranteed: neither the five- nor the six-link line
+        ("The Wretched", 300.0),
+        # Six-link: the six-link line, not the unlinked or five-link one
+        ("The Craving", 1500.0),
+        # Relic: the Relic variant, not the plain or six-link line
+        ("Imperial Legacy", 800.0),
+    ],
+)
+def test_unique_lines_are_told_apart(price_index, rewards, card, price):
+    assert price_index.reward_price(rewards.get(card)) == price
+
+
+def test_unique_get_returns_plain_line(price_index):
+    assert price_index.uniques.get("Atziri's Disfavour") == 50.0
+    assert price_index.uniques.get("Mageblood", -1) == -1
+
+
+def test_divine_value(price_index):
+    assert price_index.divine_value == 180.0
+
+
+def test_divine_value_missing(snapshots):
+    divination_data, currency_data, unique_items = Utils.load_data(snapshots)
+    currency_data = {
+        "lines": [
+            line
+            for line in currency_data["lines"]
+            if line["currencyTypeName"] != PriceIndex.DIVINE_ORB
+        ]
+    }
+    price_index = PriceIndex.build(divination_data, currency_data, unique_items)
+
+    assert price_index.divine_value is None
@@ -0,0 +1,101 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import pytest
+from PyQt6.QtCore import QPersistentModelIndex, Qt
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.fixtures import make_snapshots
+from gui.proxy_model import CardProxyModel
+from gui.table_model import CardTableModel
+from utils.price_index import PriceIndex
+from utils.utils import Utils
+
+REPRICED_SHARE = 0.05
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture(scope="module")
+def scoring():
+    snapshots = make_snapshots()
+    divination_data, currency_data, unique_items = Utils.load_data(snapshots)
+    price_index = PriceIndex.build(divination_data, currency_data, unique_items)
+    utils = Utils()
+    scored = utils.score_cards(divination_data, price_index)
+    return utils._scoring_engine, price_index, scored
+
+
+@pytest.fixture
+def models(app, scoring, monkeypatch):
+    _, price_index, scored = scoring
+    table_model = CardTableModel()
+    table_model.set_results(scored, price_index.divine_value)
+    proxy = CardProxyModel()
+    proxy.setSourceModel(table_model)
+
+    counts = {"rebuilds": 0, "layouts": 0, "data": 0}
+    new_query = proxy._new_query
+
+    def counting_new_query():
+        counts["rebuilds"] += 1
+        return new_query()
+
+    monkeypatch.setattr(proxy, "_new_query", counting_new_query)
+    proxy.layoutChanged.connect(
+        lambda *args: counts.update(layouts=counts["layouts"] + 1)
+    )
+    proxy.dataChanged.connect(lambda *args: counts.update(data=counts["data"] + 1))
+    return table_model, proxy, counts
+
+
+def repriced(scoring, seed=0):
+    engine, price_index, _ = scoring
+    rng = np.random.default_rng(seed)
+    card_prices = engine.cost.copy()
+    moved = rng.random(len(card_prices)) < REPRICED_SHARE
+    card_prices[moved] *= rng.uniform(0.5, 1.5, moved.sum())
+    return engine.score(price_index, card_prices)
+
+
+def shown_names(proxy):
+    return [proxy.card_name(row) for row in range(proxy.rowCount())]
+
+
+def test_merge_rebuilds_once(scoring, models):
+    table_model, proxy, counts = models
+    proxy.sort(CardTableModel.PROFIT_COLUMN, Qt.SortOrder.DescendingOrder)
+    selected = QPersistentModelIndex(proxy.index(10, CardTableModel.NAME_COLUMN))
+    name = selected.data()
+    counts.update(rebuilds=0, layouts=0, data=0)
+
+    table_model.set_results(repriced(scoring), scoring[1].divine_value)
+
+    assert counts["rebuilds"] == 1
+    assert counts["layouts"] == 1
+    assert selected.data() == name
+    profit_of = {row[0]: row[2] for row in table_model.rows}
+    profits = [profit_of[shown] for shown in shown_names(proxy)]
+    assert len(profits) == len(table_model.rows)
+    assert profits == sorted(profits, reverse=True)
+
+
+def test_values_changed_in_place_only_emit_data_changed(scoring, models):
+    table_model, proxy, counts = models
+    proxy.sort(CardTableModel.NAME_COLUMN)
+    before = shown_names(proxy)
+    counts.update(rebuilds=0, layouts=0, data=0)
+
+    # A new Divine Orb price changes every cell's text, but no sort key.
+    _, price_index, scored = scoring
+    table_model.set_results(scored, price_index.divine_value * 2)
+
+    assert counts["rebuilds"] == 1
+    assert counts["layouts"] == 0
+    assert counts["data"] >= 1
+    assert shown_names(proxy) == before
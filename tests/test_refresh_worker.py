@@ -0,0 +1,50 @@
+import os
+import shutil
+
+import pytest
+
+from gui.workers import RefreshWorker
+from poeNinja.ninjaAPI import PoeNinja
+from utils.history_store import HistoryStore
+from utils.price_source import DirectorySource
+from utils.utils import Utils
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@pytest.fixture
+def source(tmp_path):
+    """Recorded snapshots of two leagues; "Broken" lacks its currency."""
+    for league in ("Settlers", "Broken"):
+        for directory in ("Data", "Uniquedata"):
+            target = tmp_path / "source" / Utils.league_directory(directory, league)
+            shutil.copytree(os.path.join(FIXTURES, directory), target)
+    os.remove(
+        tmp_path / "source" / Utils.league_directory("Data", "Broken") / "Currency.json"
+    )
+    return DirectorySource(str(tmp_path / "source"))
+
+
+def test_failing_league_does_not_drop_the_others(tmp_path, monkeypatch, source):
+    monkeypatch.chdir(tmp_path)
+    poe_ninja = PoeNinja(persist=False, source=source)
+    worker = RefreshWorker(poe_ninja, {"Settlers": Utils(), "Broken": Utils()})
+
+    results = worker.work()
+
+    assert list(results) == ["Settlers"]
+    assert len(results["Settlers"][0]) == 8
+    assert isinstance(poe_ninja.errors["Broken"], ValueError)
+
+
+def test_history_is_recorded_in_the_given_directory(tmp_path, monkeypatch, source):
+    monkeypatch.chdir(tmp_path)
+    poe_ninja = PoeNinja(persist=False, source=source)
+    worker = RefreshWorker(poe_ninja, {"Settlers": Utils()}, "History")
+
+    worker.work()
+
+    path = str(tmp_path / "History" / HistoryStore.FILENAME)
+    with HistoryStore(path) as history:
+        assert len(history.refreshes("Settlers")) == 1
+        assert len(history.card_history("Settlers", "The Doctor")) == 1
@@ -0,0 +1,70 @@
+import json
+import time
+
+import numpy as np
+import pytest
+
+from benchmarks.fixtures import make_leagues, make_snapshots
+from benchmarks.mock_server import MockServer, Payload
+from poeNinja.ninjaAPI import PoeNinja
+from utils.http_client import HttpClient
+from utils.score_client import ScoreClient
+from utils.score_server import ScoreServer
+from utils.utils import Utils
+
+LEAGUE = "Bench"
+
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with MockServer(make_snapshots(scale=0.05), make_leagues(LEAGUE)) as server:
+        monkeypatch.setattr(Utils, "price_source", server.price_source(HttpClient()))
+        yield server
+
+
+@pytest.fixture
+def score_server(upstream):
+    poe_ninja = PoeNinja(persist=False, freshness_window=0)
+    with ScoreServer(poe_ninja, [LEAGUE], interval=3600).start(0) as server:
+        deadline = time.monotonic() + 10
+        while server.refreshed_at is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        yield server
+
+
+@pytest.mark.parametrize("binary", [True, False])
+def test_unchanged_league_is_not_modified(score_server, binary):
+    client = ScoreClient(score_server.url, HttpClient(), binary=binary)
+    scored, price_index = client.get_leagues([LEAGUE])[LEAGUE]
+    assert client.updated_leagues == {LEAGUE}
+    assert price_index.divine_value == 200.0
+
+    score_server.refresh()
+    again, _ = client.get_leagues([LEAGUE])[LEAGUE]
+
+    assert not client.received_new_data
+    assert client.client.stats[-1].status == 304
+    assert again is scored
+
+
+def test_changed_league_is_sent_again(upstream, score_server):
+    client = ScoreClient(score_server.url, HttpClient())
+    scored, _ = client.get_leagues([LEAGUE])[LEAGUE]
+
+    cards = json.loads(upstream.payloads["DivinationCard"].body)
+    for line in cards["lines"]:
+        line["chaosValue"] += 1
+    upstream.payloads["DivinationCard"] = Payload(json.dumps(cards).encode("utf-8"))
+    score_server.refresh()
+    changed, _ = client.get_leagues([LEAGUE])[LEAGUE]
+
+    assert client.updated_leagues == {LEAGUE}
+    assert np.allclose(changed.cost, scored.cost + 1)
+
+
+def test_unserved_league_is_not_found(score_server):
+    client = ScoreClient(score_server.url, HttpClient())
+    assert client.get_leagues(["Unknown"]) == {}
+    [error] = client.errors.values()
+    assert error.code == 404
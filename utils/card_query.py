@@ -0,0 +1,179 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class NameIndex:
+    """Case-insensitive substring search over a set of names.
+
+    Every substring of up to ``GRAM`` characters of every name maps to the
+    names containing it, so a short search is one dictionary lookup. A
+    longer search only checks the names listed under its rarest gram.
+    Searches are incremental: while the user keeps typing, the previous
+    matches are narrowed down instead of searching from scratch.
+    """
+
+    GRAM = 3
+
+    def __init__(self, names: Iterable[str]):
+        self.names = frozenset(names)
+        self._folded = {name: name.casefold() for name in self.names}
+        self._grams: Dict[str, Set[str]] = {}
+        for name, folded in self._folded.items():
+            for size in range(1, self.GRAM + 1):
+                for start in range(len(folded) - size + 1):
+                    self._grams.setdefault(folded[start : start + size], set()).add(
+                        name
+                    )
+        self._last: Tuple[str, Set[str]] = ("", set(self.names))
+
+    def search(self, text: str) -> Set[str]:
+        """Return the names containing ``text``, ignoring case."""
+        text = text.casefold()
+        last_text, last_matches = self._last
+        if not text:
+            matches = set(self.names)
+        elif last_text and last_text in text:
+            matches = {name for name in last_matches if text in self._folded[name]}
+        elif len(text) <= self.GRAM:
+            matches = set(self._grams.get(text, ()))
+        else:
+            candidates = min(
+                (
+                    self._grams.get(text[start : start + self.GRAM], set())
+                    for start in range(len(text) - self.GRAM + 1)
+                ),
+                key=len,
+            )
+            matches = {name for name in candidates if text in self._folded[name]}
+        self._last = (text, matches)
+        return matches
+
+
+class CardQuery:
+    """Sorts and filters a fixed list of cards on precomputed numeric keys.
+
+    Every sortable column is held as a numeric key array, so sorting never
+    compares formatted cell text. Sort orders and per-type masks are cached
+    until the cards change, which makes repeated interactions a few array
+    operations over the whole list.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        kinds: List[str],
+        keys: np.ndarray,
+        profit: np.ndarray,
+        roi: np.ndarray,
+        name_index: Optional[NameIndex] = None,
+    ):
+        """Prepare a query over cards.
+
+        Args:
+            names: Card names
+            kinds: Reward type per card
+            keys: Array of shape (columns, cards) with the sort key of each
+                sortable column, see ``text_key`` for text columns
+            profit: Set profit per card
+            roi: Return on the set cost in percent, per card
+            name_index: Index of the card names; reused from a previous
+                query when the names have not changed
+        """
+        self.names = names
+        self.kinds = kinds
+        self.keys = keys
+        self.profit = profit
+        self.roi = roi
+        if name_index is None or name_index.names != frozenset(names):
+            name_index = None
+        self._name_index = name_index
+        self._orders: Dict[Tuple[int, bool], np.ndarray] = {}
+        self._kind_masks: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def name_index(self) -> NameIndex:
+        """Substring index of the card names, built on first search."""
+        if self._name_index is None:
+            self._name_index = NameIndex(self.names)
+        return self._name_index
+
+    @staticmethod
+    def text_key(values: List[str]) -> np.ndarray:
+        """Return the case-insensitive alphabetical rank of each value."""
+        order = sorted(range(len(values)), key=lambda i: values[i].casefold())
+        rank = np.empty(len(values), dtype=np.float64)
+        rank[order] = np.arange(len(values))
+        return rank
+
+    def sort(self, column: int, descending: bool = False) -> np.ndarray:
+        """Return card positions sorted by a column.
+
+        Ties keep their original order in both directions.
+        """
+        key = (column, descending)
+        if key not in self._orders:
+            values = self.keys[column]
+            self._orders[key] = np.argsort(
+                -values if descending else values, kind="stable"
+            )
+        return self._orders[key]
+
+    def mask(
+        self,
+        kind: Optional[str] = None,
+        min_profit: Optional[float] = None,
+        min_roi: Optional[float] = None,
+        search: str = "",
+    ) -> np.ndarray:
+        """Return which cards pass the filters.
+
+        Args:
+            kind: Only cards with this reward type
+            min_profit: Only cards with at least this set profit
+            min_roi: Only cards with at least this return in percent
+            search: Only cards whose name contains this text
+
+        Returns:
+            Boolean array, one entry per card
+        """
+        mask = np.ones(len(self.names), dtype=bool)
+        if kind is not None:
+            if kind not in self._kind_masks:
+                self._kind_masks[kind] = np.fromiter(
+                    (card_kind == kind for card_kind in self.kinds),
+                    dtype=bool,
+                    count=len(self.kinds),
+                )
+            mask &= self._kind_masks[kind]
+        if min_profit is not None:
+            mask &= self.profit >= min_profit
+        if min_roi is not None:
+            mask &= self.roi >= min_roi
+        if search:
+            matches = self.name_index.search(search)
+            mask &= np.fromiter(
+                (name in matches for name in self.names),
+                dtype=bool,
+                count=len(self.names),
+            )
+        return mask
+
+    def rows(self, column: int, descending: bool = False, **filters) -> np.ndarray:
+        """Return the positions of the cards passing ``filters``, sorted.
+
+        Args:
+            column: Column to sort by
+            descending: Sort from highest to lowest
+            **filters: See ``mask``
+
+        Returns:
+            Array of card positions
+        """
+        order = self.sort(column, descending)
+        if not any(value not in (None, "") for value in filters.values()):
+            return order
+        return order[self.mask(**filters)[order]]
@@ -0,0 +1,220 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from utils.scoring import ScoredCards
+
+
+class HistoryStore:
+    """Append-only SQLite store of scored cards, one entry per refresh.
+
+    Every recorded refresh adds one row per card with its cost, reward price
+    and set profit. Prices are clustered by (card, refresh), so the history
+    of a card is a contiguous range of the table and range queries stay fast
+    as a league grows to millions of rows. Card names are interned in a
+    separate table.
+
+    The store can be shared between threads; calls are serialized.
+    """
+
+    FILENAME = "History.sqlite"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS refreshes (
+            id INTEGER PRIMARY KEY,
+            league TEXT NOT NULL,
+            taken_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS refreshes_by_league_time
+            ON refreshes (league, taken_at);
+        CREATE TABLE IF NOT EXISTS cards (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS prices (
+            card_id INTEGER NOT NULL,
+            refresh_id INTEGER NOT NULL,
+            cost REAL NOT NULL,
+            reward_price REAL NOT NULL,
+            profit REAL NOT NULL,
+            PRIMARY KEY (card_id, refresh_id)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: str):
+        """Open or create a history database.
+
+        Args:
+            path: Database file, or ":memory:"
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(self.SCHEMA)
+        self._card_ids: Dict[str, int] = dict(
+            self._connection.execute("SELECT name, id FROM cards")
+        )
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def append(
+        self, league: str, scored: ScoredCards, taken_at: Optional[float] = None
+    ) -> int:
+        """Record the scored cards of one refresh.
+
+        Args:
+            league: League the snapshot belongs to
+            scored: Scoring result of the refresh
+            taken_at: Unix time of the refresh; now by default
+
+        Returns:
+            Id of the new refresh
+        """
+        taken_at = time.time() if taken_at is None else taken_at
+        with self._lock:
+            try:
+                with self._connection:
+                    refresh_id = self._connection.execute(
+                        "INSERT INTO refreshes (league, taken_at) VALUES (?, ?)",
+                        (league, taken_at),
+                    ).lastrowid
+                    card_ids = [self._card_id(name) for name in scored.names]
+                    self._connection.executemany(
+                        "INSERT INTO prices"
+                        " (card_id, refresh_id, cost, reward_price, profit)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        zip(
+                            card_ids,
+                            [refresh_id] * len(card_ids),
+                            scored.cost.tolist(),
+                            scored.sell_price.tolist(),
+                            scored.profit.tolist(),
+                        ),
+                    )
+            except sqlite3.Error:
+                # Names added in the rolled back transaction are gone again.
+                self._card_ids = dict(
+                    self._connection.execute("SELECT name, id FROM cards")
+                )
+                raise
+        return refresh_id
+
+    def card_history(
+        self,
+        league: str,
+        name: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> List[Tuple[float, float, float, float]]:
+        """Return the recorded prices of a card, oldest first.
+
+        Args:
+            league: League name
+            name: Card name
+            start: Earliest refresh time to include (Unix time)
+            end: Latest refresh time to include (Unix time)
+
+        Returns:
+            List of (taken_at, cost, reward_price, profit)
+        """
+        with self._lock:
+            card_id = self._card_id(name, add=False)
+            if card_id is None:
+                return []
+            return self._connection.execute(
+                "SELECT r.taken_at, p.cost, p.reward_price, p.profit"
+                " FROM prices p JOIN refreshes r ON r.id = p.refresh_id"
+                " WHERE p.card_id = ? AND r.league = ?"
+                " AND r.taken_at BETWEEN ? AND ?"
+                " ORDER BY p.refresh_id",
+                (
+                    card_id,
+                    league,
+                    float("-inf") if start is None else start,
+                    float("inf") if end is None else end,
+                ),
+            ).fetchall()
+
+    def profitable_since(
+        self, league: str, name: str, min_profit: float = 0.0
+    ) -> Optional[float]:
+        """Return since when a card has been profitable without interruption.
+
+        Args:
+            league: League name
+            name: Card name
+            min_profit: Lowest set profit, in chaos, that counts as profitable
+
+        Returns:
+            Time of the first refresh of the current profitable streak, or
+            None if the card was not profitable in its latest refresh
+        """
+        with self._lock:
+            card_id = self._card_id(name, add=False)
+            if card_id is None:
+                return None
+            (since,) = self._connection.execute(
+                "SELECT MIN(r.taken_at)"
+                " FROM prices p JOIN refreshes r ON r.id = p.refresh_id"
+                " WHERE p.card_id = ? AND r.league = ? AND p.refresh_id > ("
+                "   SELECT COALESCE(MAX(p2.refresh_id), 0)"
+                "   FROM prices p2 JOIN refreshes r2 ON r2.id = p2.refresh_id"
+                "   WHERE p2.card_id = ? AND r2.league = ? AND p2.profit < ?"
+                " )",
+                (card_id, league, card_id, league, min_profit),
+            ).fetchone()
+        return since
+
+    def refreshes(
+        self, league: str, start: Optional[float] = None, end: Optional[float] = None
+    ) -> List[Tuple[int, float]]:
+        """Return the (id, taken_at) of the recorded refreshes of a league."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT id, taken_at FROM refreshes"
+                " WHERE league = ? AND taken_at BETWEEN ? AND ? ORDER BY taken_at",
+                (
+                    league,
+                    float("-inf") if start is None else start,
+                    float("inf") if end is None else end,
+                ),
+            ).fetchall()
+
+    def _card_id(self, name: str, add: bool = True) -> Optional[int]:
+        """Return the id of a card name.
+
+        Names missing from the cached ids are looked up in the database,
+        where another process sharing it may have added them.
+
+        Args:
+            name: Card name
+            add: Add the name if it is not in the database yet
+
+        Returns:
+            Id of the name, or None if it is unknown and ``add`` is False
+        """
+        card_id = self._card_ids.get(name)
+        if card_id is None:
+            if add:
+                self._connection.execute(
+                    "INSERT OR IGNORE INTO cards (name) VALUES (?)", (name,)
+                )
+            row = self._connection.execute(
+                "SELECT id FROM cards WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                return None
+            card_id = self._card_ids[name] = row[0]
+        return card_id
@@ -0,0 +1,267 @@
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from http.client import HTTPConnection, HTTPException, HTTPSConnection, responses
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always supported
+    brotli = None
+
+# Raised while decompressing a corrupt response body
+DECODE_ERRORS = (zlib.error,) if brotli is None else (zlib.error, brotli.error)
+
+
+@dataclass
+class RequestStats:
+    """Transfer statistics for a single HTTP request."""
+
+    url: str
+    status: int
+    wire_bytes: int
+    body_bytes: int
+    elapsed: float
+    encoding: str
+    reused_connection: bool
+
+
+@dataclass
+class HttpResponse:
+    """Fully read HTTP response."""
+
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    stats: RequestStats
+
+
+class HttpClient:
+    """Thread-safe HTTP client with per-host keep-alive connection pooling.
+
+    Responses are requested with gzip (and brotli, when the ``brotli`` package
+    is installed) transfer encoding and decompressed chunk by chunk while they
+    are read from the socket.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    MAX_REDIRECTS = 5
+    REDIRECT_CODES = {301, 302, 303, 307, 308}
+
+    def __init__(
+        self,
+        user_agent: Optional[str] = None,
+        timeout: float = 30.0,
+        max_idle_per_host: int = 8,
+        history_size: int = 256,
+    ):
+        """Initialize the client.
+
+        Args:
+            user_agent: User-Agent header sent with every request
+            timeout: Socket timeout in seconds
+            max_idle_per_host: Maximum number of idle connections kept per host
+            history_size: Number of recent requests kept in ``stats``
+        """
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[Tuple[str, str], List[HTTPConnection]] = {}
+        self._history: Deque[RequestStats] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    @property
+    def accept_encoding(self) -> str:
+        """Value of the Accept-Encoding header sent with each request."""
+        return "gzip, br" if brotli is not None else "gzip"
+
+    @property
+    def stats(self) -> List[RequestStats]:
+        """Statistics of the most recent requests, oldest first."""
+        with self._lock:
+            return list(self._history)
+
+    def summary(self) -> Dict[str, float]:
+        """Aggregate transfer statistics over the recorded requests.
+
+        Returns:
+            Dictionary with request count, bytes on the wire, decoded bytes
+            and total elapsed time in seconds
+        """
+        history = self.stats
+        return {
+            "requests": len(history),
+            "wire_bytes": sum(s.wire_bytes for s in history),
+            "body_bytes": sum(s.body_bytes for s in history),
+            "elapsed": sum(s.elapsed for s in history),
+        }
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        """Perform a GET request, following redirects.
+
+        Args:
+            url: URL to fetch
+            headers: Extra request headers
+
+        Returns:
+            Response with the decoded body. Status codes below 400 (including
+            304 Not Modified) are returned rather than raised.
+
+        Raises:
+            HTTPError: If the server answers with a status of 400 or above
+            URLError: If the connection fails or the body cannot be
+                decompressed
+        """
+        for _ in range(self.MAX_REDIRECTS + 1):
+            response = self._request(url, headers or {})
+            if response.status not in self.REDIRECT_CODES:
+                break
+            location = response.headers.get("location")
+            if not location:
+                break
+            url = urljoin(url, location)
+
+        if response.status >= 400:
+            reason = responses.get(response.status, "")
+            raise HTTPError(url, response.status, reason, None, None)
+        return response
+
+    def close(self) -> None:
+        """Close all idle pooled connections."""
+        with self._lock:
+            connections = [c for pool in self._idle.values() for c in pool]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+    def _request(self, url: str, headers: Dict[str, str]) -> HttpResponse:
+        """Send a single request over a pooled connection."""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        request_headers = {"Accept-Encoding": self.accept_encoding}
+        if self.user_agent:
+            request_headers["User-Agent"] = self.user_agent
+        request_headers.update(headers)
+
+        start = time.perf_counter()
+        connection, reused = self._acquire(key)
+        try:
+            try:
+                response = self._send(connection, path, request_headers)
+            except (HTTPException, ConnectionError):
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection; retry once.
+                connection.close()
+                connection, reused = self._new_connection(key), False
+                response = self._send(connection, path, request_headers)
+
+            encoding = response.getheader("Content-Encoding", "identity").lower()
+            body, wire_bytes = self._read_body(response, encoding)
+        except (HTTPException, OSError) as e:
+            connection.close()
+            raise URLError(e) from e
+        except DECODE_ERRORS as e:
+            connection.close()
+            raise URLError(f"Corrupt {encoding} response body: {e}") from e
+        except BaseException:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(key, connection)
+
+        stats = RequestStats(
+            url=url,
+            status=response.status,
+            wire_bytes=wire_bytes,
+            body_bytes=len(body),
+            elapsed=time.perf_counter() - start,
+            encoding=encoding,
+            reused_connection=reused,
+        )
+        with self._lock:
+            self._history.append(stats)
+
+        return HttpResponse(
+            url=url,
+            status=response.status,
+            headers={k.lower(): v for k, v in response.getheaders()},
+            body=body,
+            stats=stats,
+        )
+
+    @staticmethod
+    def _send(connection: HTTPConnection, path: str, headers: Dict[str, str]):
+        """Send a GET request and return the response object."""
+        connection.request("GET", path, headers=headers)
+        return connection.getresponse()
+
+    def _read_body(self, response, encoding: str) -> Tuple[bytes, int]:
+        """Read and decompress a response body chunk by chunk.
+
+        Returns:
+            Tuple of (decoded body, number of bytes read from the wire)
+        """
+        flush = None
+        if encoding == "gzip":
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            decompress, flush = decompressor.decompress, decompressor.flush
+        elif encoding == "deflate":
+            decompressor = zlib.decompressobj()
+            decompress, flush = decompressor.decompress, decompressor.flush
+        elif encoding == "br" and brotli is not None:
+            decompress = brotli.Decompressor().process
+        else:
+            decompress = None
+
+        chunks = []
+        wire_bytes = 0
+        while True:
+            chunk = response.read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+            wire_bytes += len(chunk)
+            chunks.append(decompress(chunk) if decompress else chunk)
+        if flush is not None:
+            chunks.append(flush())
+
+        return b"".join(chunks), wire_bytes
+
+    def _acquire(self, key: Tuple[str, str]) -> Tuple[HTTPConnection, bool]:
+        """Take an idle connection for the host or open a new one.
+
+        Returns:
+            Tuple of (connection, whether it was reused from the pool)
+        """
+        with self._lock:
+            pool = self._idle.get(key)
+            if pool:
+                return pool.pop(), True
+        return self._new_connection(key), False
+
+    def _release(self, key: Tuple[str, str], connection: HTTPConnection) -> None:
+        """Return a connection to the idle pool of its host."""
+        with self._lock:
+            pool = self._idle.setdefault(key, [])
+            if len(pool) < self.max_idle_per_host:
+                pool.append(connection)
+                return
+        connection.close()
+
+    def _new_connection(self, key: Tuple[str, str]) -> HTTPConnection:
+        """Open a new connection for the given (scheme, netloc) pair."""
+        scheme, netloc = key
+        connection_class = HTTPSConnection if scheme == "https" else HTTPConnection
+        return connection_class(netloc, timeout=self.timeout)
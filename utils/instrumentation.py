@@ -0,0 +1,173 @@
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, Iterator, List, Optional
+
+
+@dataclass
+class StageRecord:
+    """Measurements of one run of a refresh pipeline stage."""
+
+    stage: str
+    started: float  # Unix time
+    elapsed: float = 0.0
+    bytes: int = 0
+    items: int = 0
+    detail: str = ""
+
+
+class Instrumentation:
+    """Records wall time, bytes and item counts per refresh pipeline stage.
+
+    Stages are timed with ``stage``, a context manager that is cheap enough
+    to stay on in production: one ``perf_counter`` pair and a deque append.
+    Recent records are kept in memory for the debug panel; when
+    ``log_path`` is set every record is also appended to that file as one
+    JSON object per line, so payload growth can be tracked across runs.
+
+    The recorder can be shared between threads.
+    """
+
+    def __init__(self, history_size: int = 2048, log_path: Optional[str] = None):
+        """Initialize the recorder.
+
+        Args:
+            history_size: Number of recent records kept in ``records``
+            log_path: JSON lines file every record is appended to
+        """
+        self.log_path = log_path
+        self._history: Deque[StageRecord] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, detail: str = "") -> Iterator[StageRecord]:
+        """Time a block of code as one run of a stage.
+
+        The yielded record can be filled in with ``bytes`` and ``items``
+        while the block runs. A block that raises is still recorded.
+
+        Args:
+            name: Stage name, e.g. "network" or "score"
+            detail: Free text, e.g. the endpoint that was fetched
+        """
+        record = StageRecord(name, time.time(), detail=detail)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.elapsed = time.perf_counter() - start
+            self._add(record)
+
+    def records(self, since: float = 0.0) -> List[StageRecord]:
+        """Return the recorded stage runs that started at or after ``since``.
+
+        Args:
+            since: Unix time
+
+        Returns:
+            Records, oldest first
+        """
+        with self._lock:
+            return [record for record in self._history if record.started >= since]
+
+    def summary(self, since: float = 0.0) -> Dict[str, Dict[str, float]]:
+        """Aggregate the recorded runs per stage.
+
+        Args:
+            since: Only include runs that started at or after this Unix time
+
+        Returns:
+            Per stage, in order of first appearance: number of runs, total,
+            mean and maximum wall time in seconds, bytes and items
+        """
+        stages: Dict[str, Dict[str, float]] = {}
+        for record in self.records(since):
+            stats = stages.setdefault(
+                record.stage,
+                {"runs": 0, "total": 0.0, "max": 0.0, "bytes": 0, "items": 0},
+            )
+            stats["runs"] += 1
+            stats["total"] += record.elapsed
+            stats["max"] = max(stats["max"], record.elapsed)
+            stats["bytes"] += record.bytes
+            stats["items"] += record.items
+        for stats in stages.values():
+            stats["mean"] = stats["total"] / stats["runs"]
+        return stages
+
+    def clear(self) -> None:
+        """Forget all recorded runs."""
+        with self._lock:
+            self._history.clear()
+
+    def _add(self, record: StageRecord) -> None:
+        """Keep a finished record and append it to the log, if enabled."""
+        with self._lock:
+            self._history.append(record)
+            if self.log_path is None:
+                return
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(asdict(record)) + "\n")
+            except OSError as e:
+                print(f"Error writing timing log: {e}")
+
+    @staticmethod
+    @contextmanager
+    def capture(directory: str, name: str = "refresh") -> Iterator[None]:
+        """Profile a block with cProfile and tracemalloc.
+
+        This is opt-in and slows the block down noticeably. cProfile only
+        sees the calling thread; tracemalloc sees allocations of all
+        threads. Two files are written to ``directory``:
+        ``<name>-<time>.prof``, which can be opened with ``pstats`` or
+        snakeviz, and ``<name>-<time>.txt``, which has the top functions by
+        cumulative time and the top allocation sites.
+
+        Args:
+            directory: Directory the capture files are written to
+            name: Prefix of the capture file names
+        """
+        # Imported here: only needed when a capture is requested.
+        import cProfile
+        import pstats
+        import tracemalloc
+
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}")
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if not tracing:
+                tracemalloc.stop()
+
+            profiler.dump_stats(f"{base}.prof")
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(
+                30
+            )
+            report.write(
+                f"\ntracemalloc: {current / 1024:.0f} KiB current, "
+                f"{peak / 1024:.0f} KiB peak\n"
+            )
+            for stat in snapshot.statistics("lineno")[:20]:
+                report.write(f"{stat}\n")
+            with open(f"{base}.txt", "w", encoding="utf-8") as f:
+                f.write(report.getvalue())
+
+
+# Shared recorder of the refresh pipeline
+instrumentation = Instrumentation()
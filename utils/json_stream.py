@@ -0,0 +1,116 @@
+import json
+from typing import IO, Any, Iterator
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",]}:" + _WHITESPACE
+
+
+class _Reader:
+    """Buffered reader that decodes JSON values from a text stream."""
+
+    def __init__(self, fp: IO[str], chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text."""
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be ``char``."""
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode and consume the next complete JSON value."""
+        if self.peek() not in ('"', "[", "{"):
+            self._fill_scalar()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            self.pos = end
+            return value
+
+    def _fill_scalar(self) -> None:
+        """Read until the number or literal at ``pos`` is followed by a delimiter.
+
+        Otherwise a number cut at a chunk boundary, e.g. ``2.`` of ``2.5e3``,
+        would decode as its prefix.
+        """
+        scanned = 0  # Characters past ``pos`` known not to be delimiters
+        while True:
+            end = self.pos + scanned
+            while end < len(self.buffer) and self.buffer[end] not in _DELIMITERS:
+                end += 1
+            if end < len(self.buffer):
+                return
+            scanned = end - self.pos
+            if not self._fill():
+                return
+
+
+def iter_array_items(fp: IO[str], key: str, chunk_size: int = 64 * 1024) -> Iterator:
+    """Iterate over the items of a top-level array without loading the document.
+
+    Only one array item is decoded at a time, so memory use is bounded by
+    the largest item instead of the whole payload. Other top-level values
+    before the array are decoded and discarded; anything after it is not
+    read at all.
+
+    Args:
+        fp: Text stream holding a JSON object
+        key: Name of the top-level key whose array is iterated
+        chunk_size: Number of characters read from the stream at a time
+
+    Yields:
+        Decoded array items, in order
+
+    Raises:
+        ValueError: If the stream is not valid JSON
+    """
+    reader = _Reader(fp, chunk_size)
+    reader.expect("{")
+    while reader.peek() not in ("}", ""):
+        name = reader.value()
+        reader.expect(":")
+        if name != key:
+            reader.value()
+        else:
+            reader.expect("[")
+            if reader.peek() == "]":
+                return
+            while True:
+                yield reader.value()
+                if reader.peek() != ",":
+                    reader.expect("]")
+                    return
+                reader.pos += 1
+        if reader.peek() == ",":
+            reader.pos += 1
@@ -0,0 +1,45 @@
+import json
+import os
+from typing import Dict, List
+
+
+class LeagueCache:
+    """Last-known list of active leagues, kept on disk between launches.
+
+    The GUI shows this list immediately at startup while the live list is
+    fetched in the background. The module only depends on the standard
+    library so reading it does not pull in the networking or scoring code.
+    """
+
+    DEFAULT_PATH = "leagues.json"
+
+    @staticmethod
+    def load(path: str = DEFAULT_PATH) -> List[Dict]:
+        """Read the cached league list.
+
+        Returns:
+            Cached leagues, or an empty list if there is no usable cache
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                leagues = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if not isinstance(leagues, list):
+            return []
+        return [
+            league
+            for league in leagues
+            if isinstance(league, dict) and "name" in league
+        ]
+
+    @staticmethod
+    def save(leagues: List[Dict], path: str = DEFAULT_PATH) -> None:
+        """Replace the cached league list atomically."""
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(leagues, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error saving league cache: {e}")
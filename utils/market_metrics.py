@@ -0,0 +1,232 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from utils.reward_index import Reward
+from utils.unique_index import UniqueIndex
+
+SPARKLINE_DAYS = 7
+
+# (sparkline values, low confidence, listing count)
+MarketLine = Tuple[List[Optional[float]], bool, Optional[float]]
+
+
+class MarketColumns(NamedTuple):
+    """Market metrics of a list of items, one array entry per item.
+
+    Unknown values are NaN.
+    """
+
+    trend: np.ndarray  # price change over the sparkline window, in %
+    volatility: np.ndarray  # standard deviation of daily price changes, in %
+    listings: np.ndarray  # number of trade listings
+    low_confidence: np.ndarray  # poe.ninja had too few listings for a sparkline
+
+    @classmethod
+    def unknown(cls, size: int) -> "MarketColumns":
+        """Return columns for items without any market data."""
+        return cls(
+            np.full(size, np.nan),
+            np.full(size, np.nan),
+            np.full(size, np.nan),
+            np.zeros(size, dtype=bool),
+        )
+
+    @classmethod
+    def from_lines(cls, lines: List[Optional[MarketLine]]) -> "MarketColumns":
+        """Compute the metrics of items from their market lines.
+
+        Args:
+            lines: Result of ``MarketIndex.market_line`` per item, or None for
+                items without market data
+
+        Returns:
+            Metric columns in the order of ``lines``
+        """
+        series = np.full((len(lines), SPARKLINE_DAYS), np.nan)
+        listings = np.full(len(lines), np.nan)
+        low_confidence = np.zeros(len(lines), dtype=bool)
+        for i, line in enumerate(lines):
+            if line is None:
+                continue
+            data, low_confidence[i], listing_count = line
+            data = data[-SPARKLINE_DAYS:]
+            if data:
+                series[i, SPARKLINE_DAYS - len(data) :] = [
+                    np.nan if value is None else value for value in data
+                ]
+            if listing_count is not None:
+                listings[i] = listing_count
+        trend, volatility = cls.sparkline_metrics(series)
+        return cls(trend, volatility, listings, low_confidence)
+
+    @staticmethod
+    def sparkline_metrics(series: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Compute trend and volatility of sparklines.
+
+        poe.ninja sparklines hold, for each of the last days, the price change
+        in percent relative to the first day of the window.
+
+        Args:
+            series: Array of shape (items, days), NaN where a day is missing
+
+        Returns:
+            Tuple of (trend, volatility) arrays, NaN where there is no data
+        """
+        days = np.arange(series.shape[1])
+        last_day = np.where(np.isnan(series), -1, days).max(axis=1)
+        rows = np.arange(series.shape[0])
+        trend = np.where(last_day >= 0, series[rows, np.maximum(last_day, 0)], np.nan)
+
+        prices = 1 + series / 100
+        with np.errstate(divide="ignore", invalid="ignore"):
+            changes = prices[:, 1:] / prices[:, :-1] - 1
+        changes[~np.isfinite(changes)] = np.nan
+        known = ~np.isnan(changes)
+        count = known.sum(axis=1)
+        total = np.where(known, changes, 0).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = total / count
+            variance = (np.where(known, changes - mean[:, None], 0) ** 2).sum(
+                axis=1
+            ) / count
+        volatility = np.where(count > 0, np.sqrt(variance) * 100, np.nan)
+        return trend, volatility
+
+
+class MarketIndex:
+    """Market data of every priced item of a snapshot, keyed like rewards.
+
+    Lines are only indexed here; metrics are computed on demand for the
+    items that are actually needed. Unique rewards use the line their card
+    guarantees, see ``UniqueIndex``.
+    """
+
+    def __init__(self, lines: Dict[Tuple[str, str], Dict], uniques: UniqueIndex):
+        self.lines = lines
+        self.uniques = uniques
+
+    @classmethod
+    def build(
+        cls,
+        divination_data: Dict,
+        currency_data: Dict,
+        uniques: UniqueIndex,
+    ) -> "MarketIndex":
+        """Index the overview lines of a snapshot.
+
+        Args:
+            divination_data: Divination card overview
+            currency_data: Currency overview
+            uniques: Unique item lines of the snapshot
+
+        Returns:
+            New market index
+        """
+        lines: Dict[Tuple[str, str], Dict] = {}
+        for line in currency_data.get("lines", []):
+            lines[("Currency", line["currencyTypeName"])] = line
+        for line in divination_data.get("lines", []):
+            lines[("Divination", line["name"])] = line
+        return cls(lines, uniques)
+
+    def columns(self, rewards: List[Reward]) -> MarketColumns:
+        """Compute the market metrics of reward items."""
+        return MarketColumns.from_lines(
+            [self._market_line(reward) for reward in rewards]
+        )
+
+    def _market_line(self, reward: Reward) -> Optional[MarketLine]:
+        if reward.kind == "Unique":
+            line = self.uniques.line(reward)
+        else:
+            line = self.lines.get((reward.kind, reward.item))
+        return None if line is None else self.market_line(line, reward.kind)
+
+    @staticmethod
+    def market_line(line: Dict, kind: str) -> MarketLine:
+        """Extract the sparkline and listing count of an overview line.
+
+        Currency lines carry them as ``receiveSparkLine`` and
+        ``receive.listing_count``; item lines as ``sparkline`` and
+        ``listingCount``. When poe.ninja has too few listings the regular
+        sparkline is empty and only the low confidence one is filled.
+
+        Args:
+            line: Overview line
+            kind: "Currency" for currency overview lines
+
+        Returns:
+            Tuple of (sparkline values, low confidence, listing count)
+        """
+        if kind == "Currency":
+            sparkline = line.get("receiveSparkLine")
+            fallback = line.get("lowConfidenceReceiveSparkLine")
+            listings = (line.get("receive") or {}).get("listing_count")
+        else:
+            sparkline = line.get("sparkline")
+            fallback = line.get("lowConfidenceSparkline")
+            listings = line.get("listingCount")
+        data = (sparkline or {}).get("data") or []
+        if data:
+            return data, False, listings
+        data = (fallback or {}).get("data") or []
+        return data, bool(data), listings
+
+
+class RiskModel:
+    """Discounts set profits for price volatility and thin markets.
+
+    The set cost is raised and the reward price lowered by one daily
+    standard deviation of their price changes. A positive result is then
+    scaled by how easily both sides trade: with ``listings`` on the market
+    and ``needed`` items to trade, the factor is
+    ``listings / (listings + needed)``, halved again for low confidence
+    prices. Unknown metrics leave the profit unchanged.
+    """
+
+    REWARD_LISTINGS_NEEDED = 5
+    LOW_CONFIDENCE_FACTOR = 0.5
+
+    @classmethod
+    def adjust(
+        cls,
+        total: np.ndarray,
+        sell_price: np.ndarray,
+        stack: np.ndarray,
+        card: MarketColumns,
+        reward: MarketColumns,
+    ) -> np.ndarray:
+        """Compute risk-adjusted set profits.
+
+        Args:
+            total: Cost of a full set
+            sell_price: Price of the reward
+            stack: Cards per set
+            card: Market metrics of the cards
+            reward: Market metrics of the rewards, per card
+
+        Returns:
+            Risk-adjusted profit per card set
+        """
+        cost = total * (1 + np.nan_to_num(card.volatility) / 100)
+        proceeds = sell_price * np.clip(
+            1 - np.nan_to_num(reward.volatility) / 100, 0, None
+        )
+        profit = proceeds - cost
+        depth = np.minimum(
+            cls.depth_factor(card.listings, stack, card.low_confidence),
+            cls.depth_factor(
+                reward.listings, cls.REWARD_LISTINGS_NEEDED, reward.low_confidence
+            ),
+        )
+        return np.where(profit > 0, profit * depth, profit)
+
+    @classmethod
+    def depth_factor(
+        cls, listings: np.ndarray, needed, low_confidence: np.ndarray
+    ) -> np.ndarray:
+        """Return a 0..1 factor for how easily ``needed`` items can be traded."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factor = np.where(np.isnan(listings), 1.0, listings / (listings + needed))
+        return np.where(low_confidence, factor * cls.LOW_CONFIDENCE_FACTOR, factor)
@@ -0,0 +1,77 @@
+from typing import Dict, Optional
+
+from utils.reward_index import Reward
+from utils.unique_index import UniqueIndex
+
+
+class PriceIndex:
+    """Name to chaos price lookups built once per snapshot.
+
+    poe.ninja lists currency by ``currencyTypeName`` with a
+    ``chaosEquivalent`` and items by ``name`` with a ``chaosValue``; this
+    index flattens both into plain dictionaries so every reward resolves with
+    a single lookup. Unique rewards resolve through a ``UniqueIndex``, which
+    tells apart the lines sharing an item name.
+
+    Card rewards resolve to ``card_values`` when it is set, the best
+    realizable value of one card through its own reward chain (see
+    ``RewardGraph``), and to the card's market price otherwise.
+    """
+
+    DIVINE_ORB = "Divine Orb"
+    CHAOS_ORB = "Chaos Orb"
+
+    def __init__(
+        self,
+        currency: Dict[str, float],
+        cards: Dict[str, float],
+        uniques: UniqueIndex,
+        card_values: Optional[Dict[str, float]] = None,
+    ):
+        self.currency = currency
+        self.cards = cards
+        self.uniques = uniques
+        self.card_values = card_values
+
+    @classmethod
+    def build(
+        cls, divination_data: Dict, currency_data: Dict, unique_items: UniqueIndex
+    ) -> "PriceIndex":
+        """Build the index from parsed snapshots.
+
+        Args:
+            divination_data: Divination card overview
+            currency_data: Currency overview
+            unique_items: Unique item lines of the snapshot
+
+        Returns:
+            New price index
+        """
+        currency = {cls.CHAOS_ORB: 1.0}
+        for line in currency_data.get("lines", []):
+            currency[line["currencyTypeName"]] = line.get("chaosEquivalent", 0)
+
+        cards = {
+            line["name"]: line.get("chaosValue", 0)
+            for line in divination_data.get("lines", [])
+        }
+        return cls(currency, cards, unique_items)
+
+    def with_card_values(self, card_values: Dict[str, float]) -> "PriceIndex":
+        """Return a copy whose card rewards resolve to ``card_values``."""
+        return PriceIndex(self.currency, self.cards, self.uniques, card_values)
+
+    @property
+    def divine_value(self) -> Optional[float]:
+        """Chaos price of a Divine Orb, or None if it is not listed."""
+        return self.currency.get(self.DIVINE_ORB)
+
+    def reward_price(self, reward: Reward) -> float:
+        """Return the chaos value of a full-set reward."""
+        if reward.kind == "Currency":
+            return self.currency.get(reward.item, 0) * reward.quantity
+        if reward.kind == "Unique":
+            return self.uniques.price(reward)
+        if self.card_values is not None:
+            return self.card_values.get(reward.item, 0)
+        return self.cards.get(reward.item, 0)
@@ -0,0 +1,215 @@
+import email.utils
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs, quote, urlsplit
+from urllib.request import url2pathname
+
+from utils.http_client import HttpClient, HttpResponse, RequestStats
+
+
+class PriceSource:
+    """Where the overviews, the league list and the latest version come from.
+
+    A source only builds URLs and answers requests for them with an
+    ``HttpResponse``; caching, conditional requests and parsing are left to
+    ``PoeNinja`` and ``Utils``, so every source goes through the same path.
+    Overview URLs carry ``league`` and ``type`` query parameters, which
+    ``Utils.get_item_name`` reads.
+    """
+
+    def overview_url(self, endpoint: str, league_name: str, item_type: str) -> str:
+        """Return the URL of an overview.
+
+        Args:
+            endpoint: poe.ninja endpoint, "currencyoverview" or "itemoverview"
+            league_name: Name of the league
+            item_type: Type of items, e.g. "Currency" or "UniqueMap"
+        """
+        raise NotImplementedError
+
+    @property
+    def leagues_url(self) -> str:
+        """URL of the league list, shaped like the PoE API response."""
+        raise NotImplementedError
+
+    @property
+    def version_url(self) -> str:
+        """URL of the latest ``__version__.py``."""
+        raise NotImplementedError
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        """Fetch a URL of this source.
+
+        Args:
+            url: URL built by this source
+            headers: Extra request headers, e.g. conditional request headers
+
+        Returns:
+            Response; 304 Not Modified is returned rather than raised
+
+        Raises:
+            OSError: If the URL cannot be fetched (``URLError`` is one)
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def from_spec(spec: str, client: HttpClient) -> "PriceSource":
+        """Create a source from a command line value.
+
+        Args:
+            spec: "http://..." or "https://..." for a poe.ninja compatible
+                server, anything else for a directory of recorded snapshots
+            client: HTTP client used by URL sources
+
+        Returns:
+            New price source
+        """
+        if spec.startswith(("http://", "https://")):
+            return HttpSource(client, spec)
+        return DirectorySource(spec)
+
+
+class HttpSource(PriceSource):
+    """poe.ninja or any server exposing the same API.
+
+    With the default URLs this is live poe.ninja, the PoE API and GitHub. A
+    different ``base_url`` points the overviews at a mirror or a local
+    stand-in such as ``benchmarks.mock_server``.
+    """
+
+    NINJA_URL = "https://poe.ninja/api/data/"
+    LEAGUES_URL = "https://api.pathofexile.com/leagues?type=main"
+    VERSION_URL = "https://raw.githubusercontent.com/ezbooz/Path-of-Exile-divination-cards-flipper-POE/main/__version__.py"
+
+    def __init__(
+        self,
+        client: HttpClient,
+        base_url: str = NINJA_URL,
+        leagues_url: str = LEAGUES_URL,
+        version_url: str = VERSION_URL,
+    ):
+        """Initialize the source.
+
+        Args:
+            client: Client sending the requests
+            base_url: URL the overview endpoint names are appended to
+            leagues_url: URL of the league list
+            version_url: URL of the latest ``__version__.py``
+        """
+        self.client = client
+        self.base_url = base_url if base_url.endswith("/") else f"{base_url}/"
+        self._leagues_url = leagues_url
+        self._version_url = version_url
+
+    def overview_url(self, endpoint: str, league_name: str, item_type: str) -> str:
+        return f"{self.base_url}{endpoint}?league={league_name}&type={item_type}"
+
+    @property
+    def leagues_url(self) -> str:
+        return self._leagues_url
+
+    @property
+    def version_url(self) -> str:
+        return self._version_url
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        return self.client.get(url, headers)
+
+
+class DirectorySource(PriceSource):
+    """Replays snapshots recorded to a local directory.
+
+    Overviews are read from ``root/Data`` and ``root/Uniquedata``, either
+    from the per-league subdirectory that the app saves to (see
+    ``Utils.league_directory``) or, failing that, from the directories
+    themselves, as ``benchmarks.record_fixtures`` writes them. A copy of
+    the app's data directories therefore replays its last snapshots, and a
+    recording replays for any league. ``root/leagues.json`` and
+    ``root/__version__.py`` answer the league and version requests.
+
+    Files are served with an ``ETag`` derived from their size and
+    modification time, so unchanged files revalidate with 304 Not Modified
+    like a server answer.
+    """
+
+    def __init__(self, root: str):
+        """Initialize the source.
+
+        Args:
+            root: Directory holding ``Data`` and ``Uniquedata``
+        """
+        self.root = os.path.abspath(root)
+
+    def overview_url(self, endpoint: str, league_name: str, item_type: str) -> str:
+        return (
+            f"{self._url('')}{endpoint}"
+            f"?league={quote(league_name)}&type={quote(item_type)}"
+        )
+
+    @property
+    def leagues_url(self) -> str:
+        return self._url("leagues.json")
+
+    @property
+    def version_url(self) -> str:
+        return self._url("__version__.py")
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        start = time.perf_counter()
+        path = self._file_path(url)
+        stat = os.stat(path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        response_headers = {
+            "etag": etag,
+            "last-modified": email.utils.formatdate(stat.st_mtime, usegmt=True),
+        }
+        if (headers or {}).get("If-None-Match") == etag:
+            status, body = 304, b""
+        else:
+            status = 200
+            with open(path, "rb") as f:
+                body = f.read()
+        stats = RequestStats(
+            url=url,
+            status=status,
+            wire_bytes=len(body),
+            body_bytes=len(body),
+            elapsed=time.perf_counter() - start,
+            encoding="identity",
+            reused_connection=False,
+        )
+        return HttpResponse(url, status, response_headers, body, stats)
+
+    def _url(self, name: str) -> str:
+        """Return the file URL of a path below the root."""
+        return f"{Path(self.root).as_uri()}/{name}"
+
+    def _file_path(self, url: str) -> str:
+        """Map a URL of this source to the file answering it.
+
+        Raises:
+            FileNotFoundError: If no recorded file matches the URL
+        """
+        parts = urlsplit(url)
+        path = url2pathname(parts.path)
+        if not parts.query:
+            return path
+        query = parse_qs(parts.query)
+        league_name, item_type = query["league"][0], query["type"][0]
+        directory = "Uniquedata" if item_type.startswith("Unique") else "Data"
+
+        # Imported here, as Utils imports this module
+        from utils.utils import Utils
+
+        candidates = [
+            os.path.join(
+                self.root, Utils.league_directory(directory, league_name), item_type
+            ),
+            os.path.join(self.root, directory, item_type),
+        ]
+        for candidate in candidates:
+            if os.path.isfile(f"{candidate}.json"):
+                return f"{candidate}.json"
+        raise FileNotFoundError(f"No recorded {item_type} overview in {self.root}")
@@ -0,0 +1,220 @@
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.price_index import PriceIndex
+from utils.reward_index import RewardIndex
+
+
+class RewardGraph:
+    """Best realizable value of every divination card through its reward chain.
+
+    A card's reward can itself be a divination card, whose reward can be
+    another card, and so on. One card is worth the more of selling it and
+    its share of turning in a full set, ``set reward value / stack size``,
+    where the set reward is valued the same way if it is a card. Each card
+    has a single reward, so the cards form chains that end in a non-card
+    reward or in a cycle.
+
+    Values are memoized per card and evaluated chain ends first, so a full
+    evaluation visits each card once. A card on a reward cycle values the
+    card it rewards at its market price, which ends the cycle. ``update``
+    recomputes only the cards whose prices changed and the cards whose
+    chains lead to them, and stops wherever a value comes out unchanged.
+    """
+
+    def __init__(self, stacks: Dict[str, float], reward_index: RewardIndex):
+        """Link the cards of a snapshot by their rewards.
+
+        Args:
+            stacks: Stack size per card
+            reward_index: Parsed rewards of the snapshot
+        """
+        self.stacks = stacks
+        self.rewards = {
+            card: reward
+            for card in stacks
+            if (reward := reward_index.get(card)) is not None
+        }
+        self.values: Dict[str, float] = {}  # card -> value of one card
+        self.turn_in: Set[str] = set()  # cards worth more turned in than sold
+        self._prices: Dict[str, float] = {}  # card -> market price
+        self._set_rewards: Dict[str, float] = {}  # card -> non-card reward value
+
+        self.order, self.cyclic = self._evaluation_order()
+        self._rank = {card: rank for rank, card in enumerate(self.order)}
+        # reward card -> cards whose value depends on its value or price
+        self._dependents: Dict[str, List[str]] = {}
+        for card in self.rewards:
+            target = self._target(card)
+            if target is not None:
+                self._dependents.setdefault(target, []).append(card)
+
+    @classmethod
+    def build(cls, divination_data: Dict, reward_index: RewardIndex) -> "RewardGraph":
+        """Build the graph of a divination snapshot.
+
+        Args:
+            divination_data: Divination card overview
+            reward_index: Parsed rewards of the snapshot
+
+        Returns:
+            New, not yet evaluated graph
+        """
+        return cls(
+            {
+                line["name"]: line.get("stackSize", 1)
+                for line in divination_data.get("lines", [])
+            },
+            reward_index,
+        )
+
+    def __len__(self) -> int:
+        return len(self.stacks)
+
+    def evaluate(self, price_index: PriceIndex) -> Dict[str, float]:
+        """Value every card from scratch.
+
+        Args:
+            price_index: Market prices of the snapshot
+
+        Returns:
+            Best realizable value of one card, per card
+        """
+        self._prices = {card: price_index.cards.get(card, 0) for card in self.stacks}
+        self._set_rewards = self._set_rewards_of(price_index)
+        self.turn_in = set()
+        for card in self.order:
+            self.values[card] = self._value(card)
+        return self.values
+
+    def update(
+        self,
+        card_prices: Optional[Dict[str, float]] = None,
+        set_rewards: Optional[Dict[str, float]] = None,
+    ) -> Set[str]:
+        """Apply price changes and revalue only the cards they affect.
+
+        Args:
+            card_prices: New market price per card
+            set_rewards: New value of the non-card set reward, per card
+
+        Returns:
+            Cards whose value changed
+        """
+        queue: List[Tuple[int, str]] = []
+        queued: Set[str] = set()
+
+        def push(card: str) -> None:
+            if card not in queued:
+                queued.add(card)
+                heapq.heappush(queue, (self._rank[card], card))
+
+        for card, price in (card_prices or {}).items():
+            if card in self.stacks and self._prices.get(card) != price:
+                self._prices[card] = price
+                push(card)
+                # Cards on a cycle value this card at its market price.
+                for dependent in self._dependents.get(card, ()):
+                    if dependent in self.cyclic:
+                        push(dependent)
+        for card, value in (set_rewards or {}).items():
+            if card in self._set_rewards and self._set_rewards[card] != value:
+                self._set_rewards[card] = value
+                push(card)
+
+        # Reward cards rank before the cards rewarding them, so every card
+        # is revalued after all the changes below it in its chain.
+        changed = set()
+        while queue:
+            _, card = heapq.heappop(queue)
+            value = self._value(card)
+            if value == self.values.get(card):
+                continue
+            self.values[card] = value
+            changed.add(card)
+            for dependent in self._dependents.get(card, ()):
+                if dependent not in self.cyclic:
+                    push(dependent)
+        return changed
+
+    def update_from(self, price_index: PriceIndex) -> Set[str]:
+        """Revalue the cards affected by the changes in a new snapshot.
+
+        Returns:
+            Cards whose value changed
+        """
+        card_prices = {
+            card: price
+            for card in self.stacks
+            if (price := price_index.cards.get(card, 0)) != self._prices.get(card)
+        }
+        set_rewards = {
+            card: value
+            for card, value in self._set_rewards_of(price_index).items()
+            if value != self._set_rewards.get(card)
+        }
+        return self.update(card_prices, set_rewards)
+
+    def _target(self, card: str) -> Optional[str]:
+        """Return the card that a set of ``card`` rewards, if it is listed."""
+        reward = self.rewards.get(card)
+        if reward is None or reward.kind != "Divination":
+            return None
+        return reward.item if reward.item in self.stacks else None
+
+    def _set_rewards_of(self, price_index: PriceIndex) -> Dict[str, float]:
+        """Value the set rewards that are not listed cards."""
+        return {
+            card: price_index.reward_price(reward)
+            for card, reward in self.rewards.items()
+            if self._target(card) is None
+        }
+
+    def _value(self, card: str) -> float:
+        """Value one card from the values of its reward chain."""
+        price = self._prices.get(card, 0)
+        reward = self.rewards.get(card)
+        if reward is None:
+            self.turn_in.discard(card)
+            return price
+        target = self._target(card)
+        if target is None:
+            set_value = self._set_rewards[card]
+        elif card in self.cyclic:
+            set_value = self._prices.get(target, 0) * reward.quantity
+        else:
+            set_value = self.values[target] * reward.quantity
+        share = set_value / self.stacks[card]
+        if share > price:
+            self.turn_in.add(card)
+            return share
+        self.turn_in.discard(card)
+        return price
+
+    def _evaluation_order(self) -> Tuple[List[str], Set[str]]:
+        """Order the cards so every reward card comes before its rewarders.
+
+        Each card has at most one reward card, so following rewards from
+        any card either ends or runs into a cycle. Every card is walked
+        once.
+
+        Returns:
+            Tuple of (cards in evaluation order, cards on a reward cycle)
+        """
+        order: List[str] = []
+        done: Set[str] = set()
+        cyclic: Set[str] = set()
+        for start in self.stacks:
+            path: List[str] = []
+            on_path: Dict[str, int] = {}
+            card = start
+            while card is not None and card not in done and card not in on_path:
+                on_path[card] = len(path)
+                path.append(card)
+                card = self._target(card)
+            if card is not None and card in on_path:
+                cyclic.update(path[on_path[card] :])
+            for card in reversed(path):
+                order.append(card)
+                done.add(card)
+        return order, cyclic
@@ -0,0 +1,160 @@
+import re
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class Reward(NamedTuple):
+    """Reward of a full divination card set.
+
+    ``links``, ``corrupted`` and ``details`` describe what the card
+    guarantees about a unique reward, see ``UniqueIndex``.
+    """
+
+    kind: str
+    item: str
+    quantity: float
+    links: int = 0
+    corrupted: bool = False
+    details: Tuple[str, ...] = ()
+
+
+class RewardIndex:
+    """Card name to reward mapping parsed once per divination snapshot.
+
+    Card rewards only change with game patches, so the index is rebuilt only
+    when the reward texts of a snapshot differ from the previous one.
+    """
+
+    REWARD_PATTERN = re.compile("<(.*)>{(.*)}")
+    TAG_PATTERN = re.compile("<([^<>]*)>{([^{}]*)}")
+    LINKS_PATTERN = re.compile(r"\b(five|six|5|6)[- ]?link", re.IGNORECASE)
+    LINK_COUNTS = {"five": 5, "six": 6, "5": 5, "6": 6}
+
+    def __init__(self, rewards: Dict[str, Reward], fingerprint: int):
+        self.rewards = rewards
+        self.fingerprint = fingerprint
+
+    def __len__(self) -> int:
+        return len(self.rewards)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.rewards)
+
+    def get(self, card_name: str) -> Optional[Reward]:
+        """Return the reward of a card, or None if it has no priced reward."""
+        return self.rewards.get(card_name)
+
+    @classmethod
+    def build(
+        cls,
+        divination_data: Dict,
+        resolve_name: Optional[Callable[[str, str], str]] = None,
+    ) -> "RewardIndex":
+        """Parse the rewards of every card in a divination snapshot.
+
+        Args:
+            divination_data: Divination card overview from poe.ninja
+            resolve_name: Called with (card name, reward item) to map reward
+                names that differ from the poe.ninja item names
+
+        Returns:
+            New reward index
+        """
+        rewards = {}
+        for line in divination_data.get("lines", []):
+            reward = cls.parse_reward(
+                line["name"], line.get("explicitModifiers", []), resolve_name
+            )
+            if reward is not None:
+                rewards[line["name"]] = reward
+        return cls(rewards, cls.fingerprint_of(divination_data))
+
+    @staticmethod
+    def fingerprint_of(divination_data: Dict) -> int:
+        """Hash the card names and reward texts of a divination snapshot."""
+        return hash(
+            tuple(
+                (
+                    line["name"],
+                    tuple(m["text"] for m in line.get("explicitModifiers", [])),
+                )
+                for line in divination_data.get("lines", [])
+            )
+        )
+
+    @classmethod
+    def parse_reward(
+        cls,
+        card_name: str,
+        explicit_modifiers: List[Dict],
+        resolve_name: Optional[Callable[[str, str], str]] = None,
+    ) -> Optional[Reward]:
+        """Parse the reward of a single card from its modifier text.
+
+        Args:
+            card_name: Name of the divination card
+            explicit_modifiers: Card modifiers from poe.ninja
+            resolve_name: Optional reward name mapping, see ``build``
+
+        Returns:
+            Parsed reward, or None if the text does not describe one
+        """
+        if not explicit_modifiers:
+            return None
+        match = cls.REWARD_PATTERN.match(explicit_modifiers[0]["text"])
+        if not match:
+            return None
+
+        tag, content = match.group(1), match.group(2)
+        if tag == "currencyitem":
+            kind = "Currency"
+            parts = content.split("x ", 1)
+            if len(parts) == 1:
+                parts.insert(0, "1")
+            try:
+                quantity = float(parts[0])
+            except ValueError:
+                return None
+            item = parts[1]
+        else:
+            kind = "Unique" if tag == "uniqueitem" else "Divination"
+            quantity = 1.0
+            item = content
+
+        if resolve_name is not None:
+            item = resolve_name(card_name, item)
+        if kind != "Unique":
+            return Reward(kind, item, quantity)
+        return Reward(kind, item, quantity, *cls.parse_guarantees(explicit_modifiers))
+
+    @classmethod
+    def parse_guarantees(
+        cls, explicit_modifiers: List[Dict]
+    ) -> Tuple[int, bool, Tuple[str, ...]]:
+        """Parse what a card guarantees about its unique reward.
+
+        Every ``<tag>{content}`` after the reward itself is read, in all
+        modifiers: a ``corrupted`` tag, a five or six link count, and any
+        other text, which can name a variant or base type.
+
+        Args:
+            explicit_modifiers: Card modifiers from poe.ninja
+
+        Returns:
+            Tuple of (links, corrupted, other texts)
+        """
+        links, corrupted, details = 0, False, []
+        tags = [
+            match
+            for modifier in explicit_modifiers
+            for match in cls.TAG_PATTERN.findall(modifier.get("text", ""))
+        ]
+        for tag, content in tags[1:]:
+            content = content.strip()
+            link_match = cls.LINKS_PATTERN.search(content)
+            if tag == "corrupted" or content.casefold() == "corrupted":
+                corrupted = True
+            elif link_match:
+                links = cls.LINK_COUNTS[link_match.group(1).lower()]
+            elif content:
+                details.append(content)
+        return links, corrupted, tuple(details)
@@ -0,0 +1,126 @@
+import struct
+import threading
+from concurrent.futures import CancelledError
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote, urljoin
+
+from utils.http_client import HttpClient
+from utils.instrumentation import instrumentation
+from utils.price_index import PriceIndex
+from utils.price_source import HttpSource
+from utils.score_payload import ScorePayload
+from utils.scoring import ScoredCards
+from utils.unique_index import UniqueIndex
+
+
+class ScoreClient:
+    """Reads scored leagues from a ``ScoreServer`` instead of poe.ninja.
+
+    A refresh is one conditional request per league. An unchanged league is
+    answered with 304 Not Modified and its previous result is reused, so
+    ``updated_leagues``, ``received_new_data`` and ``errors`` mean the same
+    as on ``PoeNinja``.
+    """
+
+    def __init__(self, url: str, client: HttpClient, binary: bool = True):
+        """Initialize the client.
+
+        Args:
+            url: Base URL of the server, e.g. "http://127.0.0.1:8766/"
+            client: Client sending the requests
+            binary: Request the binary payload instead of JSON
+        """
+        self.url = url if url.endswith("/") else f"{url}/"
+        self.client = client
+        self.binary = binary
+        self.errors: Dict[str, Exception] = {}
+        self.updated_leagues: Set[str] = set()
+        # league -> (ETag, result)
+        self._results: Dict[str, Tuple[str, Tuple[ScoredCards, PriceIndex]]] = {}
+
+    @property
+    def received_new_data(self) -> bool:
+        """Whether the last refresh received any changed result."""
+        return bool(self.updated_leagues)
+
+    def price_source(self) -> HttpSource:
+        """Return a price source whose league list is the served leagues."""
+        return HttpSource(self.client, leagues_url=urljoin(self.url, "leagues"))
+
+    def get_leagues(
+        self,
+        league_names: List[str],
+        progress: Optional[Callable[[int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Dict[str, Tuple[ScoredCards, PriceIndex]]:
+        """Fetch the scored cards of several leagues.
+
+        Leagues that fail are left out of the result and recorded in
+        ``errors``.
+
+        Args:
+            league_names: Leagues to fetch
+            progress: Called with (finished leagues, total leagues)
+            cancel_event: When set, the remaining leagues are dropped and
+                CancelledError is raised
+
+        Returns:
+            (scored cards, price index holding the snapshot's currency
+            prices) per league
+
+        Raises:
+            CancelledError: If ``cancel_event`` was set during the fetch
+        """
+        errors: Dict[str, Exception] = {}
+        updated: Set[str] = set()
+        results = {}
+        for done, league_name in enumerate(league_names, start=1):
+            url = self._scores_url(league_name)
+            try:
+                results[league_name], is_new = self._fetch(url, league_name)
+            except (OSError, ValueError, KeyError, struct.error) as e:
+                errors[url] = e
+            else:
+                if is_new:
+                    updated.add(league_name)
+            if progress is not None:
+                progress(done, len(league_names))
+            if cancel_event is not None and cancel_event.is_set():
+                raise CancelledError()
+        self.errors = errors
+        self.updated_leagues = updated
+        return results
+
+    def _scores_url(self, league_name: str) -> str:
+        url = urljoin(self.url, f"scores?league={quote(league_name)}")
+        return f"{url}&format=bin" if self.binary else url
+
+    def _fetch(
+        self, url: str, league_name: str
+    ) -> Tuple[Tuple[ScoredCards, PriceIndex], bool]:
+        """Fetch one league, reusing the previous result on 304.
+
+        Returns:
+            Tuple of ((scored cards, price index), whether it changed)
+        """
+        etag, result = self._results.get(league_name, (None, None))
+        with instrumentation.stage("network", url) as record:
+            response = self.client.get(
+                url, headers={"If-None-Match": etag} if etag else None
+            )
+            record.bytes = response.stats.wire_bytes
+        if response.status == 304 and result is not None:
+            return result, False
+
+        with instrumentation.stage("parse", url) as record:
+            payload = ScorePayload.decode(
+                response.body, response.headers.get("content-type", "")
+            )
+            result = (
+                payload.to_scored(),
+                PriceIndex(payload.meta["currency"], {}, UniqueIndex({})),
+            )
+            record.bytes = len(response.body)
+            record.items = len(result[0])
+        self._results[league_name] = (response.headers.get("etag"), result)
+        return result, True
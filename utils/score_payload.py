@@ -0,0 +1,187 @@
+import hashlib
+import json
+import struct
+from typing import Dict, List
+
+import numpy as np
+
+from utils.market_metrics import MarketColumns
+from utils.scoring import ScoredCards
+
+
+class ScorePayload:
+    """Scored cards of one league, encoded for ``ScoreServer`` clients.
+
+    Only the input columns of ``ScoredCards`` are sent, along with the
+    currency prices of the snapshot; profits, returns and the risk
+    adjustment are derived again by the client, so both ends always agree.
+
+    Two encodings carry the same content:
+
+    * JSON: one object with ``meta`` and a ``columns`` object of arrays,
+      unknown values as null.
+    * Binary: like ``SnapshotFile``, a fixed header (magic, format version,
+      metadata length), a JSON metadata block, then the raw column buffers,
+      each aligned to 8 bytes. Numeric columns are little-endian arrays
+      read as zero-copy NumPy views; string columns are NUL-separated UTF-8.
+    """
+
+    MAGIC = b"PDCR"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHxxI")
+    ALIGNMENT = 8
+    JSON_TYPE = "application/json"
+    BINARY_TYPE = "application/octet-stream"
+
+    # field -> dtype
+    COLUMNS = {
+        "names": "str",
+        "kinds": "str",
+        "cost": "<f8",
+        "stack": "<f8",
+        "sell_price": "<f8",
+        **{
+            f"{side}_{field}": "|b1" if field == "low_confidence" else "<f8"
+            for side in ("card", "reward")
+            for field in MarketColumns._fields
+        },
+    }
+
+    def __init__(self, meta: Dict, columns: Dict[str, object]):
+        """Wrap decoded or to-be-encoded content.
+
+        Args:
+            meta: League and ``currency`` prices
+            columns: Array (or string list) per ``COLUMNS`` field
+        """
+        self.meta = meta
+        self.columns = columns
+
+    @classmethod
+    def from_scored(
+        cls, scored: ScoredCards, currency: Dict[str, float], **meta
+    ) -> "ScorePayload":
+        """Collect the columns of a scoring result.
+
+        Args:
+            scored: Scored cards of the league
+            currency: Chaos price per currency item of the snapshot
+            **meta: Extra metadata, e.g. the league
+
+        Returns:
+            New payload
+        """
+        columns = {
+            "names": scored.names,
+            "kinds": scored.kinds,
+            "cost": scored.cost,
+            "stack": scored.stack,
+            "sell_price": scored.sell_price,
+        }
+        for side, market in (
+            ("card", scored.card_market),
+            ("reward", scored.reward_market),
+        ):
+            for field in MarketColumns._fields:
+                columns[f"{side}_{field}"] = getattr(market, field)
+        return cls(dict(meta, currency=currency, rows=len(scored)), columns)
+
+    def to_scored(self) -> ScoredCards:
+        """Rebuild the scoring result."""
+        markets = {
+            side: MarketColumns(
+                *(
+                    np.asarray(
+                        self.columns[f"{side}_{field}"],
+                        dtype=bool if field == "low_confidence" else np.float64,
+                    )
+                    for field in MarketColumns._fields
+                )
+            )
+            for side in ("card", "reward")
+        }
+        return ScoredCards(
+            list(self.columns["names"]),
+            list(self.columns["kinds"]),
+            np.asarray(self.columns["cost"], dtype=np.float64),
+            np.asarray(self.columns["stack"], dtype=np.float64),
+            np.asarray(self.columns["sell_price"], dtype=np.float64),
+            markets["card"],
+            markets["reward"],
+        )
+
+    def encode_json(self) -> bytes:
+        """Encode as compact JSON."""
+        columns = {}
+        for field, dtype in self.COLUMNS.items():
+            values = self.columns[field]
+            if dtype != "str":
+                values = [
+                    None if value != value else value
+                    for value in np.asarray(values).tolist()
+                ]
+            columns[field] = values
+        return json.dumps(
+            {"meta": self.meta, "columns": columns},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    def encode_binary(self) -> bytes:
+        """Encode as header, metadata and column buffers."""
+        chunks: List[bytes] = []
+        layout = {}
+        offset = 0
+        for field, dtype in self.COLUMNS.items():
+            values = self.columns[field]
+            if dtype == "str":
+                data = "\0".join(values).encode("utf-8")
+            else:
+                data = np.asarray(values, dtype=dtype).tobytes()
+            layout[field] = {"dtype": dtype, "offset": offset, "length": len(data)}
+            padding = -len(data) % self.ALIGNMENT
+            chunks.append(data + b"\0" * padding)
+            offset += len(data) + padding
+
+        metadata = json.dumps(dict(self.meta, columns=layout)).encode("utf-8")
+        metadata += b" " * (-(self.HEADER.size + len(metadata)) % self.ALIGNMENT)
+        return b"".join(
+            [self.HEADER.pack(self.MAGIC, self.VERSION, len(metadata)), metadata]
+            + chunks
+        )
+
+    @classmethod
+    def decode(cls, body: bytes, content_type: str) -> "ScorePayload":
+        """Decode a response body of either encoding.
+
+        Raises:
+            ValueError: If the body is not a payload of this version
+        """
+        if not content_type.startswith(cls.BINARY_TYPE):
+            document = json.loads(body)
+            return cls(document["meta"], document["columns"])
+
+        magic, version, metadata_length = cls.HEADER.unpack_from(body, 0)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a score payload")
+        if version != cls.VERSION:
+            raise ValueError(f"Unsupported score payload version {version}")
+        data_start = cls.HEADER.size + metadata_length
+        meta = json.loads(body[cls.HEADER.size : data_start])
+        layout = meta.pop("columns")
+        columns: Dict[str, object] = {}
+        for field, column in layout.items():
+            start = data_start + column["offset"]
+            if column["dtype"] == "str":
+                data = body[start : start + column["length"]].decode("utf-8")
+                columns[field] = data.split("\0") if meta["rows"] else []
+            else:
+                columns[field] = np.frombuffer(
+                    body, dtype=column["dtype"], count=meta["rows"], offset=start
+                )
+        return cls(meta, columns)
+
+    @staticmethod
+    def etag(body: bytes) -> str:
+        """Return a strong validator for an encoded body."""
+        return f'"{hashlib.sha1(body).hexdigest()}"'
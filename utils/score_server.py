@@ -0,0 +1,308 @@
+import email.utils
+import gzip
+import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from utils.instrumentation import instrumentation
+from utils.price_index import PriceIndex
+from utils.score_payload import ScorePayload
+from utils.utils import Utils
+
+if TYPE_CHECKING:
+    from poeNinja.ninjaAPI import PoeNinja
+    from utils.history_store import HistoryStore
+
+# (body, ETag, gzip-compressed body or None)
+Encoded = Tuple[bytes, str, Optional[bytes]]
+
+
+class ScoreServer:
+    """Fetches and scores leagues on a schedule and serves the results locally.
+
+    One process does the poe.ninja traffic and the scoring for any number
+    of tool instances, which read the scored leagues with a single small
+    request each (see ``ScoreClient``). Upstream traffic then grows with the
+    number of leagues, not the number of users.
+
+    Routes:
+        ``/leagues``: the served leagues, shaped like the PoE API response,
+        so it can stand in as a ``PriceSource`` league list.
+        ``/scores?league=NAME[&format=json|bin]``: the scored cards of a
+        league as a ``ScorePayload``. Bodies carry an ``ETag`` that depends
+        on the scores only, so it stays the same across refreshes that change
+        nothing, and a ``Last-Modified`` time of the last change. They answer
+        ``If-None-Match`` with 304 Not Modified, and JSON is gzip-compressed
+        when the client accepts it. Until the first refresh of a league
+        finishes the answer is 503 with ``Retry-After``.
+    """
+
+    DEFAULT_PORT = 8766
+    DEFAULT_INTERVAL = 300.0
+    RETRY_AFTER = 5
+
+    def __init__(
+        self,
+        poe_ninja: "PoeNinja",
+        league_names: Optional[List[str]] = None,
+        interval: float = DEFAULT_INTERVAL,
+        history: Optional["HistoryStore"] = None,
+    ):
+        """Prepare the server; nothing is fetched before ``start``.
+
+        Args:
+            poe_ninja: Client the snapshots are fetched with
+            league_names: Leagues to serve; every active league when omitted
+            interval: Seconds between two refreshes
+            history: Store that newly downloaded results are appended to
+        """
+        self.poe_ninja = poe_ninja
+        self.league_names = league_names
+        self.interval = interval
+        self.history = history
+        self.leagues: List[Dict] = []
+        self.refreshed_at: Optional[float] = None
+        self.next_refresh = 0.0
+        self._utils: Dict[str, Utils] = {}
+        # league -> content type -> (body, ETag, gzipped body)
+        self._payloads: Dict[str, Dict[str, Encoded]] = {}
+        # league -> Unix time its scores last changed
+        self._modified: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self, port: int = DEFAULT_PORT, host: str = "127.0.0.1") -> "ScoreServer":
+        """Serve in the background and refresh on the schedule.
+
+        Args:
+            port: Port to listen on, 0 for any free port
+            host: Interface to listen on; localhost by default
+        """
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._stopped.clear()
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._refresh_loop, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop refreshing and serving."""
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self) -> "ScoreServer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def refresh(self) -> None:
+        """Fetch and score every served league once.
+
+        Leagues whose snapshots did not change upstream are not scored again
+        and keep their bodies and ETags. Leagues that fail keep serving their
+        previous results.
+        """
+        leagues = Utils.get_current_leagues() or self.leagues
+        if self.league_names is not None:
+            by_name = {league["name"]: league for league in leagues}
+            leagues = [
+                by_name.get(name, {"id": name, "name": name})
+                for name in self.league_names
+            ]
+        names = [league["name"] for league in leagues]
+        snapshots = self.poe_ninja.get_leagues(names)
+        for url, error in self.poe_ninja.errors.items():
+            print(f"Error fetching {url}: {error}")
+
+        refreshed_at = time.time()
+        payloads = {}
+        for name in names:
+            if not snapshots.get(name, {}).get("Data"):
+                continue
+            if name in self._payloads and name not in self.poe_ninja.updated_leagues:
+                continue
+            try:
+                payloads[name] = self._score(name, snapshots[name])
+            except (KeyError, ValueError) as e:
+                print(f"Error scoring {name}: {e}")
+
+        with self._lock:
+            self.leagues = leagues
+            for name, encoded in payloads.items():
+                previous = self._payloads.get(name, {})
+                if self._etags(encoded) != self._etags(previous):
+                    self._payloads[name] = encoded
+                    self._modified[name] = refreshed_at
+            self.refreshed_at = refreshed_at
+
+    def _score(self, league_name: str, snapshots: Dict) -> Dict[str, Encoded]:
+        """Score one league and encode the result.
+
+        The JSON body is compressed here once rather than per request.
+        """
+        utils = self._utils.setdefault(league_name, Utils())
+        divination_data, currency_data, unique_items = utils.load_data(snapshots)
+        price_index = PriceIndex.build(divination_data, currency_data, unique_items)
+        scored = utils.score_cards(
+            divination_data,
+            price_index,
+            utils.load_market(snapshots, price_index.uniques),
+        )
+        if self.history is not None and league_name in self.poe_ninja.updated_leagues:
+            try:
+                self.history.append(league_name, scored)
+            except sqlite3.Error as e:
+                print(f"Error recording history: {e}")
+
+        with instrumentation.stage("encode", league_name) as record:
+            payload = ScorePayload.from_scored(
+                scored, price_index.currency, league=league_name
+            )
+            json_body = payload.encode_json()
+            binary_body = payload.encode_binary()
+            encoded = {
+                ScorePayload.JSON_TYPE: (
+                    json_body,
+                    ScorePayload.etag(json_body),
+                    gzip.compress(json_body, compresslevel=6, mtime=0),
+                ),
+                ScorePayload.BINARY_TYPE: (
+                    binary_body,
+                    ScorePayload.etag(binary_body),
+                    None,
+                ),
+            }
+            record.items = len(scored)
+            record.bytes = len(binary_body)
+        return encoded
+
+    @staticmethod
+    def _etags(encoded: Dict[str, Encoded]) -> Dict[str, str]:
+        return {content_type: body[1] for content_type, body in encoded.items()}
+
+    def _refresh_loop(self) -> None:
+        """Refresh right away, then every ``interval`` seconds."""
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing: {e}")
+            delay = max(0.0, self.interval - (time.monotonic() - started))
+            self.next_refresh = time.time() + delay
+            self._stopped.wait(delay)
+
+    def _lookup(
+        self, league_name: str, content_type: str
+    ) -> Tuple[Optional[Encoded], Optional[float]]:
+        """Return the encoded scores of a league and when they last changed."""
+        with self._lock:
+            return (
+                self._payloads.get(league_name, {}).get(content_type),
+                self._modified.get(league_name),
+            )
+
+    def _is_served(self, league_name: str) -> bool:
+        """Whether a league is, or may still turn out to be, served."""
+        with self._lock:
+            return self.refreshed_at is None or any(
+                league["name"] == league_name for league in self.leagues
+            )
+
+    def _league_list(self) -> bytes:
+        with self._lock:
+            return json.dumps(self.leagues, separators=(",", ":")).encode("utf-8")
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                if parts.path == "/leagues":
+                    self._reply(200, server._league_list(), ScorePayload.JSON_TYPE)
+                    return
+                if parts.path != "/scores" or "league" not in query:
+                    self._reply(404, b"Not found", "text/plain")
+                    return
+
+                binary = query.get("format", [""])[
+                    0
+                ] == "bin" or ScorePayload.BINARY_TYPE in self.headers.get("Accept", "")
+                content_type = (
+                    ScorePayload.BINARY_TYPE if binary else ScorePayload.JSON_TYPE
+                )
+                league_name = query["league"][0]
+                payload, modified = server._lookup(league_name, content_type)
+                if payload is None:
+                    if server._is_served(league_name):
+                        self._reply(
+                            503,
+                            b"Not scored yet",
+                            "text/plain",
+                            {"Retry-After": str(server.RETRY_AFTER)},
+                        )
+                    else:
+                        self._reply(404, b"League not served", "text/plain")
+                    return
+
+                body, etag, gzipped = payload
+                max_age = max(0, int(server.next_refresh - time.time()))
+                headers = {
+                    "ETag": etag,
+                    "Cache-Control": f"max-age={max_age}",
+                    "Last-Modified": email.utils.formatdate(modified, usegmt=True),
+                }
+                if self.headers.get("If-None-Match") == etag:
+                    self._reply(304, b"", None, headers)
+                    return
+                if gzipped and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzipped
+                    headers["Content-Encoding"] = "gzip"
+                self._reply(200, body, content_type, headers)
+
+            def _reply(
+                self,
+                status: int,
+                body: bytes,
+                content_type: Optional[str],
+                headers: Optional[Dict[str, str]] = None,
+            ) -> None:
+                self.send_response(status)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
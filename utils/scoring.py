@@ -0,0 +1,250 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.instrumentation import instrumentation
+from utils.market_metrics import MarketColumns, MarketIndex, RiskModel
+from utils.price_index import PriceIndex
+from utils.reward_index import Reward, RewardIndex
+
+
+class ScoredCards:
+    """Columnar scoring result, one array entry per card.
+
+    Columns hold unrounded values; ``records`` rounds like the reference
+    implementation. ``card_market`` and ``reward_market`` hold the trend,
+    volatility and listing depth of each card and of its reward, which
+    ``risk_adjusted_profit`` is derived from.
+    """
+
+    COLUMNS = (
+        "cost",
+        "stack",
+        "total",
+        "sell_price",
+        "profit",
+        "profit_per_card",
+        "roi",
+        "risk_adjusted_profit",
+    )
+
+    def __init__(
+        self,
+        names: List[str],
+        kinds: List[str],
+        cost: np.ndarray,
+        stack: np.ndarray,
+        sell_price: np.ndarray,
+        card_market: Optional[MarketColumns] = None,
+        reward_market: Optional[MarketColumns] = None,
+    ):
+        self.names = names
+        self.kinds = kinds
+        self.cost = cost
+        self.stack = stack
+        self.total = cost * stack
+        self.sell_price = sell_price
+        self.profit = sell_price - self.total
+        self.profit_per_card = self.profit / stack
+        self.roi = np.divide(
+            self.profit * 100,
+            self.total,
+            out=np.zeros_like(self.profit),
+            where=self.total > 0,
+        )
+        if card_market is None:
+            card_market = MarketColumns.unknown(len(names))
+        if reward_market is None:
+            reward_market = MarketColumns.unknown(len(names))
+        self.card_market = card_market
+        self.reward_market = reward_market
+        self.risk_adjusted_profit = RiskModel.adjust(
+            self.total, sell_price, stack, self.card_market, self.reward_market
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def order(self) -> np.ndarray:
+        """Card positions sorted by profit, highest first."""
+        return self.sorted_by("profit")
+
+    def sorted_by(self, column: str, descending: bool = True) -> np.ndarray:
+        """Return card positions sorted by a numeric column.
+
+        Args:
+            column: One of ``COLUMNS``
+            descending: Sort from highest to lowest
+
+        Returns:
+            Array of card positions
+        """
+        with instrumentation.stage("sort", column) as record:
+            values = getattr(self, column)
+            order = np.argsort(-values if descending else values, kind="stable")
+            record.items = len(order)
+        return order
+
+    def records(self, order: Optional[np.ndarray] = None) -> List[Dict]:
+        """Convert to the dictionaries produced by ``Utils.calculate_highscores``.
+
+        Args:
+            order: Card positions to include, in output order. Defaults to
+                all cards sorted by profit.
+
+        Returns:
+            List of card highscore entries
+        """
+        if order is None:
+            order = self.order
+        cost = self.cost.tolist()
+        stack = self.stack.tolist()
+        total = self.total.tolist()
+        sell_price = self.sell_price.tolist()
+        profit = self.profit.tolist()
+        risk_adjusted_profit = self._rounded(self.risk_adjusted_profit)
+        market = {
+            f"{side}{metric}": self._rounded(getattr(columns, field), ndigits)
+            for side, columns in (
+                ("Card", self.card_market),
+                ("Reward", self.reward_market),
+            )
+            for metric, field, ndigits in (
+                ("Trend", "trend", 2),
+                ("Volatility", "volatility", 2),
+                ("Listings", "listings", None),
+            )
+        }
+        return [
+            {
+                "Name": self.names[i],
+                "Type": self.kinds[i],
+                "Profit": round(profit[i], 2),
+                "Cost": cost[i],
+                "Stack": int(stack[i]),
+                "Profitpercard": round(round(profit[i], 2) / stack[i], 2),
+                "Total": total[i],
+                "Sellprice": sell_price[i],
+                "RiskAdjustedProfit": risk_adjusted_profit[i],
+                **{key: values[i] for key, values in market.items()},
+            }
+            for i in order.tolist()
+        ]
+
+    @staticmethod
+    def _rounded(
+        column: np.ndarray, ndigits: Optional[int] = 2
+    ) -> List[Optional[float]]:
+        """Round a column like ``round``, with None for unknown values."""
+        return [
+            None if value != value else round(value, ndigits)
+            for value in column.tolist()
+        ]
+
+
+class ScoringEngine:
+    """Vectorized divination card scoring over NumPy columns.
+
+    Card cost, stack size, reward quantity and an index into a table of
+    distinct reward items are loaded once per snapshot. Scoring is then a
+    handful of array operations, so many what-if price scenarios can be
+    evaluated without touching Python dictionaries.
+    """
+
+    def __init__(self, divination_data: Dict, reward_index: RewardIndex):
+        """Load the card columns of a divination snapshot.
+
+        Args:
+            divination_data: Divination card overview
+            reward_index: Parsed rewards of the snapshot
+        """
+        self.names: List[str] = []
+        self.kinds: List[str] = []
+        self.rewards: List[Reward] = []
+        market_lines = []
+        reward_ids: Dict[Reward, int] = {}
+        cost, stack, quantity, reward_pos = [], [], [], []
+
+        for line in divination_data.get("lines", []):
+            reward = reward_index.get(line["name"])
+            if reward is None:
+                continue
+            key = reward._replace(quantity=1.0)
+            if key not in reward_ids:
+                reward_ids[key] = len(self.rewards)
+                self.rewards.append(key)
+            self.names.append(line["name"])
+            self.kinds.append(reward.kind)
+            cost.append(line["chaosValue"])
+            stack.append(line.get("stackSize", 1))
+            quantity.append(reward.quantity)
+            reward_pos.append(reward_ids[key])
+            market_lines.append(MarketIndex.market_line(line, "Divination"))
+
+        self.cost = np.asarray(cost, dtype=np.float64)
+        self.stack = np.asarray(stack, dtype=np.float64)
+        self.quantity = np.asarray(quantity, dtype=np.float64)
+        self.reward_pos = np.asarray(reward_pos, dtype=np.intp)
+        self.card_market = MarketColumns.from_lines(market_lines)
+
+    def reward_unit_prices(self, price_index: PriceIndex) -> np.ndarray:
+        """Look up the price of one unit of every distinct reward item."""
+        return np.fromiter(
+            (price_index.reward_price(reward) for reward in self.rewards),
+            dtype=np.float64,
+            count=len(self.rewards),
+        )
+
+    def score(
+        self,
+        price_index: PriceIndex,
+        card_prices: Optional[np.ndarray] = None,
+        market_index: Optional[MarketIndex] = None,
+    ) -> ScoredCards:
+        """Score all cards in one vectorized pass.
+
+        Args:
+            price_index: Prices used for the rewards
+            card_prices: Optional override of the per-card cost column
+            market_index: Market data of the rewards; without it reward
+                metrics are unknown
+
+        Returns:
+            Columnar scoring result
+        """
+        unit_prices = self.reward_unit_prices(price_index)
+        reward_market = None
+        if market_index is not None:
+            reward_market = MarketColumns(
+                *(
+                    column[self.reward_pos]
+                    for column in market_index.columns(self.rewards)
+                )
+            )
+        return ScoredCards(
+            self.names,
+            self.kinds,
+            self.cost if card_prices is None else card_prices,
+            self.stack,
+            unit_prices[self.reward_pos] * self.quantity,
+            self.card_market,
+            reward_market,
+        )
+
+    def profit_scenarios(
+        self, unit_prices: np.ndarray, card_prices: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Compute set profits under many price scenarios at once.
+
+        Args:
+            unit_prices: Array of shape (scenarios, rewards) holding the unit
+                price of every entry of ``rewards`` per scenario
+            card_prices: Optional array of shape (scenarios, cards) holding
+                card prices per scenario; the snapshot prices otherwise
+
+        Returns:
+            Array of shape (scenarios, cards) with the set profit
+        """
+        cost = self.cost if card_prices is None else card_prices
+        return unit_prices[:, self.reward_pos] * self.quantity - cost * self.stack
@@ -0,0 +1,355 @@
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Dict, List, Union
+
+import numpy as np
+
+from utils.market_metrics import SPARKLINE_DAYS, MarketIndex
+
+
+class SnapshotFile:
+    """Compact columnar file holding the trimmed price data of a snapshot.
+
+    Layout: a fixed header (magic, format version, metadata length), a JSON
+    metadata block describing every table and column, then the raw column
+    buffers, each aligned to 8 bytes. Numeric columns are little-endian
+    arrays that are read as zero-copy NumPy views over an ``mmap`` of the
+    file; string columns are NUL-separated UTF-8 blobs.
+
+    Sparklines are stored as fixed-size vectors of the last
+    ``SPARKLINE_DAYS`` values, right-aligned and padded with NaN.
+    """
+
+    MAGIC = b"PDCS"
+    VERSION = 3
+    HEADER = struct.Struct("<4sHxxI")
+    ALIGNMENT = 8
+    FILENAME = "Snapshot.bin"
+
+    # Market data columns shared by every table
+    MARKET_COLUMNS = [
+        ("sparkline", f"({SPARKLINE_DAYS},)<f8"),
+        ("lowConfidence", "|b1"),
+        ("listingCount", "<f8"),
+    ]
+
+    # table name -> [(field, dtype)]
+    TABLES = {
+        "Currency": [("currencyTypeName", "str"), ("chaosEquivalent", "<f8")]
+        + MARKET_COLUMNS,
+        "DivinationCard": [
+            ("name", "str"),
+            ("chaosValue", "<f8"),
+            ("stackSize", "<i4"),
+            ("reward", "str"),
+        ]
+        + MARKET_COLUMNS,
+        "Unique": [
+            ("type", "str"),
+            ("name", "str"),
+            ("chaosValue", "<f8"),
+            ("variant", "str"),
+            ("links", "<i4"),
+            ("baseType", "str"),
+        ]
+        + MARKET_COLUMNS,
+    }
+
+    def __init__(
+        self, metadata: Dict, buffer: Union[mmap.mmap, bytes], data_start: int
+    ):
+        self.metadata = metadata
+        self._buffer = buffer
+        self._data_start = data_start
+
+    @classmethod
+    def write(
+        cls, path: str, snapshots: Dict[str, Dict[str, Dict]], league: str = ""
+    ) -> None:
+        """Write snapshots to a snapshot file, replacing it atomically.
+
+        Args:
+            path: Target file path
+            snapshots: Parsed snapshots as returned by ``PoeNinja.get_data``
+            league: League the snapshots belong to
+        """
+        rows = cls._table_rows(snapshots)
+        tables = {}
+        chunks: List[bytes] = []
+        offset = 0
+        for table, columns in cls.TABLES.items():
+            table_rows = rows[table]
+            column_meta = {}
+            for field, dtype in columns:
+                values = [row.get(field) for row in table_rows]
+                if dtype == "str":
+                    data = "\0".join(value or "" for value in values).encode("utf-8")
+                elif np.dtype(dtype).shape:
+                    data = np.asarray(values, dtype=np.dtype(dtype).base).tobytes()
+                else:
+                    data = np.asarray(
+                        [value or 0 for value in values], dtype=dtype
+                    ).tobytes()
+                column_meta[field] = {
+                    "dtype": dtype,
+                    "offset": offset,
+                    "length": len(data),
+                }
+                padding = -len(data) % cls.ALIGNMENT
+                chunks.append(data + b"\0" * padding)
+                offset += len(data) + padding
+            tables[table] = {"rows": len(table_rows), "columns": column_meta}
+
+        metadata = json.dumps(
+            {"league": league, "created_at": time.time(), "tables": tables}
+        ).encode("utf-8")
+        metadata += b" " * (-(cls.HEADER.size + len(metadata)) % cls.ALIGNMENT)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(metadata)))
+            f.write(metadata)
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def open(cls, path: str) -> "SnapshotFile":
+        """Memory-map a snapshot file.
+
+        Raises:
+            ValueError: If the file is not a snapshot file of this version
+        """
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, metadata_length = cls.HEADER.unpack_from(buffer, 0)
+            if magic != cls.MAGIC:
+                raise ValueError(f"{path} is not a snapshot file")
+            if version != cls.VERSION:
+                raise ValueError(f"Unsupported snapshot file version {version}")
+            data_start = cls.HEADER.size + metadata_length
+            metadata = json.loads(buffer[cls.HEADER.size : data_start])
+        except (struct.error, ValueError):
+            buffer.close()
+            raise
+        return cls(metadata, buffer, data_start)
+
+    def close(self) -> None:
+        """Release the memory map."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self) -> "SnapshotFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def league(self) -> str:
+        return self.metadata.get("league", "")
+
+    def rows(self, table: str) -> int:
+        """Return the number of rows of a table."""
+        return self.metadata["tables"][table]["rows"]
+
+    def column(self, table: str, field: str) -> Union[np.ndarray, List[str]]:
+        """Read a column.
+
+        Numeric columns are returned as read-only views into the mapped file
+        and stay valid only until ``close``.
+        """
+        meta = self.metadata["tables"][table]["columns"][field]
+        start = self._data_start + meta["offset"]
+        if meta["dtype"] == "str":
+            if self.rows(table) == 0:
+                return []
+            return (
+                self._buffer[start : start + meta["length"]].decode("utf-8").split("\0")
+            )
+        return np.frombuffer(
+            self._buffer, dtype=meta["dtype"], count=self.rows(table), offset=start
+        )
+
+    def to_snapshots(self) -> Dict[str, Dict[str, Dict]]:
+        """Rebuild trimmed poe.ninja-shaped snapshots from the file.
+
+        Returns:
+            Snapshots grouped like ``PoeNinja.get_data`` output, holding only
+            the fields used for scoring
+        """
+        columns = {
+            table: {
+                field: self._as_list(self.column(table, field)) for field, _ in fields
+            }
+            for table, fields in self.TABLES.items()
+        }
+
+        currency = columns["Currency"]
+        cards = columns["DivinationCard"]
+        uniques = columns["Unique"]
+
+        snapshots: Dict[str, Dict[str, Dict]] = {
+            "Data": {
+                "Currency": {
+                    "lines": [
+                        {
+                            "currencyTypeName": name,
+                            "chaosEquivalent": value,
+                            **self._market_fields(currency, i, "Currency"),
+                        }
+                        for i, (name, value) in enumerate(
+                            zip(
+                                currency["currencyTypeName"],
+                                currency["chaosEquivalent"],
+                            )
+                        )
+                    ]
+                },
+                "DivinationCard": {
+                    "lines": [
+                        {
+                            "name": name,
+                            "chaosValue": value,
+                            "stackSize": stack,
+                            "explicitModifiers": [{"text": reward}] if reward else [],
+                            **self._market_fields(cards, i, "Divination"),
+                        }
+                        for i, (name, value, stack, reward) in enumerate(
+                            zip(
+                                cards["name"],
+                                cards["chaosValue"],
+                                cards["stackSize"],
+                                cards["reward"],
+                            )
+                        )
+                    ]
+                },
+            },
+            "Uniquedata": {},
+        }
+        for i, (item_type, name, value, variant, links, base_type) in enumerate(
+            zip(
+                uniques["type"],
+                uniques["name"],
+                uniques["chaosValue"],
+                uniques["variant"],
+                uniques["links"],
+                uniques["baseType"],
+            )
+        ):
+            line = {"name": name, "chaosValue": value}
+            if variant:
+                line["variant"] = variant
+            if links:
+                line["links"] = links
+            if base_type:
+                line["baseType"] = base_type
+            line.update(self._market_fields(uniques, i, "Unique"))
+            snapshots["Uniquedata"].setdefault(item_type, {"lines": []})[
+                "lines"
+            ].append(line)
+        return snapshots
+
+    @staticmethod
+    def is_current(path: str, directories: List[str]) -> bool:
+        """Check that a snapshot file exists and is newer than the JSON files.
+
+        Args:
+            path: Path of the snapshot file
+            directories: Directories holding the JSON snapshot files
+
+        Returns:
+            True if the snapshot file can be read instead of the JSON files
+        """
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return False
+        for directory in directories:
+            for file in os.listdir(directory):
+                if file.endswith(".json"):
+                    if os.path.getmtime(os.path.join(directory, file)) > mtime:
+                        return False
+        return True
+
+    @staticmethod
+    def _as_list(column: Union[np.ndarray, List[str]]) -> List:
+        """Copy a column out of the memory map as a Python list."""
+        return column.tolist() if isinstance(column, np.ndarray) else column
+
+    @staticmethod
+    def _market_fields(columns: Dict[str, List], i: int, kind: str) -> Dict:
+        """Rebuild the poe.ninja sparkline and listing fields of a row."""
+        values = columns["sparkline"][i]
+        while values and values[0] != values[0]:
+            values = values[1:]
+        sparkline = {"data": [None if v != v else v for v in values]}
+        empty: Dict = {"data": []}
+        regular, fallback = (
+            (empty, sparkline) if columns["lowConfidence"][i] else (sparkline, empty)
+        )
+        listings = columns["listingCount"][i]
+        listings = None if listings != listings else int(listings)
+        if kind == "Currency":
+            return {
+                "receiveSparkLine": regular,
+                "lowConfidenceReceiveSparkLine": fallback,
+                "receive": {"listing_count": listings},
+            }
+        return {
+            "sparkline": regular,
+            "lowConfidenceSparkline": fallback,
+            "listingCount": listings,
+        }
+
+    @staticmethod
+    def _market_row(line: Dict, kind: str) -> Dict:
+        """Return the market data columns of an overview line."""
+        data, low_confidence, listings = MarketIndex.market_line(line, kind)
+        data = data[-SPARKLINE_DAYS:]
+        sparkline = [np.nan] * (SPARKLINE_DAYS - len(data)) + [
+            np.nan if value is None else value for value in data
+        ]
+        return {
+            "sparkline": sparkline,
+            "lowConfidence": low_confidence,
+            "listingCount": np.nan if listings is None else listings,
+        }
+
+    @staticmethod
+    def _table_rows(snapshots: Dict[str, Dict[str, Dict]]) -> Dict[str, List[Dict]]:
+        """Flatten snapshots into the rows of every table."""
+        data = snapshots.get("Data", {})
+        cards = []
+        for line in data.get("DivinationCard", {}).get("lines", []):
+            modifiers = line.get("explicitModifiers") or []
+            cards.append(
+                {
+                    "name": line["name"],
+                    "chaosValue": line.get("chaosValue"),
+                    "stackSize": line.get("stackSize", 1),
+                    # Every modifier is kept, as later ones can narrow down
+                    # a unique reward
+                    "reward": "\n".join(m.get("text", "") for m in modifiers),
+                    **SnapshotFile._market_row(line, "Divination"),
+                }
+            )
+        currency = [
+            dict(line, **SnapshotFile._market_row(line, "Currency"))
+            for line in data.get("Currency", {}).get("lines", [])
+        ]
+        uniques = [
+            dict(line, type=item_type, **SnapshotFile._market_row(line, "Unique"))
+            for item_type, payload in snapshots.get("Uniquedata", {}).items()
+            for line in payload.get("lines", [])
+        ]
+        return {
+            "Currency": currency,
+            "DivinationCard": cards,
+            "Unique": uniques,
+        }
@@ -0,0 +1,122 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from utils.reward_index import Reward
+
+
+class UniqueKey(NamedTuple):
+    """Identity of a unique item overview line."""
+
+    name: str
+    variant: str
+    links: int
+    base_type: str
+
+
+class UniqueIndex:
+    """Unique item lines keyed by name, variant, links and base type.
+
+    Several lines can share a name (different links, relic or other
+    variants, map tiers), so a reward is matched to the line its card
+    guarantees: a six-link reward to the six-link line, a corrupted reward
+    to a corrupted variant, and a reward naming a variant or base type to
+    that line. A reward that guarantees nothing matches the plain line,
+    without five or more links and without a variant. Remaining ties go to
+    the cheapest line, so the result never depends on file order.
+
+    The index is built once per snapshot; each distinct reward is matched
+    once and then resolves with a single lookup.
+    """
+
+    def __init__(self, lines: Dict[UniqueKey, Dict]):
+        self.lines = lines
+        self._keys: Dict[str, List[UniqueKey]] = {}
+        for key in lines:
+            self._keys.setdefault(key.name, []).append(key)
+        self._matches: Dict[Reward, Optional[Dict]] = {}
+
+    @classmethod
+    def build(cls, lines: Iterable[Dict]) -> "UniqueIndex":
+        """Index unique item overview lines.
+
+        Args:
+            lines: ``lines`` entries of the unique item overviews
+
+        Returns:
+            New unique index
+        """
+        indexed: Dict[UniqueKey, Dict] = {}
+        for line in lines:
+            key = cls.key_of(line)
+            current = indexed.get(key)
+            if current is None or line["chaosValue"] < current["chaosValue"]:
+                indexed[key] = line
+        return cls(indexed)
+
+    @staticmethod
+    def key_of(line: Dict) -> UniqueKey:
+        """Return the key of an overview line."""
+        return UniqueKey(
+            line["name"],
+            line.get("variant") or "",
+            line.get("links") or 0,
+            line.get("baseType") or "",
+        )
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._keys
+
+    def line(self, reward: Reward) -> Optional[Dict]:
+        """Return the overview line a unique reward matches, if it is listed."""
+        try:
+            return self._matches[reward]
+        except KeyError:
+            pass
+        keys = self._keys.get(reward.item)
+        line = None
+        if keys:
+            wanted = {detail.casefold() for detail in reward.details}
+            line = self.lines[
+                min(keys, key=lambda key: self._rank(key, reward, wanted))
+            ]
+        self._matches[reward] = line
+        return line
+
+    def price(self, reward: Reward) -> float:
+        """Return the chaos price of the line a unique reward matches."""
+        line = self.line(reward)
+        return 0 if line is None else line["chaosValue"]
+
+    def get(self, name: str, default: float = 0) -> float:
+        """Return the price of the plain line of a unique item name."""
+        line = self.line(Reward("Unique", name, 1.0))
+        return default if line is None else line["chaosValue"]
+
+    def _rank(
+        self, key: UniqueKey, reward: Reward, wanted: Set[str]
+    ) -> Tuple[bool, int, bool, float]:
+        """Order the lines of a name from best to worst match of a reward.
+
+        Args:
+            key: Key of a line of the reward's name
+            reward: Unique reward
+            wanted: Case-folded ``details`` of the reward
+
+        Returns:
+            Sort key; lower is a better match
+        """
+        if reward.links:
+            links_off = key.links != reward.links
+        else:
+            links_off = key.links >= 5
+        variant = key.variant.casefold()
+        if not variant:
+            variant_off = 1
+        elif variant in wanted or (reward.corrupted and "corrupted" in variant):
+            variant_off = 0
+        else:
+            variant_off = 2
+        base_off = bool(wanted) and key.base_type.casefold() not in wanted
+        return links_off, variant_off, base_off, self.lines[key]["chaosValue"]
@@ -1,17 +1,28 @@
+import io
 import json
 import os
 import re
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple, Union
-from urllib.request import Request, urlopen
+from typing import IO, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from utils.http_client import HttpClient
+from utils.instrumentation import instrumentation
+from utils.json_stream import iter_array_items
+from utils.market_metrics import MarketIndex
+from utils.price_index import PriceIndex
+from utils.price_source import HttpSource, PriceSource
+from utils.reward_graph import RewardGraph
+from utils.reward_index import Reward, RewardIndex
+from utils.scoring import ScoredCards, ScoringEngine
+from utils.snapshot_file import SnapshotFile
+from utils.unique_index import UniqueIndex
 
 
 class Utils:
     """Utility class for Path of Exile data processing and file operations."""
 
     # Constants
-    POE_API_LEAGUES_URL = "https://api.pathofexile.com/leagues?type=main"
-    GITHUB_VERSION_URL = "https://raw.githubusercontent.com/ezbooz/Path-of-Exile-divination-cards-flipper-POE/main/__version__.py"
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36"
 
     # Special case mappings
@@ -21,8 +32,31 @@ class Utils:
         "Azyran's Reward": "The Anima Stone",
     }
 
+    # Fields of unique item lines kept in memory; everything else is dropped
+    UNIQUE_FIELDS = (
+        "name",
+        "chaosValue",
+        "variant",
+        "links",
+        "baseType",
+        "sparkline",
+        "lowConfidenceSparkline",
+        "listingCount",
+    )
+
+    # Shared keep-alive client for poe.ninja, the PoE API and GitHub
+    http_client = HttpClient(user_agent=USER_AGENT)
+
+    # Source of the overviews, the league list and the latest version
+    price_source: PriceSource = HttpSource(http_client)
+
     def __init__(self):
-        pass
+        self._reward_index: Optional[RewardIndex] = None
+        self._reward_index_source: Optional[Dict] = None
+        self._reward_graph: Optional[RewardGraph] = None
+        self._reward_graph_source: Optional[RewardIndex] = None
+        self._scoring_engine: Optional[ScoringEngine] = None
+        self._scoring_engine_source: Optional[Dict] = None
 
     @staticmethod
     def create_directories(*directories: str) -> None:
@@ -34,17 +68,31 @@ class Utils:
         for directory in directories:
             os.makedirs(directory, exist_ok=True)
 
+    @staticmethod
+    def league_directory(directory: str, league: str) -> str:
+        """Return the per-league subdirectory of a data directory.
+
+        Args:
+            directory: Data directory, e.g. "Data" or "Uniquedata"
+            league: League name
+
+        Returns:
+            Directory path, with characters that are unsafe in file names
+            replaced
+        """
+        return os.path.join(directory, re.sub(r"[^\w\- ]", "_", league))
+
     @staticmethod
     def get_item_name(url: str) -> str:
-        """Extract item name from poe.ninja API URL.
+        """Extract item name from an overview URL.
 
         Args:
-            url: API URL to parse
+            url: Overview URL built by a ``PriceSource``
 
         Returns:
-            Extracted item name
+            Extracted item name, the ``type`` query parameter
         """
-        return url.split("/")[5].split("=")[2]
+        return parse_qs(urlsplit(url).query)["type"][0]
 
     @staticmethod
     def fetch_url_data(url: str) -> Union[Dict, List]:
@@ -60,9 +108,7 @@ class Utils:
             URLError: If the request fails
             ValueError: If JSON parsing fails
         """
-        req = Request(url, headers={"User-Agent": Utils.USER_AGENT})
-        with urlopen(req) as response:
-            return json.loads(response.read().decode())
+        return json.loads(Utils.http_client.get(url).body)
 
     @staticmethod
     def save_data_to_file(data: Union[Dict, List], file_path: str) -> None:
@@ -72,34 +118,155 @@ class Utils:
             data: Data to save (dict or list)
             file_path: Path to save file
         """
-        with open(file_path, "w+", encoding="utf-8") as outfile:
-            json.dump(data, outfile, ensure_ascii=False, indent=2)
+        with instrumentation.stage("write", file_path) as record:
+            with open(file_path, "w+", encoding="utf-8") as outfile:
+                json.dump(data, outfile, ensure_ascii=False, indent=2)
+                record.bytes = outfile.tell()
+            if isinstance(data, dict):
+                record.items = len(data.get("lines", []))
 
     @staticmethod
-    def load_data() -> Tuple[Dict, Dict, Dict]:
-        """Load all required data files.
+    def load_data(
+        snapshots: Optional[Dict[str, Dict[str, Dict]]] = None,
+        league: Optional[str] = None,
+    ) -> Tuple[Dict, Dict, UniqueIndex]:
+        """Load all required data, from memory or from the saved files.
+
+        Args:
+            snapshots: Parsed snapshots as returned by ``PoeNinja.get_data``.
+                When omitted, the saved files are read.
+            league: League whose saved files are read; see ``read_snapshots``
 
         Returns:
             Tuple containing:
                 - Divination card data
                 - Currency data
-                - Unique items data
+                - Unique item index
+
+        Raises:
+            ValueError: If there is no divination card or currency data, e.g.
+                because its endpoint failed and nothing was saved before
         """
-        with open("Data\\DivinationCard.json", "r", encoding="utf-8") as f:
-            divination_data = json.load(f)
+        with instrumentation.stage("load", league or "") as record:
+            if snapshots is None:
+                snapshots = Utils.read_snapshots(league)
+
+            data = snapshots.get("Data", {})
+            for item_type in ("DivinationCard", "Currency"):
+                if item_type not in data:
+                    raise ValueError(f"No {item_type} data available")
+            divination_data = data["DivinationCard"]
+            currency_data = data["Currency"]
+
+            unique_items = UniqueIndex.build(
+                item
+                for data in snapshots.get("Uniquedata", {}).values()
+                for item in data["lines"]
+            )
+            record.items = len(divination_data["lines"])
+
+        return divination_data, currency_data, unique_items
 
-        with open("Data\\Currency.json", "r", encoding="utf-8") as f:
-            currency_data = json.load(f)
+    @staticmethod
+    def load_market(
+        snapshots: Dict[str, Dict[str, Dict]],
+        unique_items: Optional[UniqueIndex] = None,
+    ) -> MarketIndex:
+        """Index the sparklines and listing counts of parsed snapshots.
 
-        unique_items = {}
-        for file in os.listdir("Uniquedata"):
-            file_path = os.path.join("Uniquedata", file)
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                for item in data["lines"]:
-                    unique_items[item["name"]] = item["chaosValue"]
+        Args:
+            snapshots: Parsed snapshots as returned by ``PoeNinja.get_data``
+            unique_items: Unique item index returned by ``load_data`` for the
+                same snapshots; built from them when omitted
 
-        return divination_data, currency_data, unique_items
+        Returns:
+            Market index of the cards, currency and unique items
+        """
+        with instrumentation.stage("market") as record:
+            if unique_items is None:
+                unique_items = UniqueIndex.build(
+                    item
+                    for data in snapshots.get("Uniquedata", {}).values()
+                    for item in data["lines"]
+                )
+            market_index = MarketIndex.build(
+                snapshots["Data"]["DivinationCard"],
+                snapshots["Data"]["Currency"],
+                unique_items,
+            )
+            record.items = len(market_index.lines) + len(unique_items)
+        return market_index
+
+    @staticmethod
+    def read_snapshots(league: Optional[str] = None) -> Dict[str, Dict[str, Dict]]:
+        """Read the saved snapshots from disk.
+
+        The compact ``Snapshot.bin`` file is preferred when it is at least as
+        recent as the JSON files; otherwise the JSON files are read.
+
+        Args:
+            league: League whose files are read from its ``league_directory``;
+                when omitted, ``Data`` and ``Uniquedata`` themselves are read
+
+        Returns:
+            Parsed snapshots grouped by directory and item type
+        """
+        directories = {
+            directory: (
+                directory
+                if league is None
+                else Utils.league_directory(directory, league)
+            )
+            for directory in ("Data", "Uniquedata")
+        }
+        binary_path = os.path.join(directories["Data"], SnapshotFile.FILENAME)
+        if SnapshotFile.is_current(binary_path, list(directories.values())):
+            try:
+                with SnapshotFile.open(binary_path) as snapshot_file:
+                    return snapshot_file.to_snapshots()
+            except (OSError, ValueError) as e:
+                print(f"Error reading {binary_path}: {e}")
+
+        snapshots = {}
+        for directory, path in directories.items():
+            snapshots[directory] = {}
+            for file in os.listdir(path):
+                if not file.endswith(".json"):
+                    continue
+                file_path = os.path.join(path, file)
+                with open(file_path, "r", encoding="utf-8") as f:
+                    snapshots[directory][file[: -len(".json")]] = Utils.parse_snapshot(
+                        f, directory
+                    )
+        return snapshots
+
+    @staticmethod
+    def parse_snapshot(fp: Union[IO[str], bytes], directory: str) -> Dict:
+        """Parse a poe.ninja overview.
+
+        Unique item overviews are parsed incrementally: only the
+        ``UNIQUE_FIELDS`` of each line are kept and the rest of every line
+        (modifiers, icons, trade info) is discarded as soon as it has been
+        read, so the full payload is never held in memory.
+
+        Args:
+            fp: Text stream or raw response body
+            directory: Data directory the overview belongs to
+
+        Returns:
+            Parsed overview
+        """
+        if isinstance(fp, bytes):
+            fp = io.TextIOWrapper(io.BytesIO(fp), encoding="utf-8")
+        if directory != "Uniquedata":
+            return json.load(fp)
+
+        return {
+            "lines": [
+                {field: line[field] for field in Utils.UNIQUE_FIELDS if field in line}
+                for line in iter_array_items(fp, "lines")
+            ]
+        }
 
     @staticmethod
     def process_card(
@@ -173,36 +340,162 @@ class Utils:
             return "The Anima Stone"
         return Utils.ITEM_NAME_MAPPINGS.get(reward_content, reward_content)
 
+    def get_reward_index(self, divination_data: Dict) -> RewardIndex:
+        """Return the reward index for a divination snapshot.
+
+        The index of the previous snapshot is reused as long as the card
+        reward texts are unchanged, without rehashing them when the very
+        same snapshot object is scored again.
+
+        Args:
+            divination_data: Divination card data
+
+        Returns:
+            Reward index for the snapshot
+        """
+        if self._reward_index is not None:
+            if divination_data is self._reward_index_source:
+                return self._reward_index
+            fingerprint = RewardIndex.fingerprint_of(divination_data)
+            if self._reward_index.fingerprint == fingerprint:
+                self._reward_index_source = divination_data
+                return self._reward_index
+
+        self._reward_index = RewardIndex.build(
+            divination_data, self._handle_special_names
+        )
+        self._reward_index_source = divination_data
+        return self._reward_index
+
+    def resolve_reward_chains(
+        self, divination_data: Dict, price_index: PriceIndex
+    ) -> PriceIndex:
+        """Value card rewards through their own reward chains.
+
+        The reward graph is kept while the card rewards stay the same; a
+        new snapshot then only revalues the cards whose prices changed and
+        the cards whose chains lead to them.
+
+        Args:
+            divination_data: Divination card data
+            price_index: Market prices of the snapshot
+
+        Returns:
+            Copy of ``price_index`` whose card rewards resolve to the best
+            realizable value of the reward card
+        """
+        reward_index = self.get_reward_index(divination_data)
+        with instrumentation.stage("graph") as record:
+            if self._reward_graph_source is not reward_index:
+                self._reward_graph = RewardGraph.build(divination_data, reward_index)
+                self._reward_graph_source = reward_index
+                self._reward_graph.evaluate(price_index)
+                record.items = len(self._reward_graph)
+            else:
+                record.items = len(self._reward_graph.update_from(price_index))
+        return price_index.with_card_values(dict(self._reward_graph.values))
+
+    @staticmethod
+    def score_card(
+        name: str,
+        chaos_value: float,
+        stack_size: int,
+        reward: Reward,
+        price_index: PriceIndex,
+    ) -> Dict:
+        """Score a card whose reward was already parsed.
+
+        Args:
+            name: Card name
+            chaos_value: Price of a single card
+            stack_size: Number of cards in a full set
+            reward: Parsed reward of the set
+            price_index: Prices of the current snapshot
+
+        Returns:
+            Card highscore entry
+        """
+        total_cost = chaos_value * stack_size
+        reward_value = price_index.reward_price(reward)
+
+        profit = round((reward_value - total_cost), 2)
+        return {
+            "Name": name,
+            "Type": reward.kind,
+            "Profit": profit,
+            "Cost": chaos_value,
+            "Stack": stack_size,
+            "Profitpercard": round(profit / stack_size, 2),
+            "Total": total_cost,
+            "Sellprice": reward_value,
+        }
+
     def calculate_highscores(
-        self, divination_data: Dict, currency_data: Dict, unique_items: Dict[str, float]
+        self, divination_data: Dict, price_index: PriceIndex
     ) -> Dict[str, Dict]:
         """Calculate profit highscores for divination cards.
 
+        Card rewards are valued through their reward chains, see
+        ``resolve_reward_chains``.
+
         Args:
             divination_data: Divination card data
-            currency_data: Currency exchange rates
-            unique_items: Unique item prices
+            price_index: Currency, card and unique prices of the snapshot
 
         Returns:
             Dictionary of card highscores with profit data
         """
         highscores = {}
+        price_index = self.resolve_reward_chains(divination_data, price_index)
+        with instrumentation.stage("score", "reference") as record:
+            reward_index = self.get_reward_index(divination_data)
+
+            for item in divination_data["lines"]:
+                reward = reward_index.get(item["name"])
+                if reward is None:
+                    continue
+
+                highscores[item["name"]] = self.score_card(
+                    name=item["name"],
+                    chaos_value=item["chaosValue"],
+                    stack_size=item.get("stackSize", 1),
+                    reward=reward,
+                    price_index=price_index,
+                )
+            record.items = len(highscores)
 
-        for item in divination_data["lines"]:
-            card_data = self.process_card(
-                name=item["name"],
-                chaos_value=item["chaosValue"],
-                stack_size=item.get("stackSize", 1),
-                explicit_modifiers=item.get("explicitModifiers", []),
-                currency=currency_data,
-                unique_items=unique_items,
-                divination_data=divination_data,
-            )
+        return highscores
 
-            if card_data:
-                highscores[item["name"]] = card_data
+    def score_cards(
+        self,
+        divination_data: Dict,
+        price_index: PriceIndex,
+        market_index: Optional[MarketIndex] = None,
+    ) -> ScoredCards:
+        """Score all divination cards with the vectorized scoring engine.
 
-        return highscores
+        Produces the same values as ``calculate_highscores``, which is kept
+        as the reference implementation, including the reward chain values.
+
+        Args:
+            divination_data: Divination card data
+            price_index: Currency, card and unique prices of the snapshot
+            market_index: Market data of the snapshot, for the trend,
+                volatility and risk-adjusted profit columns
+
+        Returns:
+            Columnar scoring result
+        """
+        price_index = self.resolve_reward_chains(divination_data, price_index)
+        with instrumentation.stage("score", "vectorized") as record:
+            if self._scoring_engine_source is not divination_data:
+                self._scoring_engine = ScoringEngine(
+                    divination_data, self.get_reward_index(divination_data)
+                )
+                self._scoring_engine_source = divination_data
+            scored = self._scoring_engine.score(price_index, market_index=market_index)
+            record.items = len(scored)
+        return scored
 
     @staticmethod
     def get_current_leagues() -> List[Dict]:
@@ -212,11 +505,8 @@ class Utils:
             List of active league dictionaries
         """
         try:
-            req = Request(
-                Utils.POE_API_LEAGUES_URL, headers={"User-Agent": Utils.USER_AGENT}
-            )
-            with urlopen(req) as response:
-                leagues = json.loads(response.read().decode("utf-8"))
+            response = Utils.price_source.get(Utils.price_source.leagues_url)
+            leagues = json.loads(response.body.decode("utf-8"))
 
             current_time = datetime.now(timezone.utc)
             active_leagues = []
@@ -252,26 +542,25 @@ class Utils:
             Tuple (version, description) if available, otherwise None
         """
         try:
-            req = Request(Utils.GITHUB_VERSION_URL)
-            with urlopen(req) as response:
-                content = response.read().decode()
-
-                version_match = re.search(r'__version__ = "(.*?)"', content)
-                description_match = re.search(
-                    r'__version_description__ = """([\s\S]*?)"""',
-                    content,
-                )
+            response = Utils.price_source.get(Utils.price_source.version_url)
+            content = response.body.decode()
 
-                if not version_match:
-                    return None
+            version_match = re.search(r'__version__ = "(.*?)"', content)
+            description_match = re.search(
+                r'__version_description__ = """([\s\S]*?)"""',
+                content,
+            )
 
-                version = version_match.group(1)
-                description = (
-                    description_match.group(1)
-                    if description_match
-                    else "No description available."
-                )
-                return version, description
+            if not version_match:
+                return None
+
+            version = version_match.group(1)
+            description = (
+                description_match.group(1)
+                if description_match
+                else "No description available."
+            )
+            return version, description
 
         except Exception as e:
             print(f"Error checking for updates: {e}")